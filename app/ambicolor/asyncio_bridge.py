@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import selectors
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from PySide6.QtCore import QObject, QSocketNotifier, QTimer
+
+_NOTIFIER_KINDS = (
+    (QSocketNotifier.Type.Read, selectors.EVENT_READ),
+    (QSocketNotifier.Type.Write, selectors.EVENT_WRITE),
+)
+
+
+class _WatchedSelector(selectors.BaseSelector):
+    """The default selector, reporting every change of interest so each
+    registered file descriptor can be watched by Qt."""
+
+    def __init__(self, on_change: Callable[[int, int], None]) -> None:
+        self._selector = selectors.DefaultSelector()
+        self._on_change = on_change
+
+    def register(self, fileobj, events, data=None) -> selectors.SelectorKey:
+        key = self._selector.register(fileobj, events, data)
+        self._on_change(key.fd, events)
+        return key
+
+    def unregister(self, fileobj) -> selectors.SelectorKey:
+        key = self._selector.unregister(fileobj)
+        self._on_change(key.fd, 0)
+        return key
+
+    def modify(self, fileobj, events, data=None) -> selectors.SelectorKey:
+        key = self._selector.modify(fileobj, events, data)
+        self._on_change(key.fd, events)
+        return key
+
+    def select(self, timeout=None):
+        return self._selector.select(timeout)
+
+    def close(self) -> None:
+        self._selector.close()
+
+    def get_map(self):
+        return self._selector.get_map()
+
+
+class _BridgedLoop(asyncio.SelectorEventLoop):
+    """Reports callbacks queued with call_soon() and timers added with
+    call_at() (which call_later() uses) to the bridge."""
+
+    def __init__(self, selector: selectors.BaseSelector, on_work: Callable[[float | None], None]) -> None:
+        self._bridge_on_work = on_work
+        super().__init__(selector)
+
+    def call_soon(self, callback, *args, context=None) -> asyncio.Handle:
+        handle = super().call_soon(callback, *args, context=context)
+        self._bridge_on_work(None)
+        return handle
+
+    def call_at(self, when, callback, *args, context=None) -> asyncio.TimerHandle:
+        handle = super().call_at(when, callback, *args, context=context)
+        self._bridge_on_work(when)
+        return handle
+
+
+class QtAsyncioBridge(QObject):
+    """Runs a selector-based asyncio loop from inside the Qt event loop.
+
+    Every file descriptor the loop selects on is watched with its own
+    QSocketNotifier, and a single-shot QTimer wakes the loop for callbacks
+    queued with call_soon() and for the earliest timer. No extra thread is
+    used; asyncio callbacks run on the GUI thread, so they may call into
+    QObjects directly. An idle loop costs no wakeups.
+
+    (PySide6's QtAsyncio does not implement servers yet, hence the bridge.)
+    """
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._closed = False
+        self._stepping = False
+        self._more_ready = False
+        # Deadlines of timers added with call_at(). Cancelled timers stay
+        # until they pass, which only costs a spurious wakeup.
+        self._deadlines: list[float] = []
+        self._notifiers: dict[tuple[int, QSocketNotifier.Type], QSocketNotifier] = {}
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._step)
+
+        self._loop = _BridgedLoop(_WatchedSelector(self._watch), self._on_work)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def create_task(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+        return self._loop.create_task(coro)
+
+    def run_until_complete(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run ``coro`` to completion and return its result or raise its
+        error. Only valid while the Qt event loop is not running, e.g. to
+        bind servers at startup so a failed bind is reported at once."""
+        started = self._loop.time()
+        try:
+            return self._loop.run_until_complete(coro)
+        finally:
+            self._schedule_next(started)
+
+    def call_soon(self, callback, *args) -> None:
+        self._loop.call_soon(callback, *args)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._timer.stop()
+        for task in asyncio.all_tasks(self._loop):
+            task.cancel()
+        self._run_once()
+        self._loop.close()
+        for notifier in self._notifiers.values():
+            notifier.setEnabled(False)
+        self._notifiers.clear()
+
+    def _watch(self, fd: int, events: int) -> None:
+        for kind, mask in _NOTIFIER_KINDS:
+            notifier = self._notifiers.get((fd, kind))
+            if events & mask:
+                if notifier is None:
+                    notifier = QSocketNotifier(fd, kind, self)
+                    notifier.activated.connect(self._step)
+                    self._notifiers[(fd, kind)] = notifier
+            elif notifier is not None:
+                notifier.setEnabled(False)
+                notifier.deleteLater()
+                del self._notifiers[(fd, kind)]
+
+    def _on_work(self, when: float | None) -> None:
+        if when is not None:
+            heapq.heappush(self._deadlines, when)
+        if self._stepping:
+            # Callbacks queued while the loop runs are picked up below.
+            self._more_ready = self._more_ready or when is None
+        elif when is None:
+            self._schedule_step(0)
+        else:
+            self._schedule_step(self._delay_ms(when))
+
+    def _step(self, *_args) -> None:
+        if self._closed:
+            return
+        started = self._loop.time()
+        self._run_once()
+        self._schedule_next(started)
+
+    def _run_once(self) -> None:
+        # stop() queued first makes run_forever() return after exactly one
+        # iteration (ready callbacks plus a non-blocking select).
+        self._stepping = True
+        self._loop.call_soon(self._loop.stop)
+        self._more_ready = False
+        try:
+            self._loop.run_forever()
+        finally:
+            self._stepping = False
+
+    def _schedule_next(self, started: float) -> None:
+        if self._more_ready:
+            self._schedule_step(0)
+            return
+        # Timers due when the iteration began have run.
+        deadlines = self._deadlines
+        while deadlines and deadlines[0] <= started:
+            heapq.heappop(deadlines)
+        if deadlines:
+            self._schedule_step(self._delay_ms(deadlines[0]))
+
+    def _delay_ms(self, when: float) -> int:
+        return max(0, int((when - self._loop.time()) * 1000.0) + 1)
+
+    def _schedule_step(self, delay_ms: int) -> None:
+        if self._closed:
+            return
+        if self._timer.isActive() and self._timer.remainingTime() <= delay_ms:
+            return
+        self._timer.start(delay_ms)
@@ -0,0 +1,276 @@
+"""Headless preset calibration analyzer.
+
+Renders presets over a full cycle and computes perceptual smoothness
+metrics in OKLab. Run from the ``app`` directory::
+
+    python -m ambicolor.calibration_analyzer --output report.json
+    python -m ambicolor.calibration_analyzer --saturation 20:100:5 --brightness 20:100:5 --duration 60,120,300
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import sys
+import time
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Executor
+from dataclasses import asdict, dataclass
+
+from .models import PresetConfig, preset_catalog, preset_key
+from .parallel import available_cpus, parallel_executor
+from .timeline import Timeline, render_timeline, with_overrides
+
+REPORT_VERSION = 1
+
+# A run of frames without any 8-bit change that lasts this long reads as a
+# visible stall instead of slow motion.
+DEFAULT_STALL_THRESHOLD_S = 0.5
+
+
+def _srgb_to_linear(channel: int) -> float:
+    c = channel / 255.0
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+_LINEAR = [_srgb_to_linear(value) for value in range(256)]
+
+
+def rgb8_to_oklab(red: int, green: int, blue: int) -> tuple[float, float, float]:
+    r = _LINEAR[red]
+    g = _LINEAR[green]
+    b = _LINEAR[blue]
+    lc = math.cbrt(0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b)
+    mc = math.cbrt(0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b)
+    sc = math.cbrt(0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b)
+    return (
+        0.2104542553 * lc + 0.7936177850 * mc - 0.0040720468 * sc,
+        1.9779984951 * lc - 2.4285922050 * mc + 0.4505937099 * sc,
+        0.0259040371 * lc + 0.7827717662 * mc - 0.8086757660 * sc,
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class TimelineMetrics:
+    preset_id: str
+    cycle_duration_s: float
+    saturation_pct: int
+    brightness_pct: int
+    frames: int
+    mean_delta_e: float
+    p95_delta_e: float
+    max_delta_e: float
+    max_delta_frame: int
+    stall_fraction: float
+    longest_stall_s: float
+    visible_stalls: int
+    bounce_count: int
+    max_bounce_kink: float
+    mean_curvature: float
+
+
+def analyze_timeline(
+    timeline: Timeline,
+    config: PresetConfig,
+    *,
+    stall_threshold_s: float = DEFAULT_STALL_THRESHOLD_S,
+) -> TimelineMetrics:
+    rgb = timeline.rgb
+    frames = len(timeline)
+    cache: dict[int, tuple[float, float, float]] = {}
+    labs = []
+    for offset in range(0, frames * 3, 3):
+        key = (rgb[offset] << 16) | (rgb[offset + 1] << 8) | rgb[offset + 2]
+        lab = cache.get(key)
+        if lab is None:
+            lab = cache[key] = rgb8_to_oklab(rgb[offset], rgb[offset + 1], rgb[offset + 2])
+        labs.append(lab)
+
+    deltas = []
+    vectors = []
+    for previous, current in itertools.pairwise(labs):
+        d = (current[0] - previous[0], current[1] - previous[1], current[2] - previous[2])
+        vectors.append(d)
+        deltas.append(math.sqrt(d[0] * d[0] + d[1] * d[1] + d[2] * d[2]))
+
+    # 8-bit stalls: consecutive frames with identical RGB.
+    stalled = 0
+    longest_run = 0
+    run = 0
+    visible_stalls = 0
+    stall_frames = stall_threshold_s * timeline.fps
+    for delta in deltas:
+        if delta == 0.0:
+            stalled += 1
+            run += 1
+            longest_run = max(longest_run, run)
+        else:
+            if run >= stall_frames:
+                visible_stalls += 1
+            run = 0
+    if run >= stall_frames:
+        visible_stalls += 1
+
+    # Curvature: change of the per-frame OKLab step. At bounce edges the
+    # step reverses, which shows up as a spike relative to the mean.
+    curvature = [
+        math.dist(a, b) for a, b in itertools.pairwise(vectors)
+    ]
+    hues = timeline.hues
+    bounce_frames = []
+    direction = 0.0
+    for index in range(1, frames):
+        step = (hues[index] - hues[index - 1] + 180.0) % 360.0 - 180.0
+        if step == 0.0:
+            continue
+        sign = 1.0 if step > 0 else -1.0
+        if direction and sign != direction:
+            bounce_frames.append(index)
+        direction = sign
+    max_kink = 0.0
+    for frame in bounce_frames:
+        window = curvature[max(0, frame - 3) : frame + 2]
+        if window:
+            max_kink = max(max_kink, max(window))
+
+    ordered = sorted(deltas)
+    max_delta = ordered[-1] if ordered else 0.0
+    return TimelineMetrics(
+        preset_id=preset_key(config.preset_id),
+        cycle_duration_s=config.cycle_duration_s,
+        saturation_pct=config.saturation_pct,
+        brightness_pct=config.brightness_pct,
+        frames=frames,
+        mean_delta_e=sum(deltas) / len(deltas) if deltas else 0.0,
+        p95_delta_e=ordered[int(0.95 * (len(ordered) - 1))] if ordered else 0.0,
+        max_delta_e=max_delta,
+        max_delta_frame=deltas.index(max_delta) + 1 if deltas else 0,
+        stall_fraction=stalled / len(deltas) if deltas else 0.0,
+        longest_stall_s=longest_run / timeline.fps,
+        visible_stalls=visible_stalls,
+        bounce_count=len(bounce_frames),
+        max_bounce_kink=max_kink,
+        mean_curvature=sum(curvature) / len(curvature) if curvature else 0.0,
+    )
+
+
+def analyze_preset(job: tuple[PresetConfig, float]) -> TimelineMetrics:
+    config, fps = job
+    return analyze_timeline(render_timeline(config, fps=fps), config)
+
+
+def sweep_configs(
+    presets: Iterable[PresetConfig],
+    *,
+    saturations: Sequence[int] = (),
+    brightnesses: Sequence[int] = (),
+    durations: Sequence[float] = (),
+) -> list[PresetConfig]:
+    configs = []
+    for preset in presets:
+        for saturation, brightness, duration in itertools.product(
+            saturations or [None], brightnesses or [None], durations or [None]
+        ):
+            configs.append(
+                with_overrides(
+                    preset,
+                    saturation_pct=saturation,
+                    brightness_pct=brightness,
+                    cycle_duration_s=duration,
+                )
+            )
+    return configs
+
+
+def run_analysis(
+    configs: Sequence[PresetConfig],
+    *,
+    fps: float = 30.0,
+    executor: Executor | None = None,
+    workers: int | None = None,
+) -> list[TimelineMetrics]:
+    """Analyze every config, on ``executor`` if given; ``workers`` is its
+    worker count (default: the available CPUs) and sizes the chunks."""
+    jobs = [(config, fps) for config in configs]
+    if executor is None:
+        return [analyze_preset(job) for job in jobs]
+    workers = workers or available_cpus()
+    chunksize = max(1, len(jobs) // (workers * 4))
+    return list(executor.map(analyze_preset, jobs, chunksize=chunksize))
+
+
+def build_report(metrics: Sequence[TimelineMetrics], *, fps: float, elapsed_s: float) -> dict:
+    return {
+        "report_version": REPORT_VERSION,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "fps": fps,
+        "elapsed_s": round(elapsed_s, 3),
+        "results": [asdict(item) for item in metrics],
+    }
+
+
+def _parse_range(text: str | None, cast) -> list:
+    if not text:
+        return []
+    if ":" in text:
+        start, stop, step = (cast(part) for part in text.split(":"))
+        if step <= 0:
+            raise ValueError(f"range {text!r} needs a positive STEP")
+        if start > stop:
+            raise ValueError(f"range {text!r} has START greater than STOP")
+        values = []
+        value = start
+        while value <= stop:
+            values.append(value)
+            value += step
+        return values
+    return [cast(part) for part in text.split(",")]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ambicolor.calibration_analyzer", description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", action="append", default=[], help="preset id to analyze (default: all)")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--saturation", help="saturation sweep, START:STOP:STEP or a comma list")
+    parser.add_argument("--brightness", help="brightness sweep, START:STOP:STEP or a comma list")
+    parser.add_argument("--duration", help="cycle duration sweep in seconds, START:STOP:STEP or a comma list")
+    parser.add_argument("--workers", type=int, default=available_cpus())
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    presets = [preset for preset in preset_catalog() if not args.preset or preset_key(preset.preset_id) in args.preset]
+    if not presets:
+        parser.error(f"no preset matches {args.preset}")
+    try:
+        configs = sweep_configs(
+            presets,
+            saturations=_parse_range(args.saturation, int),
+            brightnesses=_parse_range(args.brightness, int),
+            durations=_parse_range(args.duration, float),
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    start = time.perf_counter()
+    if args.workers > 1 and len(configs) > 1:
+        # Threads on a free-threaded build, processes otherwise.
+        with parallel_executor(args.workers) as executor:
+            metrics = run_analysis(configs, fps=args.fps, executor=executor, workers=args.workers)
+    else:
+        metrics = run_analysis(configs, fps=args.fps)
+    report = build_report(metrics, fps=args.fps, elapsed_s=time.perf_counter() - start)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+        print(f"Analyzed {len(metrics)} timelines in {report['elapsed_s']} s -> {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
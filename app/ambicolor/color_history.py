@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass
+
+from .color_math import normalize_hex
+
+
+@dataclass(slots=True, frozen=True)
+class HistoryEntry:
+    seq: int
+    timestamp_s: float
+    hue_deg: float
+    saturation_pct: int
+    brightness_pct: int
+    hex: str
+
+
+def _rgb_to_hex(rgb: int) -> str:
+    return f"#{rgb:06X}"
+
+
+class _SeqTable:
+    """Open-addressed map from a 24-bit color to a sequence number.
+
+    Sized once for the ring's capacity (load factor at most 1/2) and
+    never resized: deletions shift the following probe run back instead
+    of leaving tombstones. A dict under the same insert/delete churn
+    rehashes now and then, which shows up as retained memory in soak runs.
+    """
+
+    __slots__ = ("_keys", "_seqs", "_mask", "_shift")
+
+    def __init__(self, capacity: int) -> None:
+        bits = max(3, (2 * capacity - 1).bit_length())
+        size = 1 << bits
+        self._keys = array("i", [-1]) * size
+        self._seqs = array("q", bytes(8 * size))
+        self._mask = size - 1
+        self._shift = 32 - bits
+
+    def _home(self, rgb: int) -> int:
+        # Fibonacci hashing spreads neighbouring colors over the table.
+        return ((rgb * 2654435769) & 0xFFFFFFFF) >> self._shift
+
+    def _find(self, rgb: int) -> int:
+        keys = self._keys
+        mask = self._mask
+        index = self._home(rgb)
+        while True:
+            key = keys[index]
+            if key == rgb or key == -1:
+                return index
+            index = (index + 1) & mask
+
+    def get(self, rgb: int) -> int | None:
+        index = self._find(rgb)
+        return self._seqs[index] if self._keys[index] == rgb else None
+
+    def put(self, rgb: int, seq: int) -> None:
+        index = self._find(rgb)
+        self._keys[index] = rgb
+        self._seqs[index] = seq
+
+    def discard(self, rgb: int, seq: int) -> None:
+        # Removes the color only if it still maps to ``seq``.
+        keys = self._keys
+        seqs = self._seqs
+        mask = self._mask
+        hole = self._find(rgb)
+        if keys[hole] != rgb or seqs[hole] != seq:
+            return
+        index = hole
+        while True:
+            index = (index + 1) & mask
+            key = keys[index]
+            if key == -1:
+                break
+            home = self._home(key)
+            # An entry may move into the hole only if its home slot is not
+            # cyclically between the hole and its current slot.
+            if (hole < index and hole < home <= index) or (hole > index and (home > hole or home <= index)):
+                continue
+            keys[hole] = key
+            seqs[hole] = seqs[index]
+            hole = index
+        keys[hole] = -1
+
+    def clear(self) -> None:
+        keys = self._keys
+        for index in range(len(keys)):
+            keys[index] = -1
+
+
+class ColorHistory:
+    """Fixed-capacity ring of the most recent distinct colors.
+
+    Entries live in preallocated arrays, so recording a color writes a few
+    slots and never grows anything; HistoryEntry objects are only built
+    when queried. A per-second table remembers the newest entry at the end
+    of each second of the last ``index_seconds``, which makes lookup by
+    time a table read plus a scan over the colors of a single second, and
+    a fixed-size table from color to its newest entry makes lookup by hex
+    O(1).
+    """
+
+    __slots__ = (
+        "_capacity",
+        "_times",
+        "_hues",
+        "_sats",
+        "_bris",
+        "_rgb",
+        "_total",
+        "_last_rgb",
+        "_by_rgb",
+        "_window",
+        "_second_stamp",
+        "_second_seq",
+        "_filled_second",
+    )
+
+    def __init__(self, capacity: int = 4096, *, index_seconds: int = 3600) -> None:
+        if capacity < 1:
+            raise ValueError("history capacity must be at least 1")
+        if index_seconds < 1:
+            raise ValueError("history index must cover at least one second")
+        self._capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._hues = array("d", bytes(8 * capacity))
+        self._sats = array("B", bytes(capacity))
+        self._bris = array("B", bytes(capacity))
+        self._rgb = array("i", bytes(4 * capacity))
+        self._total = 0
+        self._last_rgb = -1
+        self._by_rgb = _SeqTable(capacity)
+
+        self._window = index_seconds
+        # Slot s % window holds the newest seq recorded before second s + 1
+        # ended, valid while _second_stamp matches s; -1 means none yet.
+        self._second_stamp = array("q", [-1]) * index_seconds
+        self._second_seq = array("q", [-1]) * index_seconds
+        self._filled_second: int | None = None
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return min(self._total, self._capacity)
+
+    def clear(self) -> None:
+        self._total = 0
+        self._last_rgb = -1
+        self._by_rgb.clear()
+        self._filled_second = None
+        for index in range(self._window):
+            self._second_stamp[index] = -1
+
+    def record(self, timestamp_s: float, hue_deg: float, saturation_pct: int, brightness_pct: int, rgb: int) -> bool:
+        # Returns False when the color equals the previous entry. Timestamps
+        # are expected to be non-decreasing (the engine clock is monotonic).
+        if rgb == self._last_rgb:
+            return False
+        seq = self._total
+        slot = seq % self._capacity
+        if seq >= self._capacity:
+            self._by_rgb.discard(self._rgb[slot], seq - self._capacity)
+
+        self._times[slot] = timestamp_s
+        self._hues[slot] = hue_deg
+        self._sats[slot] = saturation_pct
+        self._bris[slot] = brightness_pct
+        self._rgb[slot] = rgb
+        self._by_rgb.put(rgb, seq)
+        self._last_rgb = rgb
+        self._total = seq + 1
+
+        second = math.floor(timestamp_s)
+        filled = self._filled_second
+        if filled is not None and second < filled:
+            second = filled
+        if filled is not None and second > filled:
+            # Seconds without a new color keep pointing at the previous one.
+            for gap in range(max(filled + 1, second - self._window + 1), second):
+                self._second_stamp[gap % self._window] = gap
+                self._second_seq[gap % self._window] = seq - 1
+        self._filled_second = second
+        index = second % self._window
+        self._second_stamp[index] = second
+        self._second_seq[index] = seq
+        return True
+
+    def latest(self) -> HistoryEntry | None:
+        return self._entry(self._total - 1) if self._total else None
+
+    def at_time(self, timestamp_s: float) -> HistoryEntry | None:
+        """Return the color that was showing at ``timestamp_s``.
+
+        None if nothing was recorded yet at that time or the entry has been
+        overwritten (or falls outside the per-second index).
+        """
+        if not self._total or self._filled_second is None:
+            return None
+        second = math.floor(timestamp_s)
+        if second >= self._filled_second:
+            seq = self._total - 1
+        else:
+            index = second % self._window
+            if self._second_stamp[index] != second:
+                return None
+            seq = self._second_seq[index]
+        oldest = self._total - len(self)
+        times = self._times
+        capacity = self._capacity
+        while seq >= oldest and times[seq % capacity] > timestamp_s:
+            seq -= 1
+        if seq < oldest:
+            return None
+        return self._entry(seq)
+
+    def find_hex(self, hex_color: str) -> HistoryEntry | None:
+        rgb = int(normalize_hex(hex_color)[1:], 16)
+        seq = self._by_rgb.get(rgb)
+        return None if seq is None else self._entry(seq)
+
+    def entries(self, limit: int | None = None) -> list[HistoryEntry]:
+        # Newest first.
+        count = len(self) if limit is None else min(max(0, limit), len(self))
+        return [self._entry(self._total - 1 - offset) for offset in range(count)]
+
+    def _entry(self, seq: int) -> HistoryEntry:
+        slot = seq % self._capacity
+        return HistoryEntry(
+            seq=seq,
+            timestamp_s=self._times[slot],
+            hue_deg=self._hues[slot],
+            saturation_pct=self._sats[slot],
+            brightness_pct=self._bris[slot],
+            hex=_rgb_to_hex(self._rgb[slot]),
+        )
@@ -1,22 +1,146 @@
 from __future__ import annotations
 
+import heapq
+import itertools
+from collections import Counter
+from dataclasses import dataclass
+
 from .color_math import normalize_hex
 
 
+@dataclass(slots=True, frozen=True)
+class NameMatch:
+    hex: str
+    name: str
+    score: float
+
+    @property
+    def label(self) -> str:
+        # Same "Name (#RRGGBB)" form the color display uses, so it reads
+        # well in a list and through a screen reader.
+        return f"{self.name} ({self.hex})"
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _trigrams(text: str, *, complete: bool = True) -> set[str]:
+    # Padded so word starts get their own trigrams; a query being typed is
+    # not padded at the end, since its last word may be unfinished.
+    padded = f"  {text} " if complete else f"  {text}"
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
 class ColorNameStore:
-    """In-memory mapping between hex colors and user-defined names."""
+    """In-memory mapping between hex colors and user-defined names.
+
+    Names are indexed by trigram for fuzzy search. The index is updated
+    incrementally by set_name() at a cost proportional to the length of
+    the old and new name.
+    """
 
     def __init__(self) -> None:
         self._names: dict[str, str] = {}
+        self._index: dict[str, set[str]] = {}
+        self._folded: dict[str, str] = {}
+        self._trigram_counts: dict[str, int] = {}
+        # Recency of each name, used to break ties in search results.
+        self._updated: dict[str, int] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._names)
 
     def set_name(self, hex_color: str, name: str) -> None:
         key = normalize_hex(hex_color)
         cleaned = name.strip()
+        if key in self._names:
+            self._unindex(key)
         if cleaned:
             self._names[key] = cleaned
+            self._index_name(key, cleaned)
         elif key in self._names:
             del self._names[key]
 
     def get_name(self, hex_color: str) -> str | None:
         key = normalize_hex(hex_color)
         return self._names.get(key)
+
+    def search(self, query: str, *, limit: int = 10) -> list[NameMatch]:
+        """Names matching ``query`` best first, tolerant of typos and partial words.
+
+        Scores are the Dice overlap of trigram sets, raised when the query
+        appears literally in the name (more at a word start); equal scores
+        list recently named colors first. Two-letter queries match word
+        starts only; shorter ones match nothing.
+        """
+        text = _normalize_text(query)
+        if len(text) < 2 or limit <= 0:
+            return []
+        if len(text) == 2:
+            postings = self._index.get(f" {text}", ())
+            keys = heapq.nlargest(limit, postings, key=self._updated.__getitem__)
+            return [NameMatch(hex=key, name=self._names[key], score=1.0) for key in keys]
+
+        # The string-start trigram ("  t") is shared by a large share of all
+        # names and says little, so it is left out of the query.
+        grams = _trigrams(text, complete=False)
+        grams.discard(f"  {text[0]}")
+        hits: Counter[str] = Counter()
+        for gram in grams:
+            postings = self._index.get(gram)
+            if postings:
+                hits.update(postings)
+        by_shared: dict[int, list[str]] = {}
+        for key, shared in hits.items():
+            by_shared.setdefault(shared, []).append(key)
+
+        query_size = len(grams)
+        # A literal occurrence shares at least every trigram inside the query.
+        interior = len(text) - 2
+        required = max(1, query_size // 3)
+        top: list[tuple[float, int, str]] = []
+        for shared in sorted(by_shared, reverse=True):
+            if shared < required:
+                break
+            best_possible = 2.0 * shared / (query_size + shared) + (1.0 if shared >= interior else 0.0)
+            if len(top) == limit and best_possible < top[0][0]:
+                break
+            for key in by_shared[shared]:
+                score = 2.0 * shared / (query_size + self._trigram_counts[key])
+                if shared >= interior:
+                    folded = self._folded[key]
+                    position = folded.find(text)
+                    if position >= 0:
+                        score += 1.0 if position == 0 or folded[position - 1] == " " else 0.5
+                item = (score, self._updated[key], key)
+                if len(top) < limit:
+                    heapq.heappush(top, item)
+                elif item > top[0]:
+                    heapq.heapreplace(top, item)
+        top.sort(reverse=True)
+        return [NameMatch(hex=key, name=self._names[key], score=round(score, 4)) for score, _seq, key in top]
+
+    def _index_name(self, key: str, name: str) -> None:
+        folded = _normalize_text(name)
+        grams = _trigrams(folded)
+        for gram in grams:
+            postings = self._index.get(gram)
+            if postings is None:
+                self._index[gram] = {key}
+            else:
+                postings.add(key)
+        self._folded[key] = folded
+        self._trigram_counts[key] = len(grams)
+        self._updated[key] = next(self._sequence)
+
+    def _unindex(self, key: str) -> None:
+        for gram in _trigrams(self._folded.pop(key)):
+            postings = self._index.get(gram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._index[gram]
+        del self._trigram_counts[key]
+        del self._updated[key]
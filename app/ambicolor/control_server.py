@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any
+
+from .engine import ColorCycleEngine
+from .preset_registry import PresetRegistry, default_registry
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# Flush the socket buffer once this much response data is queued, so
+# pipelined clients get steady output without a drain per request.
+_DRAIN_THRESHOLD_BYTES = 64 * 1024
+# Batches arrive as a single line.
+_LINE_LIMIT_BYTES = 4 * 1024 * 1024
+
+
+class ControlDispatcher:
+    """JSON-RPC 2.0 method table for remote control of a ColorCycleEngine."""
+
+    def __init__(self, engine: ColorCycleEngine, presets: PresetRegistry | None = None) -> None:
+        self._engine = engine
+        self._presets = presets or default_registry()
+        self._methods: dict[str, Callable[..., Any]] = {
+            "start": engine.start,
+            "pause": engine.pause,
+            "resume": engine.resume,
+            "stop_standstill": engine.stop_standstill,
+            "apply_preset": self._apply_preset,
+            "set_cycle_duration": engine.set_cycle_duration,
+            "set_saturation": engine.set_saturation,
+            "set_brightness": engine.set_brightness,
+            "set_random_start_hue": engine.set_random_start_hue,
+            "set_hue_name": engine.set_hue_name,
+            "set_language": engine.set_language,
+            "current_snapshot": engine.current_snapshot,
+            "jump_to_history": self._jump_to_history,
+            "search_color_names": self._search_color_names,
+        }
+
+    @property
+    def method_names(self) -> list[str]:
+        return sorted(self._methods)
+
+    def handle_line(self, line: bytes) -> bytes | None:
+        """Handle one newline-delimited message; returns the encoded reply, if any."""
+        try:
+            message = json.loads(line)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return self._encode(_error_response(None, PARSE_ERROR, "Parse error"))
+
+        if isinstance(message, list):
+            if not message:
+                return self._encode(_error_response(None, INVALID_REQUEST, "Empty batch"))
+            responses = [response for item in message if (response := self.handle(item)) is not None]
+            return self._encode(responses) if responses else None
+
+        response = self.handle(message)
+        return None if response is None else self._encode(response)
+
+    def handle(self, request: Any) -> dict | None:
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or "method" not in request:
+            return _error_response(None, INVALID_REQUEST, "Invalid Request")
+
+        request_id = request.get("id")
+        is_notification = "id" not in request
+        if not isinstance(request["method"], str):
+            return _error_response(request_id, INVALID_REQUEST, "Invalid Request: method must be a string")
+        method = self._methods.get(request["method"])
+        if method is None:
+            response = _error_response(request_id, METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+            return None if is_notification else response
+
+        params = request.get("params", [])
+        try:
+            if isinstance(params, dict):
+                result = method(**params)
+            elif isinstance(params, list):
+                result = method(*params)
+            else:
+                raise TypeError("params must be an array or object")
+        except (TypeError, ValueError) as exc:
+            response = _error_response(request_id, INVALID_PARAMS, str(exc))
+        except Exception as exc:  # noqa: BLE001 - reported to the client, not raised into Qt
+            response = _error_response(request_id, INTERNAL_ERROR, str(exc))
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        return None if is_notification else response
+
+    def _apply_preset(self, preset_id: str) -> dict:
+        self._engine.apply_preset(self._presets.get(preset_id))
+        return self._engine.current_snapshot()
+
+    def _jump_to_history(self, seconds_ago: float | None = None, hex: str | None = None) -> dict:
+        history = self._engine.history
+        if (seconds_ago is None) == (hex is None):
+            raise ValueError("pass exactly one of seconds_ago or hex")
+        if hex is not None:
+            entry = history.find_hex(hex)
+        else:
+            entry = history.at_time(self._engine.now() - float(seconds_ago))
+        if entry is None:
+            raise ValueError("no matching color in history")
+        self._engine.jump_to_history(entry)
+        return self._engine.current_snapshot()
+
+    def _search_color_names(self, query: str, limit: int = 10) -> list[dict]:
+        return [
+            {"hex": match.hex, "name": match.name, "label": match.label, "score": match.score}
+            for match in self._engine.search_color_names(str(query), int(limit))
+        ]
+
+    @staticmethod
+    def _encode(payload: Any) -> bytes:
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _error_response(request_id: Any, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+class ControlServer:
+    """Newline-delimited JSON-RPC over localhost TCP or a Unix socket.
+
+    Requests are handled in arrival order, so clients may pipeline without
+    waiting for replies. Run it on the GUI thread's asyncio loop (see
+    QtAsyncioBridge) so engine calls never cross threads.
+    """
+
+    def __init__(
+        self,
+        engine: ColorCycleEngine,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        unix_path: str | None = None,
+        presets: PresetRegistry | None = None,
+    ) -> None:
+        self._dispatcher = ControlDispatcher(engine, presets)
+        self._host = host
+        self._port = port
+        self._unix_path = unix_path
+        self._server: asyncio.AbstractServer | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self.requests_handled = 0
+
+    @property
+    def address(self) -> str | tuple[str, int]:
+        if self._server is None:
+            raise RuntimeError("control server is not running")
+        if self._unix_path is not None:
+            return self._unix_path
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        if self._unix_path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle_client, path=self._unix_path, limit=_LINE_LIMIT_BYTES
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_client, host=self._host, port=self._port, limit=_LINE_LIMIT_BYTES
+            )
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        handle_line = self._dispatcher.handle_line
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                reply = handle_line(line)
+                self.requests_handled += 1
+                if reply is not None:
+                    writer.write(reply)
+                    if writer.transport.get_write_buffer_size() > _DRAIN_THRESHOLD_BYTES:
+                        await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
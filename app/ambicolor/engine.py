@@ -3,31 +3,50 @@ from __future__ import annotations
 import random
 import time
 from collections.abc import Callable
+from dataclasses import replace
+from typing import Protocol
 
-from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
 from PySide6.QtGui import QColor
 
-from .color_math import clamp, hsv_to_qcolor, normalize_hue, qcolor_to_hex
-from .color_naming import ColorNameStore
+from .color_history import ColorHistory, HistoryEntry
+from .color_math import clamp, hsv_to_qcolor, normalize_hue
+from .color_naming import ColorNameStore, NameMatch
+from .generators import GeneratorError, GeneratorHost, GeneratorParams, GeneratorStats, load_generator
 from .i18n import tr
-from .models import PlaybackState, PresetConfig, preset_catalog
+from .models import PlaybackState, PresetConfig, PresetId, preset_by_id
+
+
+class FrameSource(Protocol):
+    fps: float
+
+    def __len__(self) -> int: ...
+
+    def hue_at(self, frame: int) -> float: ...
+
+    def rgb_at(self, frame: int) -> tuple[int, int, int]: ...
 
 
 class ColorCycleEngine(QObject):
     color_changed = Signal(QColor, str, str)
+    screen_colors_changed = Signal(list)
     state_changed = Signal(str)
     params_changed = Signal(dict)
+    # Generator name and error when a running plugin raised and was dropped.
+    generator_failed = Signal(str, str)
 
     def __init__(
         self,
         *,
         language: str = "en",
         clock: Callable[[], float] | None = None,
+        rng: random.Random | None = None,
         parent: QObject | None = None,
     ) -> None:
         super().__init__(parent)
         self._language = language
         self._clock = clock or time.monotonic
+        self._rng = rng or random.Random()
         self._timer = QTimer(self)
         self._timer.setInterval(33)
         self._timer.timeout.connect(self._on_timer_tick)
@@ -44,21 +63,212 @@ class ColorCycleEngine(QObject):
         self._current_hue_deg = 0.0
         self._current_color = hsv_to_qcolor(self._current_hue_deg, self._saturation_pct, self._brightness_pct)
         self._last_tick_s: float | None = None
+        # Hex and display name of the last emitted color. A slow cycle shows
+        # the same 8-bit color for many ticks, so they are built only when
+        # the color (or a name, or the language) changes.
+        self._shown_rgb = -1
+        self._shown_hex = ""
+        self._shown_name = ""
+
+        # While rendering is suspended (window hidden/covered) the timer stays
+        # stopped but _last_tick_s keeps its value, so the next tick integrates
+        # the whole elapsed interval in one step.
+        self._render_suspended = False
+        self._suspend_requested = False
+        # Headless consumers (light output, frame ring, event stream) hold
+        # the engine awake: suspension is requested by the window but only
+        # takes effect while nobody holds it.
+        self._awake_holds = 0
+        self._suspended_since_s: float | None = None
+        self._wakeups_avoided = 0
+        # With external pacing (e.g. a FramePacer driving ticks from frame
+        # callbacks) the timer stays stopped and advance_frame() ticks.
+        self._external_pacing = False
+
+        self._screen_hue_offsets: list[float] = []
+
+        # Pre-rendered frames (e.g. a MappedTimeline) played instead of
+        # integrating the hue while the parameters they were rendered for
+        # stay in effect.
+        self._timeline: FrameSource | None = None
+        self._timeline_position_s = 0.0
+
+        # Generator plugin of the active preset, if any; its time advances
+        # with playback like the hue does.
+        self._generator: GeneratorHost | None = None
+        self._generator_name: str | None = None
+        self._generator_time_s = 0.0
+
+        # Called as hook(kind, *args) after every input and tick, e.g. by the
+        # session recorder. Kept as a plain list: ticks stay cheap when empty.
+        self._event_hooks: list[Callable[..., None]] = []
+
+        self._active_preset: PresetConfig | None = None
 
         self._name_store = ColorNameStore()
+        # Distinct colors shown recently, for jumping back to one.
+        self._history = ColorHistory()
 
-        self.apply_preset(preset_catalog()[0])
+        self.apply_preset(preset_by_id(PresetId.CLASSIC))
 
     @property
     def state(self) -> PlaybackState:
         return self._state
 
+    @property
+    def current_color(self) -> QColor:
+        return self._current_color
+
+    @property
+    def active_preset(self) -> PresetConfig:
+        return self._active_preset
+
+    @property
+    def current_display_name(self) -> str:
+        return self._shown_name
+
+    @property
+    def tick_interval_s(self) -> float:
+        return self._timer.interval() / 1000.0
+
+    def set_tick_interval_s(self, seconds: float) -> None:
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(max(1, round(seconds * 1000.0)))
+        if self._generator is not None:
+            self._generator.set_frame_interval_s(self.tick_interval_s)
+
+    @property
+    def render_suspended(self) -> bool:
+        return self._render_suspended
+
+    @property
+    def wants_frames(self) -> bool:
+        return self._state == PlaybackState.RUNNING and not self._render_suspended
+
+    def set_external_pacing(self, enabled: bool) -> None:
+        self._external_pacing = bool(enabled)
+        if self._external_pacing:
+            self._timer.stop()
+        elif self.wants_frames:
+            self._timer.start()
+
+    def advance_frame(self) -> None:
+        # One tick for an externally paced engine; does nothing unless running.
+        self._on_timer_tick()
+
+    @property
+    def wakeups_avoided(self) -> int:
+        pending = 0
+        if self._suspended_since_s is not None:
+            pending = self._count_skipped_ticks(self._suspended_since_s, self._clock())
+        return self._wakeups_avoided + pending
+
+    @property
+    def held_awake(self) -> bool:
+        return self._awake_holds > 0
+
+    def hold_awake(self) -> None:
+        self._awake_holds += 1
+        self._apply_render_suspension()
+
+    def release_awake(self) -> None:
+        if self._awake_holds > 0:
+            self._awake_holds -= 1
+            self._apply_render_suspension()
+
+    def set_render_suspended(self, suspended: bool) -> None:
+        self._suspend_requested = bool(suspended)
+        self._apply_render_suspension()
+
+    def _apply_render_suspension(self) -> None:
+        suspended = self._suspend_requested and not self._awake_holds
+        if suspended == self._render_suspended:
+            return
+        self._render_suspended = suspended
+        if suspended:
+            self._timer.stop()
+            if self._state == PlaybackState.RUNNING:
+                self._suspended_since_s = self._clock()
+            self._notify("render_suspended", True)
+            return
+
+        if self._suspended_since_s is not None:
+            self._wakeups_avoided += self._count_skipped_ticks(self._suspended_since_s, self._clock())
+            self._suspended_since_s = None
+        if self._state == PlaybackState.RUNNING:
+            # Catch up straight from elapsed time instead of replaying ticks.
+            self._on_timer_tick()
+            if not self._external_pacing:
+                self._timer.start()
+        self._notify("render_suspended", False)
+
+    def add_event_hook(self, hook: Callable[..., None]) -> None:
+        self._event_hooks.append(hook)
+
+    def remove_event_hook(self, hook: Callable[..., None]) -> None:
+        if hook in self._event_hooks:
+            self._event_hooks.remove(hook)
+
+    def capture_state(self) -> dict:
+        return {
+            "state": self._state.value,
+            "cycle_duration_s": self._cycle_duration_s,
+            "saturation_pct": self._saturation_pct,
+            "brightness_pct": self._brightness_pct,
+            "random_start_hue": self._random_start_hue,
+            "hue_min_deg": self._hue_min_deg,
+            "hue_max_deg": self._hue_max_deg,
+            "hue_deg": self._current_hue_deg,
+            "bounded_direction": self._bounded_direction,
+            "last_tick_s": self._last_tick_s,
+        }
+
+    def restore_state(self, state: dict) -> None:
+        # Counterpart of capture_state(); restores the exact motion state
+        # (hue, bounce direction, last tick) rather than a preset.
+        self._timeline = None
+        self._cycle_duration_s = float(clamp(state["cycle_duration_s"], 1.0, 3600.0))
+        self._saturation_pct = int(clamp(state["saturation_pct"], 0, 100))
+        self._brightness_pct = int(clamp(state["brightness_pct"], 0, 100))
+        self._random_start_hue = bool(state["random_start_hue"])
+        self._hue_min_deg = normalize_hue(state["hue_min_deg"])
+        self._hue_max_deg = normalize_hue(state["hue_max_deg"])
+        self._current_hue_deg = normalize_hue(state["hue_deg"])
+        self._bounded_direction = -1.0 if state.get("bounded_direction", 1.0) < 0 else 1.0
+        self._update_generator_params()
+
+        playback = PlaybackState(state["state"])
+        last_tick = state.get("last_tick_s")
+        if playback == PlaybackState.RUNNING:
+            self._last_tick_s = self._clock() if last_tick is None else float(last_tick)
+        else:
+            self._last_tick_s = None
+        if playback != self._state:
+            self._state = playback
+            if playback == PlaybackState.RUNNING:
+                self._start_timer()
+            else:
+                self._stop_timer()
+            self._emit_state_changed()
+        self._emit_color_changed()
+        self.params_changed.emit(self.current_snapshot())
+        self._notify("restore")
+
+    def catch_up(self) -> None:
+        # Integrates the time since the last tick now rather than at the next
+        # timer tick, e.g. right after restoring a state saved long ago.
+        self._on_timer_tick()
+
     def set_language(self, language: str) -> None:
         self._language = language
+        self._shown_rgb = -1
         self._emit_state_changed()
         self._emit_color_changed()
+        self._notify("language", language)
 
     def apply_preset(self, config: PresetConfig) -> None:
+        self._set_generator(config)
+        self._timeline = None
         self._cycle_duration_s = float(clamp(config.cycle_duration_s, 1.0, 3600.0))
         self._saturation_pct = int(clamp(config.saturation_pct, 0, 100))
         self._brightness_pct = int(clamp(config.brightness_pct, 0, 100))
@@ -66,6 +276,8 @@ class ColorCycleEngine(QObject):
         self._hue_min_deg = normalize_hue(config.hue_min_deg)
         self._hue_max_deg = normalize_hue(config.hue_max_deg)
         self._bounded_direction = 1.0
+        self._active_preset = config
+        self._update_generator_params()
 
         if self._state == PlaybackState.STANDSTILL:
             if self._random_start_hue:
@@ -75,6 +287,25 @@ class ColorCycleEngine(QObject):
 
         self._emit_color_changed()
         self.params_changed.emit(self.current_snapshot())
+        self._notify("preset", config)
+
+    def update_preset_in_place(self, config: PresetConfig) -> None:
+        # Used for live preset edits: keeps hue phase, bounce direction and
+        # playback state so the running cycle continues without a jump.
+        if config.generator != self.generator_name:
+            self._set_generator(config)
+        self._leave_timeline()
+        self._cycle_duration_s = float(clamp(config.cycle_duration_s, 1.0, 3600.0))
+        self._saturation_pct = int(clamp(config.saturation_pct, 0, 100))
+        self._brightness_pct = int(clamp(config.brightness_pct, 0, 100))
+        self._random_start_hue = bool(config.random_start_hue)
+        self._hue_min_deg = normalize_hue(config.hue_min_deg)
+        self._hue_max_deg = normalize_hue(config.hue_max_deg)
+        self._active_preset = config
+        self._update_generator_params()
+        self._emit_color_changed()
+        self.params_changed.emit(self.current_snapshot())
+        self._notify("preset_in_place", config)
 
     def start(self) -> None:
         if self._state == PlaybackState.RUNNING:
@@ -90,56 +321,155 @@ class ColorCycleEngine(QObject):
 
         self._last_tick_s = self._clock()
         self._state = PlaybackState.RUNNING
-        self._timer.start()
-        self._emit_color_changed()
+        self._start_timer()
+        self._generator_time_s = 0.0
+        if self._timeline is not None:
+            self._timeline_position_s = 0.0
+            self._show_timeline_frame(0)
+        else:
+            self._emit_color_changed()
         self._emit_state_changed()
+        self._notify("start")
 
     def pause(self) -> None:
         if self._state != PlaybackState.RUNNING:
             return
-        self._timer.stop()
+        self._stop_timer()
         self._last_tick_s = None
         self._state = PlaybackState.PAUSED
         self._emit_state_changed()
+        self._notify("pause")
 
     def resume(self) -> None:
         if self._state != PlaybackState.PAUSED:
             return
         self._last_tick_s = self._clock()
         self._state = PlaybackState.RUNNING
-        self._timer.start()
+        self._start_timer()
         self._emit_state_changed()
+        self._notify("resume")
 
     def stop_standstill(self) -> None:
         if self._state == PlaybackState.STANDSTILL:
             return
-        self._timer.stop()
+        self._stop_timer()
         self._last_tick_s = None
         self._state = PlaybackState.STANDSTILL
         self._emit_state_changed()
         self._emit_color_changed()
+        self._notify("stop")
 
     def set_cycle_duration(self, seconds: float) -> None:
+        self._leave_timeline()
         self._cycle_duration_s = float(clamp(seconds, 1.0, 3600.0))
+        self._update_generator_params()
         self.params_changed.emit(self.current_snapshot())
+        self._notify("cycle_duration", self._cycle_duration_s)
 
     def set_saturation(self, percent: int) -> None:
+        self._leave_timeline()
         self._saturation_pct = int(clamp(percent, 0, 100))
+        self._update_generator_params()
         self._emit_color_changed()
         self.params_changed.emit(self.current_snapshot())
+        self._notify("saturation", self._saturation_pct)
 
     def set_brightness(self, percent: int) -> None:
+        self._leave_timeline()
         self._brightness_pct = int(clamp(percent, 0, 100))
+        self._update_generator_params()
         self._emit_color_changed()
         self.params_changed.emit(self.current_snapshot())
+        self._notify("brightness", self._brightness_pct)
 
     def set_random_start_hue(self, enabled: bool) -> None:
         self._random_start_hue = bool(enabled)
         self.params_changed.emit(self.current_snapshot())
+        self._notify("random_start", self._random_start_hue)
+
+    @property
+    def timeline(self) -> FrameSource | None:
+        return self._timeline
+
+    def play_timeline(self, timeline: FrameSource) -> None:
+        # The timeline must match the current parameters; frame 0 is shown
+        # at start and playback falls back to live rendering at its end.
+        if len(timeline) == 0:
+            raise ValueError("timeline has no frames")
+        self._timeline = timeline
+        self._timeline_position_s = 0.0
+        if self._state == PlaybackState.RUNNING:
+            self._last_tick_s = self._clock()
+            self._show_timeline_frame(0)
+        else:
+            if self._state == PlaybackState.PAUSED:
+                self.stop_standstill()
+            self.start()
+
+    @property
+    def history(self) -> ColorHistory:
+        return self._history
+
+    def now(self) -> float:
+        return self._clock()
+
+    def jump_to_history(self, entry: HistoryEntry) -> None:
+        # Shows a past color as the standstill color, leaving any timeline
+        # or generator plugin behind.
+        self._timeline = None
+        if self._generator is not None:
+            self._generator.close()
+            self._generator = None
+            self._generator_name = None
+        if self._state != PlaybackState.STANDSTILL:
+            self._stop_timer()
+            self._last_tick_s = None
+            self._state = PlaybackState.STANDSTILL
+            self._emit_state_changed()
+        self._current_hue_deg = normalize_hue(entry.hue_deg)
+        self._saturation_pct = int(clamp(entry.saturation_pct, 0, 100))
+        self._brightness_pct = int(clamp(entry.brightness_pct, 0, 100))
+        self._emit_color_changed()
+        self.params_changed.emit(self.current_snapshot())
+        self._notify("history_jump", entry.seq)
+
+    @property
+    def generator_name(self) -> str | None:
+        return self._generator_name
+
+    @property
+    def generator_time_s(self) -> float:
+        return self._generator_time_s
+
+    def restore_generator(self, name: str | None, time_s: float) -> None:
+        # Counterpart of generator_name and generator_time_s, used by session
+        # replay; the plugin runs with the current cycle parameters.
+        if name != self._generator_name:
+            base = self._active_preset or preset_by_id(PresetId.CLASSIC)
+            self._set_generator(replace(base, generator=name))
+            self._update_generator_params()
+        self._generator_time_s = float(time_s)
+
+    @property
+    def generator_stats(self) -> GeneratorStats | None:
+        return None if self._generator is None else self._generator.stats()
+
+    @property
+    def screen_hue_offsets(self) -> list[float]:
+        return list(self._screen_hue_offsets)
+
+    def set_screen_hue_offsets(self, offsets: list[float]) -> None:
+        self._screen_hue_offsets = [float(offset) for offset in offsets]
+        self._emit_color_changed()
 
     def set_hue_name(self, hex_color: str, name: str) -> None:
         self._name_store.set_name(hex_color, name)
+        self._shown_rgb = -1
         self._emit_color_changed()
+        self._notify("hue_name", hex_color, name)
+
+    def search_color_names(self, query: str, limit: int = 10) -> list[NameMatch]:
+        return self._name_store.search(query, limit=limit)
 
     def current_snapshot(self) -> dict:
         return {
@@ -149,13 +479,27 @@ class ColorCycleEngine(QObject):
             "brightness_pct": self._brightness_pct,
             "random_start_hue": self._random_start_hue,
             "hue_deg": self._current_hue_deg,
-            "hex": qcolor_to_hex(self._current_color),
+            "hex": self._shown_hex,
         }
 
+    def frame_params(self) -> tuple[float, int, int, float, PlaybackState]:
+        return (
+            self._current_hue_deg,
+            self._saturation_pct,
+            self._brightness_pct,
+            self._cycle_duration_s,
+            self._state,
+        )
+
     def _on_timer_tick(self) -> None:
         if self._state != PlaybackState.RUNNING:
             return
         now = self._clock()
+        self._advance_to(now)
+        if self._event_hooks:
+            self._notify("tick", now)
+
+    def _advance_to(self, now: float) -> None:
         if self._last_tick_s is None:
             self._last_tick_s = now
             return
@@ -163,6 +507,20 @@ class ColorCycleEngine(QObject):
         dt = max(0.0, now - self._last_tick_s)
         self._last_tick_s = now
 
+        if self._timeline is not None:
+            self._timeline_position_s += dt
+            # The epsilon keeps frame i at exactly i / fps from rounding down.
+            frame = int(self._timeline_position_s * self._timeline.fps + 1e-6)
+            if frame < len(self._timeline):
+                self._show_timeline_frame(frame)
+                return
+            self._leave_timeline()
+
+        if self._generator is not None:
+            self._generator_time_s += dt
+            self._emit_color_changed()
+            return
+
         if self._cycle_duration_s <= 0:
             return
 
@@ -175,6 +533,87 @@ class ColorCycleEngine(QObject):
 
         self._emit_color_changed()
 
+    def _notify(self, kind: str, *args: object) -> None:
+        for hook in self._event_hooks:
+            hook(kind, *args)
+
+    def _set_generator(self, config: PresetConfig) -> None:
+        # Loading imports the plugin; it happens only when a preset using it
+        # is applied. A plugin that fails to load or to compute its first
+        # color raises GeneratorError before any engine state has changed.
+        host = None
+        if config.generator:
+            host = GeneratorHost(
+                load_generator(config.generator),
+                GeneratorParams.from_config(config),
+                frame_interval_s=self.tick_interval_s,
+            )
+            try:
+                host.color_at(0.0)
+            except GeneratorError:
+                host.close()
+                raise
+        if self._generator is not None:
+            self._generator.close()
+        self._generator = host
+        self._generator_name = config.generator if host is not None else None
+        self._generator_time_s = 0.0
+
+    def _drop_generator(self, error: GeneratorError) -> None:
+        # A plugin that raises while running is dropped; the hue cycle
+        # continues from the hue of its last color.
+        name = self._generator_name or ""
+        self._generator.close()
+        self._generator = None
+        self._generator_name = None
+        self.generator_failed.emit(name, str(error))
+        self._notify("generator_failed", name, str(error))
+
+    def _update_generator_params(self) -> None:
+        if self._generator is not None:
+            self._generator.set_params(
+                GeneratorParams(
+                    cycle_duration_s=self._cycle_duration_s,
+                    saturation_pct=self._saturation_pct,
+                    brightness_pct=self._brightness_pct,
+                    hue_min_deg=self._hue_min_deg,
+                    hue_max_deg=self._hue_max_deg,
+                )
+            )
+
+    def _show_timeline_frame(self, frame: int) -> None:
+        self._current_hue_deg = self._timeline.hue_at(frame)
+        self._emit_color_changed(QColor(*self._timeline.rgb_at(frame)))
+
+    def _leave_timeline(self) -> None:
+        timeline = self._timeline
+        if timeline is None:
+            return
+        self._timeline = None
+        # Continue live in the direction the timeline was moving.
+        frame = min(len(timeline) - 1, int(self._timeline_position_s * timeline.fps + 1e-6))
+        if frame > 0:
+            step = (timeline.hue_at(frame) - timeline.hue_at(frame - 1) + 180.0) % 360.0 - 180.0
+            if step:
+                self._bounded_direction = 1.0 if step > 0 else -1.0
+
+    def _start_timer(self) -> None:
+        if self._render_suspended:
+            self._suspended_since_s = self._clock()
+            return
+        if not self._external_pacing:
+            self._timer.start()
+
+    def _stop_timer(self) -> None:
+        self._timer.stop()
+        if self._suspended_since_s is not None:
+            self._wakeups_avoided += self._count_skipped_ticks(self._suspended_since_s, self._clock())
+            self._suspended_since_s = None
+
+    def _count_skipped_ticks(self, since_s: float, now_s: float) -> int:
+        interval_s = self._timer.interval() / 1000.0
+        return int(max(0.0, now_s - since_s) / interval_s)
+
     def _hue_span(self) -> float:
         span = (self._hue_max_deg - self._hue_min_deg) % 360.0
         return 360.0 if span == 0 else span
@@ -182,15 +621,17 @@ class ColorCycleEngine(QObject):
     def _random_hue(self) -> float:
         span = self._hue_span()
         if span >= 360.0:
-            return random.uniform(0.0, 360.0)
-        return normalize_hue(self._hue_min_deg + random.uniform(0.0, span))
+            return self._rng.uniform(0.0, 360.0)
+        return normalize_hue(self._hue_min_deg + self._rng.uniform(0.0, span))
 
     def _advance_bounded_hue(self, delta_hue: float, span: float) -> float:
         # Convert to a local coordinate within [0, span] and bounce at edges
         # to avoid a hard jump from max back to min.
         local = (self._current_hue_deg - self._hue_min_deg) % 360.0
         local = clamp(local, 0.0, span)
-        local += delta_hue * self._bounded_direction
+        # A full bounce (up and back down) returns to the same position and
+        # direction, so long gaps (e.g. after a suspended window) fold in O(1).
+        local += (delta_hue % (2.0 * span)) * self._bounded_direction
 
         while local > span or local < 0.0:
             if local > span:
@@ -208,11 +649,34 @@ class ColorCycleEngine(QObject):
             return f"{user_name} ({hex_color})"
         return f"{tr(self._language, 'text.unnamed')} ({hex_color})"
 
-    def _emit_color_changed(self) -> None:
-        self._current_color = hsv_to_qcolor(self._current_hue_deg, self._saturation_pct, self._brightness_pct)
-        hex_color = qcolor_to_hex(self._current_color)
-        display_name = self._display_name_for_hex(hex_color)
-        self.color_changed.emit(self._current_color, hex_color, display_name)
+    def _emit_color_changed(self, color: QColor | None = None) -> None:
+        if color is None and self._generator is not None:
+            try:
+                color = QColor(*self._generator.color_at(self._generator_time_s))
+            except GeneratorError as exc:
+                self._drop_generator(exc)
+            else:
+                hue = color.hsvHueF()
+                if hue >= 0.0:
+                    self._current_hue_deg = hue * 360.0
+        if color is None:
+            color = hsv_to_qcolor(self._current_hue_deg, self._saturation_pct, self._brightness_pct)
+        self._current_color = color
+        rgb = color.rgb() & 0xFFFFFF
+        self._history.record(self._clock(), self._current_hue_deg, self._saturation_pct, self._brightness_pct, rgb)
+        if rgb != self._shown_rgb:
+            self._shown_rgb = rgb
+            self._shown_hex = f"#{rgb:06X}"
+            self._shown_name = self._display_name_for_hex(self._shown_hex)
+        self.color_changed.emit(color, self._shown_hex, self._shown_name)
+        if self._screen_hue_offsets:
+            # All screens share one tick; their colors are derived together.
+            hue = self._current_hue_deg
+            sat = self._saturation_pct
+            bri = self._brightness_pct
+            self.screen_colors_changed.emit(
+                [hsv_to_qcolor(hue + offset, sat, bri) for offset in self._screen_hue_offsets]
+            )
 
     def _emit_state_changed(self) -> None:
         if self._state == PlaybackState.RUNNING:
@@ -0,0 +1,374 @@
+"""Export rendered presets or recorded sessions as Y4M video, PNG sequences
+or animated previews.
+
+Run from the ``app`` directory::
+
+    python -m ambicolor.exporter --preset classic --duration 3600 --format y4m -o show.y4m
+    python -m ambicolor.exporter --preset ambient_lamp --format png -o frames/
+    python -m ambicolor.exporter --preset spectrum_sweep --format apng --size 160x90 --fps 10 -o preview.png
+    python -m ambicolor.exporter --session field.ambisession --format y4m -o field.y4m
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+import struct
+import sys
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cache
+from pathlib import Path
+from typing import BinaryIO
+
+from .models import preset_catalog, preset_key
+from .timeline import iter_frames, with_overrides
+
+EXPORT_FORMATS = ("y4m", "png", "apng", "gif")
+
+RGB = tuple[int, int, int]
+
+# Longest single frame delay the animated formats can store.
+_APNG_MAX_DELAY_MS = 65535
+_GIF_MAX_DELAY_CS = 65535
+
+
+def rgb_runs(frames: Iterable[RGB]) -> Iterator[tuple[RGB, int]]:
+    """Collapse consecutive identical frames into (color, repeat count)."""
+    for color, group in itertools.groupby(frames):
+        yield color, sum(1 for _ in group)
+
+
+def _ordered_map(
+    encode: Callable[[RGB], bytes],
+    runs: Iterable[tuple[RGB, int]],
+    executor: ThreadPoolExecutor | None,
+    window: int,
+) -> Iterator[tuple[bytes, int]]:
+    # At most ``window`` encodes are in flight, so memory stays flat no
+    # matter how long the input is. zlib releases the GIL while compressing.
+    if executor is None:
+        for color, count in runs:
+            yield encode(color), count
+        return
+    pending: deque[tuple[Future[bytes], int]] = deque()
+    for color, count in runs:
+        pending.append((executor.submit(encode, color), count))
+        if len(pending) >= window:
+            future, queued_count = pending.popleft()
+            yield future.result(), queued_count
+    while pending:
+        future, queued_count = pending.popleft()
+        yield future.result(), queued_count
+
+
+# -- Y4M ---------------------------------------------------------------------
+
+
+def rgb_to_ycbcr(red: int, green: int, blue: int) -> tuple[int, int, int]:
+    # BT.601 limited range, the Y4M default that playout tools assume.
+    y = 16 + (65.481 * red + 128.553 * green + 24.966 * blue) / 255
+    cb = 128 + (-37.797 * red - 74.203 * green + 112.0 * blue) / 255
+    cr = 128 + (112.0 * red - 93.786 * green - 18.214 * blue) / 255
+    return round(y), round(cb), round(cr)
+
+
+def _fps_fraction(fps: float) -> tuple[int, int]:
+    if float(fps).is_integer():
+        return int(fps), 1
+    return round(fps * 1000), 1000
+
+
+def write_y4m(stream: BinaryIO, runs: Iterable[tuple[RGB, int]], *, width: int, height: int, fps: float) -> int:
+    num, den = _fps_fraction(fps)
+    stream.write(f"YUV4MPEG2 W{width} H{height} F{num}:{den} Ip A1:1 C420jpeg XCOLORRANGE=LIMITED\n".encode("ascii"))
+    luma_size = width * height
+    chroma_size = ((width + 1) // 2) * ((height + 1) // 2)
+    frames = 0
+    for (red, green, blue), count in runs:
+        y, cb, cr = rgb_to_ycbcr(red, green, blue)
+        frame = b"FRAME\n" + bytes((y,)) * luma_size + bytes((cb,)) * chroma_size + bytes((cr,)) * chroma_size
+        for _ in range(count):
+            stream.write(frame)
+        frames += count
+    return frames
+
+
+# -- PNG / APNG --------------------------------------------------------------
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _ihdr(width: int, height: int) -> bytes:
+    # 8-bit truecolor, no interlace.
+    return _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+
+def solid_png_data(color: RGB, width: int, height: int, level: int = 6) -> bytes:
+    """Return the zlib stream for a solid-color truecolor image."""
+    row = b"\x00" + bytes(color) * width
+    return zlib.compress(row * height, level)
+
+
+def encode_png(color: RGB, width: int, height: int) -> bytes:
+    return (
+        _PNG_SIGNATURE
+        + _ihdr(width, height)
+        + _chunk(b"IDAT", solid_png_data(color, width, height))
+        + _chunk(b"IEND", b"")
+    )
+
+
+def write_png_sequence(
+    directory: Path,
+    runs: Iterable[tuple[RGB, int]],
+    *,
+    width: int,
+    height: int,
+    executor: ThreadPoolExecutor | None = None,
+    window: int = 8,
+) -> int:
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    frames = 0
+    for data, count in _ordered_map(lambda color: encode_png(color, width, height), runs, executor, window):
+        for _ in range(count):
+            (directory / f"frame_{frames:06d}.png").write_bytes(data)
+            frames += 1
+    return frames
+
+
+def _split_delays(count: int, frame_delay: float, limit: int) -> Iterator[int]:
+    total = round(count * frame_delay)
+    while total > limit:
+        yield limit
+        total -= limit
+    yield max(1, total)
+
+
+def write_apng(
+    stream: BinaryIO,
+    runs: Iterable[tuple[RGB, int]],
+    *,
+    width: int,
+    height: int,
+    fps: float,
+    executor: ThreadPoolExecutor | None = None,
+    window: int = 8,
+) -> int:
+    """Write an animated PNG; identical consecutive frames become one frame
+    with a longer delay. ``stream`` must be seekable because the frame count
+    in acTL is only known at the end."""
+    stream.write(_PNG_SIGNATURE + _ihdr(width, height))
+    actl_offset = stream.tell()
+    stream.write(_chunk(b"acTL", struct.pack(">II", 1, 0)))
+    sequence = 0
+    animation_frames = 0
+    frames = 0
+    for data, count in _ordered_map(lambda color: solid_png_data(color, width, height), runs, executor, window):
+        for delay_ms in _split_delays(count, 1000.0 / fps, _APNG_MAX_DELAY_MS):
+            stream.write(
+                _chunk(b"fcTL", struct.pack(">IIIIIHHBB", sequence, width, height, 0, 0, delay_ms, 1000, 0, 0))
+            )
+            sequence += 1
+            if animation_frames == 0:
+                stream.write(_chunk(b"IDAT", data))
+            else:
+                stream.write(_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+                sequence += 1
+            animation_frames += 1
+        frames += count
+    stream.write(_chunk(b"IEND", b""))
+    end = stream.tell()
+    stream.seek(actl_offset)
+    stream.write(_chunk(b"acTL", struct.pack(">II", animation_frames, 0)))
+    stream.seek(end)
+    return frames
+
+
+# -- GIF ---------------------------------------------------------------------
+
+
+def _lzw_encode(indices: bytes, min_code_size: int) -> bytes:
+    clear = 1 << min_code_size
+    end = clear + 1
+    out = bytearray()
+    bit_buffer = 0
+    bit_count = 0
+
+    def emit(code: int, size: int) -> None:
+        nonlocal bit_buffer, bit_count
+        bit_buffer |= code << bit_count
+        bit_count += size
+        while bit_count >= 8:
+            out.append(bit_buffer & 0xFF)
+            bit_buffer >>= 8
+            bit_count -= 8
+
+    def reset() -> tuple[dict[bytes, int], int, int]:
+        return {bytes((index,)): index for index in range(clear)}, clear + 2, min_code_size + 1
+
+    table, next_code, code_size = reset()
+    emit(clear, code_size)
+    prefix = b""
+    for index in indices:
+        candidate = prefix + bytes((index,))
+        if candidate in table:
+            prefix = candidate
+            continue
+        emit(table[prefix], code_size)
+        if next_code < 4096:
+            table[candidate] = next_code
+            next_code += 1
+            if next_code > (1 << code_size) and code_size < 12:
+                code_size += 1
+        else:
+            emit(clear, code_size)
+            table, next_code, code_size = reset()
+        prefix = bytes((index,))
+    if prefix:
+        emit(table[prefix], code_size)
+    emit(end, code_size)
+    if bit_count:
+        out.append(bit_buffer & 0xFF)
+    return bytes(out)
+
+
+@cache
+def _solid_gif_image_data(width: int, height: int) -> bytes:
+    # Every frame is palette index 0, so the LZW stream depends only on the
+    # frame size and is shared by all frames; only the color table changes.
+    data = _lzw_encode(bytes(width * height), 2)
+    blocks = bytearray((2,))
+    for offset in range(0, len(data), 255):
+        block = data[offset : offset + 255]
+        blocks.append(len(block))
+        blocks += block
+    blocks.append(0)
+    return bytes(blocks)
+
+
+def write_gif(stream: BinaryIO, runs: Iterable[tuple[RGB, int]], *, width: int, height: int, fps: float) -> int:
+    image_data = _solid_gif_image_data(width, height)
+    stream.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0))
+    # Loop forever.
+    stream.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+    frames = 0
+    for color, count in runs:
+        for delay_cs in _split_delays(count, 100.0 / fps, _GIF_MAX_DELAY_CS):
+            stream.write(b"\x21\xf9\x04\x00" + struct.pack("<H", delay_cs) + b"\x00\x00")
+            # Image descriptor with a 4-entry local color table.
+            stream.write(b"\x2c" + struct.pack("<HHHHB", 0, 0, width, height, 0x81))
+            stream.write(bytes(color) + bytes(9))
+            stream.write(image_data)
+        frames += count
+    stream.write(b"\x3b")
+    return frames
+
+
+# -- Command line ------------------------------------------------------------
+
+
+def export(
+    frames: Iterable[RGB],
+    fmt: str,
+    output: Path | str,
+    *,
+    width: int,
+    height: int,
+    fps: float,
+    workers: int = 1,
+) -> int:
+    """Stream ``frames`` into ``output`` and return the number of frames written.
+
+    ``output`` is a directory for ``png`` and a file path (or ``-`` for
+    stdout with ``y4m``) otherwise.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if width <= 0 or height <= 0 or fps <= 0:
+        raise ValueError("width, height and fps must be positive")
+    runs = rgb_runs(frames)
+    if fmt == "gif":
+        with open(output, "wb") as stream:
+            return write_gif(stream, runs, width=width, height=height, fps=fps)
+    if fmt == "y4m":
+        if str(output) == "-":
+            return write_y4m(sys.stdout.buffer, runs, width=width, height=height, fps=fps)
+        with open(output, "wb") as stream:
+            return write_y4m(stream, runs, width=width, height=height, fps=fps)
+
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    window = max(2, workers * 2)
+    try:
+        if fmt == "png":
+            return write_png_sequence(Path(output), runs, width=width, height=height, executor=executor, window=window)
+        with open(output, "wb") as stream:
+            return write_apng(stream, runs, width=width, height=height, fps=fps, executor=executor, window=window)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def _parse_size(text: str) -> tuple[int, int]:
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}") from None
+    return width, height
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ambicolor.exporter", description="Export a preset or a recorded session.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--preset", help="preset id to render")
+    source.add_argument("--session", help="replay a recorded session file (--record-session)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="y4m")
+    parser.add_argument("--duration", type=float, help="seconds to render (default: one full cycle)")
+    parser.add_argument("--fps", type=float, default=25.0)
+    parser.add_argument("--size", type=_parse_size, default=(1920, 1080), help="WIDTHxHEIGHT")
+    parser.add_argument("--saturation", type=int)
+    parser.add_argument("--brightness", type=int)
+    parser.add_argument("--cycle-duration", type=float)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("-o", "--output", required=True)
+    args = parser.parse_args(argv)
+
+    frame_count = None if args.duration is None else int(round(args.duration * args.fps))
+    if args.session:
+        from .session_recorder import load_session, session_frames
+
+        try:
+            records = load_session(Path(args.session))
+        except (OSError, ValueError) as exc:
+            parser.error(str(exc))
+        frames = itertools.islice(session_frames(records, fps=args.fps), frame_count)
+    else:
+        matches = [preset for preset in preset_catalog() if preset_key(preset.preset_id) == args.preset]
+        if not matches:
+            parser.error(f"unknown preset {args.preset!r}")
+        config = with_overrides(
+            matches[0],
+            cycle_duration_s=args.cycle_duration,
+            saturation_pct=args.saturation,
+            brightness_pct=args.brightness,
+        )
+        frames = (
+            (r, g, b) for _hue, r, g, b in iter_frames(config, fps=args.fps, frame_count=frame_count, seed=args.seed)
+        )
+    width, height = args.size
+    written = export(frames, args.format, args.output, width=width, height=height, fps=args.fps, workers=args.workers)
+    print(f"Exported {written} frames to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
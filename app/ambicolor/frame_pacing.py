@@ -0,0 +1,304 @@
+"""Engine ticks aligned to the display refresh.
+
+The engine's own timer fires every 33 ms, which beats against 60, 75 or
+144 Hz displays: some frames get two ticks, others none, and ticks landing
+between two presented frames never reach the screen. FramePacer drives the
+engine from the window's update requests instead (QWindow.requestUpdate),
+which platforms with frame callbacks deliver once per presented frame, so
+the color is computed once per frame. Where update requests are not paced
+by the display (they arrive much faster than the screen refreshes, or not
+at all) it falls back to the engine timer set to the refresh interval.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from PySide6.QtCore import QEvent, QObject, QTimer, Signal
+from PySide6.QtGui import QScreen, QWindow
+from PySide6.QtWidgets import QWidget
+
+from .engine import ColorCycleEngine
+
+PACING_MODES = ("auto", "display", "timer")
+DEFAULT_REFRESH_HZ = 60.0
+# Frame callbacks measured before "auto" trusts them to follow the display.
+PROBE_FRAMES = 30
+# Callbacks arriving faster than this fraction of the refresh interval are
+# not paced by the display (Qt's generic fallback fires every 5 ms).
+UNPACED_RATIO = 0.75
+# Refresh intervals without a requested callback before falling back.
+WATCHDOG_FRAMES = 8
+WATCHDOG_MIN_MS = 100
+# An interval this many refresh intervals long means a frame was missed.
+MISSED_RATIO = 1.5
+# Intervals kept for the spread statistics.
+INTERVAL_HISTORY = 1024
+
+# Engine events after which the next interval does not follow a frame.
+_RUN_BREAKS = frozenset({"start", "pause", "resume", "stop", "render_suspended", "restore"})
+
+
+@dataclass(slots=True, frozen=True)
+class FramePacingStats:
+    mode: str
+    refresh_hz: float
+    frames: int
+    missed_frames: int
+    presented_fps: float
+    mean_interval_ms: float
+    stdev_interval_ms: float
+    p5_interval_ms: float
+    p95_interval_ms: float
+    max_interval_ms: float
+
+
+class FrameIntervals:
+    """Intervals between consecutive frames of a run.
+
+    Pauses and suspensions end a run, so the gap across them is neither an
+    interval nor a missed frame.
+    """
+
+    def __init__(self, *, capacity: int = INTERVAL_HISTORY) -> None:
+        self._intervals: deque[float] = deque(maxlen=capacity)
+        self._last_s: float | None = None
+        self.frames = 0
+        self.missed = 0
+
+    def frame(self, now_s: float, refresh_interval_s: float) -> None:
+        self.frames += 1
+        if self._last_s is not None:
+            interval = now_s - self._last_s
+            self._intervals.append(interval)
+            if interval > MISSED_RATIO * refresh_interval_s:
+                self.missed += max(1, round(interval / refresh_interval_s) - 1)
+        self._last_s = now_s
+
+    def end_run(self) -> None:
+        self._last_s = None
+
+    def intervals_ms(self) -> list[float]:
+        return [1000.0 * interval for interval in self._intervals]
+
+    def stats(self, mode: str, refresh_hz: float) -> FramePacingStats:
+        ordered = sorted(self.intervals_ms())
+        if not ordered:
+            return FramePacingStats(mode, refresh_hz, self.frames, self.missed, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        mean = sum(ordered) / len(ordered)
+        variance = sum((value - mean) ** 2 for value in ordered) / len(ordered)
+        last = len(ordered) - 1
+        return FramePacingStats(
+            mode=mode,
+            refresh_hz=refresh_hz,
+            frames=self.frames,
+            missed_frames=self.missed,
+            presented_fps=1000.0 / mean if mean else 0.0,
+            mean_interval_ms=mean,
+            stdev_interval_ms=math.sqrt(variance),
+            p5_interval_ms=ordered[int(0.05 * last)],
+            p95_interval_ms=ordered[int(0.95 * last)],
+            max_interval_ms=ordered[-1],
+        )
+
+    def clear(self) -> None:
+        self._intervals.clear()
+        self._last_s = None
+        self.frames = 0
+        self.missed = 0
+
+
+class FramePacer(QObject):
+    """Ticks an engine once per frame presented by ``widget``'s window.
+
+    ``mode`` is "display" (always use update requests), "timer" (the engine
+    timer at the screen's refresh interval) or "auto": update requests while
+    they follow the display, else the timer. A missing callback (window not
+    exposed) switches "auto" to the timer until the window is exposed again.
+    """
+
+    mode_changed = Signal(str)
+
+    def __init__(
+        self,
+        engine: ColorCycleEngine,
+        widget: QWidget,
+        *,
+        mode: str = "auto",
+        clock: Callable[[], float] | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        if mode not in PACING_MODES:
+            raise ValueError(f"Unknown frame pacing mode {mode!r}; expected one of {', '.join(PACING_MODES)}")
+        self._engine = engine
+        self._widget = widget
+        self._requested_mode = mode
+        self._mode = "timer" if mode == "timer" else "display"
+        self._clock = clock or time.monotonic
+        self._window: QWindow | None = None
+        self._refresh_hz = DEFAULT_REFRESH_HZ
+        self._update_requested = False
+        # Set when "auto" fell back because callbacks stopped; display
+        # pacing is retried on the next expose.
+        self._waiting_for_expose = False
+        self._probe: list[float] = []
+        self._probing = mode == "auto"
+        self._intervals = FrameIntervals()
+        self.fallback_reason = ""
+
+        self._watchdog = QTimer(self)
+        self._watchdog.setSingleShot(True)
+        self._watchdog.timeout.connect(self._on_watchdog)
+
+        engine.add_event_hook(self._on_event)
+        widget.installEventFilter(self)
+        self._attach_window()
+        self._apply_mode()
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @property
+    def refresh_hz(self) -> float:
+        return self._refresh_hz
+
+    @property
+    def frame_intervals(self) -> FrameIntervals:
+        return self._intervals
+
+    def stats(self) -> FramePacingStats:
+        return self._intervals.stats(self._mode, self.refresh_hz)
+
+    def report(self) -> str:
+        row = self.stats()
+        lines = [
+            f"Frame pacing: {row.mode} at {row.refresh_hz:.2f} Hz"
+            + (f" ({self.fallback_reason})" if self.fallback_reason else ""),
+            f"  frames {row.frames}, presented {row.presented_fps:.2f} fps, missed {row.missed_frames}",
+            f"  interval ms: mean {row.mean_interval_ms:.2f}, stdev {row.stdev_interval_ms:.2f}, "
+            f"p5 {row.p5_interval_ms:.2f}, p95 {row.p95_interval_ms:.2f}, max {row.max_interval_ms:.2f}",
+        ]
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        self._watchdog.stop()
+        self._engine.remove_event_hook(self._on_event)
+        self._engine.set_external_pacing(False)
+        self._widget.removeEventFilter(self)
+        if self._window is not None:
+            self._window.removeEventFilter(self)
+            self._window.screenChanged.disconnect(self._on_screen_changed)
+            self._window = None
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:  # type: ignore[override]
+        kind = event.type()
+        if watched is self._window:
+            if kind == QEvent.Type.UpdateRequest and self._mode == "display":
+                # Ticking before the window handles the event puts the new
+                # color into the frame being prepared.
+                self._on_frame()
+            elif kind == QEvent.Type.Expose and self._window.isExposed():
+                if self._waiting_for_expose:
+                    self._waiting_for_expose = False
+                    self._switch("display", "")
+                self._request_frame()
+        elif watched is self._widget and kind == QEvent.Type.Show:
+            self._attach_window()
+            self._request_frame()
+        return super().eventFilter(watched, event)
+
+    def _attach_window(self) -> None:
+        window = self._widget.windowHandle()
+        if window is None or window is self._window:
+            return
+        # The native window exists once the widget was shown.
+        self._window = window
+        window.installEventFilter(self)
+        window.screenChanged.connect(self._on_screen_changed)
+        self._on_screen_changed(window.screen())
+
+    def _apply_mode(self) -> None:
+        self._update_refresh_rate(self._widget.screen() if self._window is None else self._window.screen())
+        if self._mode == "display":
+            self._engine.set_external_pacing(True)
+            self._request_frame()
+        else:
+            self._watchdog.stop()
+            self._update_requested = False
+            self._engine.set_external_pacing(False)
+
+    def _switch(self, mode: str, reason: str) -> None:
+        self.fallback_reason = reason
+        if mode == self._mode:
+            return
+        self._mode = mode
+        # Statistics describe the mode in effect.
+        self._intervals.clear()
+        self._apply_mode()
+        self.mode_changed.emit(mode)
+
+    def _request_frame(self) -> None:
+        if self._mode != "display" or self._update_requested or self._window is None:
+            return
+        if not self._engine.wants_frames:
+            return
+        self._update_requested = True
+        self._window.requestUpdate()
+        self._watchdog.start(max(WATCHDOG_MIN_MS, round(WATCHDOG_FRAMES * 1000.0 / self._refresh_hz)))
+
+    def _on_frame(self) -> None:
+        self._update_requested = False
+        self._watchdog.stop()
+        if not self._engine.wants_frames:
+            return
+        if self._probing and self._probe_frame(self._clock()):
+            return
+        self._engine.advance_frame()
+        self._request_frame()
+
+    def _probe_frame(self, now_s: float) -> bool:
+        # Returns True when the probe decided to leave display pacing.
+        self._probe.append(now_s)
+        if len(self._probe) <= PROBE_FRAMES:
+            return False
+        self._probing = False
+        intervals = sorted(later - earlier for earlier, later in zip(self._probe, self._probe[1:]))
+        self._probe.clear()
+        median = intervals[len(intervals) // 2]
+        if median < UNPACED_RATIO / self._refresh_hz:
+            self._switch("timer", "update requests are not paced by the display")
+            return True
+        return False
+
+    def _on_watchdog(self) -> None:
+        self._update_requested = False
+        if self._requested_mode == "auto":
+            self._waiting_for_expose = True
+            self._switch("timer", "no frame callbacks while the window is not exposed")
+        else:
+            self._request_frame()
+
+    def _on_screen_changed(self, screen: QScreen | None) -> None:
+        self._update_refresh_rate(screen)
+        self._intervals.end_run()
+
+    def _update_refresh_rate(self, screen: QScreen | None) -> None:
+        rate = screen.refreshRate() if screen is not None else 0.0
+        self._refresh_hz = rate if rate > 0 else DEFAULT_REFRESH_HZ
+        # Also the fallback timer's interval and the engine's overrun budget.
+        self._engine.set_tick_interval_s(1.0 / self._refresh_hz)
+
+    def _on_event(self, kind: str, *args: object) -> None:
+        if kind == "tick":
+            self._intervals.frame(float(args[0]), 1.0 / self._refresh_hz)
+            return
+        if kind in _RUN_BREAKS:
+            self._intervals.end_run()
+            self._request_frame()
+
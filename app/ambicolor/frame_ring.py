@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import struct
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PySide6.QtGui import QColor
+
+    from .engine import ColorCycleEngine
+
+# Fixed layout shared with out-of-process readers. Keep this module free of
+# Qt imports so driver processes can read frames without PySide6.
+#
+# Header (64 bytes): magic, layout version, capacity, slot size, last
+# published frame sequence.
+# Slot (64 bytes): seqlock word, frame sequence, timestamp, hue, cycle
+# duration, RGB, state, saturation, brightness.
+#
+# The seqlock word is odd while the writer updates a slot and becomes
+# 2 * (frame_seq + 1) once the slot is consistent.
+RING_MAGIC = b"AMBIRING"
+RING_LAYOUT_VERSION = 1
+
+_HEADER = struct.Struct("<8sIII4xQ32x")
+_HEADER_SIZE = _HEADER.size
+_HEADER_SEQ = struct.Struct("<Q")
+_HEADER_SEQ_OFFSET = 24
+_SLOT_LOCK = struct.Struct("<Q")
+_SLOT_PAYLOAD = struct.Struct("<Qddd6B")
+# Lock word and payload in one call; fields are written in order, so the
+# odd lock word lands before the payload.
+_SLOT_WRITE = struct.Struct("<Q" + _SLOT_PAYLOAD.format[1:])
+_SLOT_SIZE = 64
+
+STATE_CODES = {"standstill": 0, "running": 1, "paused": 2}
+_STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+
+
+@dataclass(slots=True, frozen=True)
+class RingFrame:
+    frame_seq: int
+    timestamp_s: float
+    hue_deg: float
+    cycle_duration_s: float
+    red: int
+    green: int
+    blue: int
+    state: str
+    saturation_pct: int
+    brightness_pct: int
+
+
+def _open_existing(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        # Readers must not unlink the publisher's segment when they exit.
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedFrameRingPublisher:
+    """Writes every engine frame into a fixed-layout shared-memory ring.
+
+    A publish is three ``pack_into`` calls (odd lock word with the payload,
+    even lock word, header sequence) and costs about 1 µs on CPython 3.11,
+    most of it call overhead.
+    """
+
+    def __init__(
+        self,
+        name: str | None = None,
+        *,
+        capacity: int = 1024,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self._capacity = capacity
+        self._clock = clock or time.time
+        self._shm = shared_memory.SharedMemory(
+            name=name, create=True, size=_HEADER.size + capacity * _SLOT_SIZE
+        )
+        self._buf = self._shm.buf
+        _HEADER.pack_into(self._buf, 0, RING_MAGIC, RING_LAYOUT_VERSION, capacity, _SLOT_SIZE, 0)
+        self._next_seq = 1
+        self._engine: ColorCycleEngine | None = None
+        # Bound once: publish() runs on every engine tick.
+        self._slot_offsets = tuple(_HEADER_SIZE + index * _SLOT_SIZE for index in range(capacity))
+        self._pack_slot = _SLOT_WRITE.pack_into
+        self._pack_word = _SLOT_LOCK.pack_into
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def frames_published(self) -> int:
+        return self._next_seq - 1
+
+    def attach(self, engine: ColorCycleEngine) -> None:
+        self.detach()
+        self._engine = engine
+        engine.color_changed.connect(self._on_color_changed)
+        # Keep frames coming while the window is minimized or covered.
+        engine.hold_awake()
+
+    def detach(self) -> None:
+        if self._engine is None:
+            return
+        self._engine.color_changed.disconnect(self._on_color_changed)
+        self._engine.release_awake()
+        self._engine = None
+
+    def publish(
+        self,
+        red: int,
+        green: int,
+        blue: int,
+        *,
+        hue_deg: float,
+        saturation_pct: int,
+        brightness_pct: int,
+        cycle_duration_s: float,
+        state_code: int,
+        timestamp_s: float | None = None,
+    ) -> int:
+        seq = self._next_seq
+        self._next_seq = seq + 1
+        buf = self._buf
+        offset = self._slot_offsets[seq % self._capacity]
+        self._pack_slot(
+            buf,
+            offset,
+            2 * seq + 1,
+            seq,
+            self._clock() if timestamp_s is None else timestamp_s,
+            hue_deg,
+            cycle_duration_s,
+            red,
+            green,
+            blue,
+            state_code,
+            saturation_pct,
+            brightness_pct,
+        )
+        self._pack_word(buf, offset, 2 * seq + 2)
+        self._pack_word(buf, _HEADER_SEQ_OFFSET, seq)
+        return seq
+
+    def close(self) -> None:
+        self.detach()
+        self._buf = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def _on_color_changed(self, color: QColor, _hex: str, _display_name: str) -> None:
+        assert self._engine is not None
+        hue, saturation, brightness, cycle_duration, state = self._engine.frame_params()
+        self.publish(
+            color.red(),
+            color.green(),
+            color.blue(),
+            hue_deg=hue,
+            saturation_pct=saturation,
+            brightness_pct=brightness,
+            cycle_duration_s=cycle_duration,
+            state_code=STATE_CODES[state.value],
+        )
+
+
+class SharedFrameRingReader:
+    """Reads frames from a ring created by SharedFrameRingPublisher.
+
+    Slots are decoded straight from the shared buffer. Frames that were
+    overwritten before the reader caught up are counted in ``dropped``.
+    """
+
+    def __init__(self, name: str, *, max_retries: int = 16) -> None:
+        self._shm = _open_existing(name)
+        self._buf = self._shm.buf
+        magic, version, capacity, slot_size, _seq = _HEADER.unpack_from(self._buf, 0)
+        if magic != RING_MAGIC or version != RING_LAYOUT_VERSION or slot_size != _SLOT_SIZE:
+            self._shm.close()
+            raise ValueError(f"shared memory '{name}' is not an AmbiColor frame ring (v{RING_LAYOUT_VERSION})")
+        self._capacity = capacity
+        self._max_retries = max_retries
+        self._last_seq = self.latest_seq()
+        self.dropped = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def latest_seq(self) -> int:
+        return _HEADER_SEQ.unpack_from(self._buf, _HEADER_SEQ_OFFSET)[0]
+
+    def slot_view(self, frame_seq: int) -> memoryview:
+        """Zero-copy view of the raw slot that holds ``frame_seq``."""
+        offset = _HEADER.size + (frame_seq % self._capacity) * _SLOT_SIZE
+        return self._buf[offset : offset + _SLOT_SIZE]
+
+    def read_frame(self, frame_seq: int) -> RingFrame | None:
+        """Consistent copy of one frame, or None if it was overwritten."""
+        buf = self._buf
+        offset = _HEADER.size + (frame_seq % self._capacity) * _SLOT_SIZE
+        expected_lock = 2 * frame_seq + 2
+        for _ in range(self._max_retries):
+            before = _SLOT_LOCK.unpack_from(buf, offset)[0]
+            if before & 1:
+                continue
+            values = _SLOT_PAYLOAD.unpack_from(buf, offset + 8)
+            after = _SLOT_LOCK.unpack_from(buf, offset)[0]
+            if before != after:
+                continue
+            if before != expected_lock:
+                return None
+            seq, timestamp, hue, cycle, red, green, blue, state, saturation, brightness = values
+            return RingFrame(
+                frame_seq=seq,
+                timestamp_s=timestamp,
+                hue_deg=hue,
+                cycle_duration_s=cycle,
+                red=red,
+                green=green,
+                blue=blue,
+                state=_STATE_NAMES.get(state, "standstill"),
+                saturation_pct=saturation,
+                brightness_pct=brightness,
+            )
+        return None
+
+    def read_new(self) -> list[RingFrame]:
+        """All frames published since the previous call, oldest first."""
+        latest = self.latest_seq()
+        first = self._last_seq + 1
+        if latest - first + 1 > self._capacity:
+            self.dropped += latest - self._capacity - first + 1
+            first = latest - self._capacity + 1
+        frames: list[RingFrame] = []
+        for seq in range(first, latest + 1):
+            frame = self.read_frame(seq)
+            if frame is None:
+                self.dropped += 1
+            else:
+                frames.append(frame)
+        self._last_seq = latest
+        return frames
+
+    def close(self) -> None:
+        self._buf = None
+        self._shm.close()
@@ -0,0 +1,327 @@
+"""Color generator plugins.
+
+A generator maps a time in seconds and the preset parameters to an RGB
+color. Plugins are installed packages that declare an entry point in the
+``ambicolor.generators`` group; see docs/GENERATOR_PLUGINS.md.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from importlib.metadata import EntryPoint, entry_points
+from typing import TYPE_CHECKING, Protocol
+
+from .models import PresetConfig
+
+if TYPE_CHECKING:
+    from .preset_registry import PresetRegistry
+
+GENERATOR_GROUP = "ambicolor.generators"
+PLUGIN_PRESET_PREFIX = "plugin:"
+# Share of the tick interval a generator may use per tick.
+DEFAULT_BUDGET_FRACTION = 0.25
+# Consecutive over-budget ticks before the host throttles the generator or
+# moves it to the worker.
+OVERRUN_LIMIT = 5
+# Slowest throttled update rate: one computed color per this many ticks.
+MAX_THROTTLE_EVERY = 30
+WORKER_BATCH_FRAMES = 64
+
+RGB = tuple[int, int, int]
+
+# Names of plugins imported so far (by selecting their preset).
+_loaded_generators: set[str] = set()
+
+
+class GeneratorError(ValueError):
+    pass
+
+
+@dataclass(slots=True, frozen=True)
+class GeneratorParams:
+    cycle_duration_s: float
+    saturation_pct: int
+    brightness_pct: int
+    hue_min_deg: float
+    hue_max_deg: float
+
+    @classmethod
+    def from_config(cls, config: PresetConfig) -> GeneratorParams:
+        return cls(
+            cycle_duration_s=config.cycle_duration_s,
+            saturation_pct=config.saturation_pct,
+            brightness_pct=config.brightness_pct,
+            hue_min_deg=config.hue_min_deg,
+            hue_max_deg=config.hue_max_deg,
+        )
+
+
+class ColorGenerator(Protocol):
+    def color_at(self, t_s: float, params: GeneratorParams) -> RGB: ...
+
+
+# Optional batch method of a generator; the default loops over color_at().
+#   def frames(self, start_s: float, step_s: float, count: int, params: GeneratorParams) -> bytes
+# returns ``count`` packed RGB triples for start_s, start_s + step_s, ...
+
+
+def render_frames(generator: ColorGenerator, start_s: float, step_s: float, count: int, params: GeneratorParams) -> bytes:
+    frames = getattr(generator, "frames", None)
+    if frames is not None:
+        data = bytes(frames(start_s, step_s, count, params))
+        if len(data) != 3 * count:
+            raise GeneratorError(f"generator returned {len(data)} bytes for {count} frames")
+        return data
+    data = bytearray(3 * count)
+    for index in range(count):
+        offset = 3 * index
+        data[offset : offset + 3] = bytes(_clamp_rgb(generator.color_at(start_s + index * step_s, params)))
+    return bytes(data)
+
+
+def _clamp_rgb(color: tuple[float, float, float]) -> RGB:
+    # Out-of-range channels saturate instead of wrapping (256 is not black).
+    # NaN and infinite values raise ValueError and OverflowError.
+    red, green, blue = color
+    return max(0, min(255, int(red))), max(0, min(255, int(green))), max(0, min(255, int(blue)))
+
+
+def available_generators() -> dict[str, EntryPoint]:
+    # Reads package metadata only; no plugin module is imported here.
+    return {entry.name: entry for entry in entry_points(group=GENERATOR_GROUP)}
+
+
+def load_generator(name: str, *, available: dict[str, EntryPoint] | None = None) -> ColorGenerator:
+    entry = (available if available is not None else available_generators()).get(name)
+    if entry is None:
+        raise GeneratorError(f"no generator plugin named {name!r}")
+    try:
+        loaded = entry.load()
+        # The entry point may name a class or factory, or an object (or
+        # module) that already has color_at().
+        generator = loaded() if isinstance(loaded, type) or not hasattr(loaded, "color_at") else loaded
+    except Exception as exc:  # noqa: BLE001 - any plugin failure is reported the same way
+        raise GeneratorError(f"cannot load generator plugin {name!r}: {exc}") from exc
+    if not callable(getattr(generator, "color_at", None)):
+        raise GeneratorError(f"generator plugin {name!r} has no color_at()")
+    _loaded_generators.add(name)
+    return generator
+
+
+def generator_loaded(name: str) -> bool:
+    return name in _loaded_generators
+
+
+def plugin_presets(available: dict[str, EntryPoint] | None = None) -> list[PresetConfig]:
+    """One preset per installed generator, with neutral default parameters."""
+    presets = []
+    for name, entry in sorted((available if available is not None else available_generators()).items()):
+        package = entry.dist.name if entry.dist is not None else entry.module
+        presets.append(
+            PresetConfig(
+                preset_id=f"{PLUGIN_PRESET_PREFIX}{name}",
+                label_key=name.replace("_", " ").title(),
+                description_key=f"Generator plugin '{name}' from {package}.",
+                cycle_duration_s=120.0,
+                saturation_pct=80,
+                brightness_pct=60,
+                random_start_hue=False,
+                hue_min_deg=0.0,
+                hue_max_deg=360.0,
+                implemented=True,
+                generator=name,
+            )
+        )
+    return presets
+
+
+def register_plugin_presets(registry: PresetRegistry) -> list[str]:
+    added = []
+    for preset in plugin_presets():
+        # A preset file may already define this id (e.g. with tuned
+        # parameters); it takes precedence.
+        if preset.preset_id not in registry:
+            registry.register(preset)
+            added.append(preset.preset_id)
+    return added
+
+
+@dataclass(slots=True, frozen=True)
+class GeneratorStats:
+    # "inline", "throttled" or "worker".
+    mode: str
+    ticks: int
+    computed: int
+    overruns: int
+    mean_cost_ms: float
+    max_cost_ms: float
+    throttle_every: int
+    budget_ms: float
+
+
+class GeneratorHost:
+    """Runs a generator for the engine and keeps it within its tick budget.
+
+    Every call is timed. After OVERRUN_LIMIT consecutive ticks over budget
+    a generator with a frames() batch method moves to a worker thread,
+    which renders batches ahead of time while ticks only look frames up;
+    a generator without one is throttled to every n-th tick, with n
+    chosen from its measured cost, and the last color is held in between.
+    """
+
+    def __init__(
+        self,
+        generator: ColorGenerator,
+        params: GeneratorParams,
+        *,
+        frame_interval_s: float,
+        budget_fraction: float = DEFAULT_BUDGET_FRACTION,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        self._generator = generator
+        self._params = params
+        self._budget_fraction = budget_fraction
+        self._step_s = frame_interval_s
+        self._budget_s = frame_interval_s * budget_fraction
+        self._clock = clock or time.perf_counter
+        self._mode = "inline"
+        self._throttle_every = 1
+        self._last_rgb: RGB = (0, 0, 0)
+
+        self._ticks = 0
+        self._computed = 0
+        self._overruns = 0
+        self._streak = 0
+        self._total_cost_s = 0.0
+        self._max_cost_s = 0.0
+
+        self._executor: ThreadPoolExecutor | None = None
+        # (start_s, packed RGB) batches in time order. Batches rendered for
+        # an older parameter generation are dropped when they arrive.
+        self._batches: list[tuple[float, bytes]] = []
+        self._pending: Future | None = None
+        self._generation = 0
+
+    @property
+    def generator(self) -> ColorGenerator:
+        return self._generator
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def stats(self) -> GeneratorStats:
+        return GeneratorStats(
+            mode=self._mode,
+            ticks=self._ticks,
+            computed=self._computed,
+            overruns=self._overruns,
+            mean_cost_ms=1000.0 * self._total_cost_s / self._computed if self._computed else 0.0,
+            max_cost_ms=1000.0 * self._max_cost_s,
+            throttle_every=self._throttle_every,
+            budget_ms=1000.0 * self._budget_s,
+        )
+
+    def set_params(self, params: GeneratorParams) -> None:
+        if params == self._params:
+            return
+        self._params = params
+        self._generation += 1
+        self._batches.clear()
+
+    def set_frame_interval_s(self, seconds: float) -> None:
+        """Follow a change of the engine's tick interval (e.g. another
+        display refresh rate): the budget scales with it, and batches
+        rendered at the old frame step are dropped."""
+        if seconds == self._step_s:
+            return
+        self._step_s = seconds
+        self._budget_s = seconds * self._budget_fraction
+        self._generation += 1
+        self._batches.clear()
+
+    def color_at(self, t_s: float) -> RGB:
+        self._ticks += 1
+        if self._mode == "worker":
+            return self._worker_color(t_s)
+        if self._mode == "throttled" and self._ticks % self._throttle_every:
+            return self._last_rgb
+        started = self._clock()
+        try:
+            rgb = _clamp_rgb(self._generator.color_at(t_s, self._params))
+        except Exception as exc:  # noqa: BLE001 - plugin code; the engine drops the generator
+            raise GeneratorError(f"generator failed at t={t_s:.3f} s: {exc!r}") from exc
+        cost = self._clock() - started
+        self._last_rgb = rgb
+        self._record_cost(cost)
+        return self._last_rgb
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending = None
+        self._batches.clear()
+
+    def _record_cost(self, cost: float) -> None:
+        self._computed += 1
+        self._total_cost_s += cost
+        self._max_cost_s = max(self._max_cost_s, cost)
+        if cost <= self._budget_s:
+            self._streak = 0
+            return
+        self._overruns += 1
+        self._streak += 1
+        if self._streak < OVERRUN_LIMIT:
+            return
+        self._streak = 0
+        if callable(getattr(self._generator, "frames", None)):
+            self._mode = "worker"
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ambicolor-generator")
+            return
+        self._mode = "throttled"
+        self._throttle_every = min(MAX_THROTTLE_EVERY, max(self._throttle_every + 1, math.ceil(cost / self._budget_s)))
+
+    def _worker_color(self, t_s: float) -> RGB:
+        self._collect()
+        for start_s, data in self._batches:
+            index = round((t_s - start_s) / self._step_s)
+            if 0 <= index < len(data) // 3:
+                offset = 3 * index
+                self._last_rgb = (data[offset], data[offset + 1], data[offset + 2])
+                if index >= WORKER_BATCH_FRAMES // 2 and start_s == self._batches[-1][0]:
+                    self._request(start_s + WORKER_BATCH_FRAMES * self._step_s)
+                return self._last_rgb
+        # Nothing rendered for this time yet (first batch, a seek or new
+        # parameters): hold the last color until the worker catches up.
+        self._request(t_s)
+        return self._last_rgb
+
+    def _request(self, start_s: float) -> None:
+        if self._pending is not None or self._executor is None:
+            return
+        self._pending = self._executor.submit(self._render_batch, start_s, self._params, self._generation)
+
+    def _render_batch(self, start_s: float, params: GeneratorParams, generation: int) -> tuple[int, float, bytes]:
+        return generation, start_s, render_frames(self._generator, start_s, self._step_s, WORKER_BATCH_FRAMES, params)
+
+    def _collect(self) -> None:
+        pending = self._pending
+        if pending is None or not pending.done():
+            return
+        self._pending = None
+        try:
+            generation, start_s, data = pending.result()
+        except Exception:  # noqa: BLE001 - a failing batch falls back to slow inline updates
+            self.close()
+            self._mode = "throttled"
+            self._throttle_every = MAX_THROTTLE_EVERY
+            return
+        if generation != self._generation:
+            return
+        # Keep the batch being played and the one after it.
+        self._batches = [batch for batch in self._batches if batch[0] < start_s][-1:] + [(start_s, data)]
@@ -0,0 +1,199 @@
+"""Golden-frame regression corpus.
+
+Every case renders a seeded timeline with a manual clock and stores it as
+one zlib-compressed file. Regenerate after an intended behavior change from
+the ``app`` directory::
+
+    python -m ambicolor.golden_frames ../tests/golden
+"""
+
+from __future__ import annotations
+
+import argparse
+import struct
+import sys
+import zlib
+from array import array
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .models import PresetConfig, PresetId, preset_by_id
+from .parallel import RenderJob, parallel_executor, render_many
+from .timeline import Timeline, render_timeline, with_overrides
+
+GOLDEN_MAGIC = b"AMBIGLD1"
+GOLDEN_SUFFIX = ".bin"
+GOLDEN_FPS = 30.0
+GOLDEN_FRAMES = 2400
+GOLDEN_SEED = 1
+
+# magic, fps, frame count, uncompressed payload size
+_HEADER = struct.Struct("<8sdII")
+
+
+@dataclass(slots=True, frozen=True)
+class GoldenCase:
+    name: str
+    preset_id: PresetId
+    cycle_duration_s: float | None = None
+    saturation_pct: int | None = None
+    brightness_pct: int | None = None
+
+    def config(self) -> PresetConfig:
+        return with_overrides(
+            preset_by_id(self.preset_id),
+            cycle_duration_s=self.cycle_duration_s,
+            saturation_pct=self.saturation_pct,
+            brightness_pct=self.brightness_pct,
+        )
+
+    def render(self) -> Timeline:
+        return render_timeline(self.config(), fps=GOLDEN_FPS, frame_count=GOLDEN_FRAMES, seed=GOLDEN_SEED)
+
+
+def _cases() -> tuple[GoldenCase, ...]:
+    cases = []
+    for preset_id in PresetId:
+        cases.append(GoldenCase(preset_id.value, preset_id))
+        # Short cycle so bounded presets bounce several times within the
+        # recorded frames, plus low values that exercise 8-bit rounding.
+        cases.append(GoldenCase(f"{preset_id.value}_fast_dim", preset_id, 20.0, 45, 20))
+    return tuple(cases)
+
+
+GOLDEN_CASES = _cases()
+
+
+@dataclass(slots=True, frozen=True)
+class TimelineDiff:
+    frames_compared: int
+    # None when every compared frame matches and the lengths agree.
+    first_divergent_frame: int | None
+    max_channel_error: int
+    max_hue_error_deg: float
+
+    @property
+    def matches(self) -> bool:
+        return self.first_divergent_frame is None
+
+    def describe(self) -> str:
+        if self.matches:
+            return f"{self.frames_compared} frames identical"
+        return (
+            f"first divergent frame {self.first_divergent_frame} of {self.frames_compared}, "
+            f"max channel error {self.max_channel_error}, max hue error {self.max_hue_error_deg:.6f} deg"
+        )
+
+
+def encode_timeline(timeline: Timeline) -> bytes:
+    hues = array("d", timeline.hues)
+    if sys.byteorder != "little":
+        hues.byteswap()
+    payload = hues.tobytes() + timeline.rgb
+    return _HEADER.pack(GOLDEN_MAGIC, timeline.fps, len(timeline), len(payload)) + zlib.compress(payload, 9)
+
+
+def decode_timeline(data: bytes) -> Timeline:
+    if len(data) < _HEADER.size:
+        raise ValueError("golden file is truncated")
+    magic, fps, frames, size = _HEADER.unpack_from(data)
+    if magic != GOLDEN_MAGIC:
+        raise ValueError("not a golden timeline file")
+    payload = zlib.decompress(data[_HEADER.size :])
+    if len(payload) != size or size != frames * 11:
+        raise ValueError("golden payload size does not match its header")
+    hues = array("d")
+    hues.frombytes(payload[: frames * 8])
+    if sys.byteorder != "little":
+        hues.byteswap()
+    return Timeline(fps=fps, hues=hues, rgb=payload[frames * 8 :])
+
+
+def write_golden(path: Path, timeline: Timeline) -> None:
+    Path(path).write_bytes(encode_timeline(timeline))
+
+
+def read_golden(path: Path) -> Timeline:
+    return decode_timeline(Path(path).read_bytes())
+
+
+def _first_difference(a: bytes, b: bytes) -> int | None:
+    # Bisect on prefix equality: each probe is one C-level memcmp, so a
+    # mismatch is located in O(log n) comparisons instead of a Python loop.
+    if a == b:
+        return None
+    low, high = 0, min(len(a), len(b))
+    if a[:high] == b[:high]:
+        return high
+    while high - low > 1:
+        middle = (low + high) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def compare_timelines(expected: Timeline, actual: Timeline) -> TimelineDiff:
+    frames = min(len(expected), len(actual))
+    rgb_offset = _first_difference(expected.rgb, actual.rgb)
+    hue_offset = _first_difference(expected.hues.tobytes(), actual.hues.tobytes())
+    if rgb_offset is None and hue_offset is None:
+        return TimelineDiff(frames, None, 0, 0.0)
+
+    candidates = []
+    if rgb_offset is not None:
+        candidates.append(rgb_offset // 3)
+    if hue_offset is not None:
+        candidates.append(hue_offset // expected.hues.itemsize)
+    first = min(candidates)
+
+    # Only the tail after the first mismatch needs a per-element pass.
+    max_channel = 0
+    if rgb_offset is not None:
+        start = first * 3
+        max_channel = max(
+            (abs(x - y) for x, y in zip(expected.rgb[start : frames * 3], actual.rgb[start : frames * 3])),
+            default=0,
+        )
+    max_hue = 0.0
+    if hue_offset is not None:
+        max_hue = max(
+            (abs((x - y + 180.0) % 360.0 - 180.0) for x, y in zip(expected.hues[first:frames], actual.hues[first:frames])),
+            default=0.0,
+        )
+    return TimelineDiff(frames, first, max_channel, max_hue)
+
+
+def golden_path(directory: Path, case: GoldenCase) -> Path:
+    return Path(directory) / f"{case.name}{GOLDEN_SUFFIX}"
+
+
+def update_corpus(directory: Path, *, executor: Executor | None = None) -> list[Path]:
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    jobs = [
+        RenderJob(case.config(), fps=GOLDEN_FPS, frame_count=GOLDEN_FRAMES, seed=GOLDEN_SEED) for case in GOLDEN_CASES
+    ]
+    written = []
+    for case, timeline in zip(GOLDEN_CASES, render_many(jobs, executor=executor)):
+        path = golden_path(directory, case)
+        write_golden(path, timeline)
+        written.append(path)
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ambicolor.golden_frames", description="Regenerate golden timelines.")
+    parser.add_argument("directory", type=Path)
+    args = parser.parse_args(argv)
+    with parallel_executor() as executor:
+        written = update_corpus(args.directory, executor=executor)
+    for path in written:
+        print(f"{path} ({path.stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+"""Qt-free hue cycle for headless rendering.
+
+Produces the same frames as a ColorCycleEngine driven by a manual clock,
+bit for bit, without importing PySide6. PySide6 does not support
+free-threaded builds, and importing it there turns the GIL back on, so
+batch renders (ambicolor.parallel) go through this kernel instead of the
+engine.
+"""
+
+from __future__ import annotations
+
+import random
+import struct
+from collections.abc import Iterator
+
+from .models import PresetConfig, PresetId, preset_by_id
+
+_FLOAT32 = struct.Struct("f")
+_USHRT_MAX = 65535
+
+
+def _f32(value: float) -> float:
+    # Rounds to single precision. One double operation on single-precision
+    # operands rounded this way equals the same operation done in float.
+    return _FLOAT32.unpack(_FLOAT32.pack(value))[0]
+
+
+def _round_f32(value: float) -> int:
+    # qRound(float)
+    return int(_f32(value + 0.5)) if value >= 0.0 else int(_f32(value - 0.5))
+
+
+def _to_8bit(value16: int) -> int:
+    return (2 * value16 + 257) // 514
+
+
+def hsv_to_rgb8(hue_deg: float, saturation_pct: int, brightness_pct: int) -> tuple[int, int, int]:
+    """8-bit RGB of ``color_math.hsv_to_qcolor(hue_deg, saturation_pct,
+    brightness_pct)``, following QColor's single-precision arithmetic."""
+    return _hsv16_to_rgb8(_hue16(hue_deg), _pct16(saturation_pct), _pct16(brightness_pct))
+
+
+def _hue16(hue_deg: float) -> int:
+    return _round_f32(_f32(_f32((hue_deg % 360.0) / 360.0) * 36000.0))
+
+
+def _pct16(percent: int) -> int:
+    return _round_f32(_f32(_f32(max(0.0, min(100.0, float(percent))) / 100.0) * _USHRT_MAX))
+
+
+def _hsv16_to_rgb8(hue16: int, sat16: int, val16: int) -> tuple[int, int, int]:
+    if sat16 == 0:
+        gray = _to_8bit(val16)
+        return gray, gray, gray
+    h = 0.0 if hue16 == 36000 else _f32(hue16 / 6000.0)
+    s = _f32(sat16 / _USHRT_MAX)
+    v = _f32(val16 / _USHRT_MAX)
+    sector = int(h)
+    f = _f32(h - sector)
+    p = _f32(v * _f32(1.0 - s))
+    if sector & 1:
+        q = _f32(v * _f32(1.0 - _f32(s * f)))
+        red, green, blue = {1: (q, v, p), 3: (p, q, v), 5: (v, p, q)}[sector]
+    else:
+        t = _f32(v * _f32(1.0 - _f32(s * _f32(1.0 - f))))
+        red, green, blue = {0: (v, t, p), 2: (p, v, t), 4: (t, p, v)}[sector]
+    return (
+        _to_8bit(_round_f32(_f32(red * _USHRT_MAX))),
+        _to_8bit(_round_f32(_f32(green * _USHRT_MAX))),
+        _to_8bit(_round_f32(_f32(blue * _USHRT_MAX))),
+    )
+
+
+def _hue_span(hue_min_deg: float, hue_max_deg: float) -> float:
+    span = (hue_max_deg - hue_min_deg) % 360.0
+    return 360.0 if span == 0 else span
+
+
+def _random_hue(rng: random.Random, hue_min_deg: float, span: float) -> float:
+    if span >= 360.0:
+        return rng.uniform(0.0, 360.0)
+    return (hue_min_deg + rng.uniform(0.0, span)) % 360.0
+
+
+def iter_hue_frames(
+    config: PresetConfig,
+    *,
+    fps: float,
+    frame_count: int,
+    seed: int | None = 0,
+) -> Iterator[tuple[float, int, int, int]]:
+    """Yield (hue, r, g, b) per frame like ``timeline.iter_frames``.
+
+    Generator presets are not supported; their colors come from a plugin.
+    """
+    if config.generator:
+        raise ValueError(f"preset {config.preset_id} uses generator {config.generator!r}")
+    cycle_duration_s = float(max(1.0, min(3600.0, config.cycle_duration_s)))
+    saturation = int(max(0, min(100, config.saturation_pct)))
+    brightness = int(max(0, min(100, config.brightness_pct)))
+    hue_min = config.hue_min_deg % 360.0
+    span = _hue_span(hue_min, config.hue_max_deg % 360.0)
+
+    # The engine draws a start hue for its initial preset, again when the
+    # preset is applied and once more on start().
+    rng = random.Random(seed) if seed is not None else random.Random()
+    initial = preset_by_id(PresetId.CLASSIC)
+    if initial.random_start_hue:
+        rng.random()
+    if config.random_start_hue:
+        rng.random()
+        hue = _random_hue(rng, hue_min, span)
+    else:
+        hue = hue_min
+
+    # Saturation and brightness are fixed, so colors repeat per 16-bit hue.
+    sat16 = _pct16(saturation)
+    val16 = _pct16(brightness)
+    colors: dict[int, tuple[int, int, int]] = {}
+    direction = 1.0
+    last_s = 0.0
+    for frame in range(frame_count):
+        if frame:
+            now_s = frame / fps
+            delta_hue = 360.0 * max(0.0, now_s - last_s) / cycle_duration_s
+            last_s = now_s
+            if span < 360.0:
+                local = max(0.0, min(span, (hue - hue_min) % 360.0))
+                local += (delta_hue % (2.0 * span)) * direction
+                while local > span or local < 0.0:
+                    if local > span:
+                        local = span - (local - span)
+                        direction = -1.0
+                    elif local < 0.0:
+                        local = -local
+                        direction = 1.0
+                hue = (hue_min + local) % 360.0
+            else:
+                hue = (hue + delta_hue) % 360.0
+        hue16 = _hue16(hue)
+        rgb = colors.get(hue16)
+        if rgb is None:
+            rgb = colors[hue16] = _hsv16_to_rgb8(hue16, sat16, val16)
+        yield (hue, *rgb)
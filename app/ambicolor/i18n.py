@@ -41,6 +41,12 @@ TRANSLATIONS: dict[str, dict[str, str]] = {
         "status.combined": "Playback: {playback} | Fullscreen: {fullscreen}",
         "status.fullscreen_on": "Fullscreen enabled",
         "status.fullscreen_off": "Fullscreen disabled",
+        "status.screen_surfaces_on": "Color surfaces opened on {count} screen(s) (F10 to close)",
+        "status.screen_surfaces_off": "Screen color surfaces closed",
+        "status.presets_reloaded": "Reloaded presets: {names}",
+        "status.preset_reload_failed": "Preset file not loaded: {error}",
+        "status.generator_failed": "Generator plugin not available: {error}",
+        "status.generator_dropped": "Generator plugin failed, continuing with the hue cycle: {error}",
         "status.preset_fallback": "{preset} is not fully implemented in this v0.1 build. Using baseline cycle behavior.",
         "status.random_start_on": "Random start hue enabled",
         "status.random_start_off": "Random start hue disabled",
@@ -87,6 +93,12 @@ TRANSLATIONS: dict[str, dict[str, str]] = {
         "status.combined": "Wiedergabe: {playback} | Vollbild: {fullscreen}",
         "status.fullscreen_on": "Vollbild aktiviert",
         "status.fullscreen_off": "Vollbild deaktiviert",
+        "status.screen_surfaces_on": "Farbflächen auf {count} Bildschirm(en) geöffnet (F10 zum Schließen)",
+        "status.screen_surfaces_off": "Bildschirm-Farbflächen geschlossen",
+        "status.presets_reloaded": "Presets neu geladen: {names}",
+        "status.preset_reload_failed": "Preset-Datei nicht geladen: {error}",
+        "status.generator_failed": "Generator-Plugin nicht verfügbar: {error}",
+        "status.generator_dropped": "Generator-Plugin fehlgeschlagen, der Farbkreis läuft weiter: {error}",
         "status.preset_fallback": "{preset} ist in diesem v0.1-Build noch nicht vollständig implementiert. Baseline-Zyklus wird verwendet.",
         "status.random_start_on": "Zufälliger Startton aktiviert",
         "status.random_start_off": "Zufälliger Startton deaktiviert",
@@ -0,0 +1,179 @@
+"""Input-to-photon latency tracing for the control panel.
+
+A trace starts when a control's handler runs (a slider step, spin-box
+edit, preset change, ...) and follows the interaction through the engine
+setter and the color_changed emission to the next ColorSurface paint.
+Paint is the last point visible to the application; compositor and
+display latency come on top.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+# Stages in the order they normally occur. "engine" is stamped by the
+# engine's event hook, which runs when the setter returns, so it follows
+# "color_changed".
+STAGES = ("color_changed", "engine", "paint")
+# Samples kept per interaction; older ones are overwritten.
+DEFAULT_CAPACITY = 2048
+# A trace waiting this long for a paint (e.g. the window is hidden) is
+# dropped instead of being reported as a huge latency.
+STALE_AFTER_S = 2.0
+
+
+@dataclass(slots=True, frozen=True)
+class LatencyStats:
+    interaction: str
+    stage: str
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class _Trace:
+    __slots__ = ("interaction", "started_s", "stamps", "repaint")
+
+    def __init__(self, interaction: str, started_s: float) -> None:
+        self.interaction = interaction
+        self.started_s = started_s
+        self.stamps: dict[str, float] = {}
+        self.repaint = False
+
+
+class LatencyTracer:
+    """Collects per-interaction latency samples for each stage.
+
+    Several interactions may wait for the same paint (Qt merges repaints),
+    and each is completed by it. Interactions that change nothing on
+    screen are counted as unpainted.
+    """
+
+    def __init__(self, *, capacity: int = DEFAULT_CAPACITY, clock: Callable[[], float] | None = None) -> None:
+        self._clock = clock or time.perf_counter
+        self._capacity = capacity
+        self._samples: dict[tuple[str, str], list[float]] = {}
+        self._cursors: dict[tuple[str, str], int] = {}
+        self._pending: list[_Trace] = []
+        self._active: _Trace | None = None
+        self.unpainted = 0
+        self.dropped = 0
+
+    @property
+    def waiting_for_paint(self) -> int:
+        return len(self._pending)
+
+    @contextmanager
+    def interaction(self, name: str) -> Iterator[None]:
+        if self._active is not None:
+            # Nested handler (e.g. a signal fired by another handler): the
+            # outer interaction already covers it.
+            yield
+            return
+        trace = _Trace(name, self._clock())
+        self._active = trace
+        try:
+            yield
+        finally:
+            self._active = None
+            if trace.repaint:
+                self._pending.append(trace)
+            else:
+                self.unpainted += 1
+                self._record_stamps(trace)
+
+    def engine_event(self, kind: str, *args: object) -> None:
+        # Engine event hook; ticks are not part of an interaction.
+        if kind != "tick":
+            self._stamp("engine")
+
+    def color_changed(self, repaint: bool) -> None:
+        self._stamp("color_changed")
+        if repaint and self._active is not None:
+            self._active.repaint = True
+
+    def painted(self) -> None:
+        if not self._pending:
+            return
+        now = self._clock()
+        for trace in self._pending:
+            if now - trace.started_s > STALE_AFTER_S:
+                self.dropped += 1
+                continue
+            trace.stamps["paint"] = now
+            self._record_stamps(trace)
+        self._pending.clear()
+
+    def samples_ms(self, interaction: str, stage: str = "paint") -> list[float]:
+        return list(self._samples.get((interaction, stage), ()))
+
+    def interactions(self) -> list[str]:
+        return sorted({interaction for interaction, _stage in self._samples})
+
+    def stats(self) -> list[LatencyStats]:
+        rows = []
+        for interaction in self.interactions():
+            for stage in STAGES:
+                samples = self._samples.get((interaction, stage))
+                if not samples:
+                    continue
+                ordered = sorted(samples)
+                last = len(ordered) - 1
+                rows.append(
+                    LatencyStats(
+                        interaction=interaction,
+                        stage=stage,
+                        count=len(ordered),
+                        mean_ms=sum(ordered) / len(ordered),
+                        p50_ms=ordered[int(0.50 * last)],
+                        p95_ms=ordered[int(0.95 * last)],
+                        p99_ms=ordered[int(0.99 * last)],
+                        max_ms=ordered[-1],
+                    )
+                )
+        return rows
+
+    def report(self) -> str:
+        lines = [
+            "Interaction latency (ms from control event):",
+            f"  {'interaction':<20} {'stage':<14} {'n':>5} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}",
+        ]
+        for row in self.stats():
+            lines.append(
+                f"  {row.interaction:<20} {row.stage:<14} {row.count:>5} "
+                f"{row.p50_ms:>7.2f} {row.p95_ms:>7.2f} {row.p99_ms:>7.2f} {row.max_ms:>7.2f}"
+            )
+        lines.append(f"  without repaint: {self.unpainted}, dropped: {self.dropped}")
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        self._samples.clear()
+        self._cursors.clear()
+        self._pending.clear()
+        self.unpainted = 0
+        self.dropped = 0
+
+    def _stamp(self, stage: str) -> None:
+        trace = self._active
+        if trace is not None and stage not in trace.stamps:
+            trace.stamps[stage] = self._clock()
+
+    def _record_stamps(self, trace: _Trace) -> None:
+        for stage, stamp in trace.stamps.items():
+            self._add(trace.interaction, stage, 1000.0 * (stamp - trace.started_s))
+
+    def _add(self, interaction: str, stage: str, value_ms: float) -> None:
+        key = (interaction, stage)
+        samples = self._samples.setdefault(key, [])
+        if len(samples) < self._capacity:
+            samples.append(value_ms)
+            return
+        cursor = self._cursors.get(key, 0)
+        samples[cursor] = value_ms
+        self._cursors[key] = (cursor + 1) % self._capacity
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import socket
+import struct
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from PySide6.QtGui import QColor
+
+from .engine import ColorCycleEngine
+
+ARTNET_PORT = 6454
+DMX_UNIVERSE_SIZE = 512
+# Hosts that could not be resolved are retried this often.
+RESOLVE_RETRY_S = 30.0
+
+_ARTDMX_HEADER = struct.Struct("<8sH2B4B2B")
+_ARTDMX_ID = b"Art-Net\x00"
+_ARTDMX_OPCODE = 0x5000
+_ARTDMX_PROTOCOL_VERSION = 14
+
+# Socket and address an endpoint is sent to; None until resolved.
+_Target = tuple[socket.socket, tuple] | None
+
+
+@dataclass(slots=True, frozen=True)
+class LightEndpoint:
+    host: str
+    port: int = ARTNET_PORT
+    universe: int = 0
+
+
+@dataclass(slots=True, frozen=True)
+class LightOutputStats:
+    frames_published: int
+    frames_sent: int
+    frames_superseded: int
+    packets_sent: int
+    packets_per_second: float
+    send_latency_avg_ms: float
+    send_latency_max_ms: float
+    send_errors: int
+    resolve_errors: int
+
+
+def parse_endpoint(spec: str) -> LightEndpoint:
+    """Parse ``host[:port][/universe]`` into a LightEndpoint.
+
+    IPv6 addresses with a port are written in brackets (``[fd00::5]:6454``).
+    """
+    universe = 0
+    if "/" in spec:
+        spec, universe_text = spec.rsplit("/", 1)
+        universe = int(universe_text)
+    port = ARTNET_PORT
+    if spec.startswith("["):
+        spec, bracket, port_text = spec[1:].partition("]")
+        if not bracket or (port_text and not port_text.startswith(":")):
+            raise ValueError(f"invalid light endpoint: [{spec}{bracket}{port_text}")
+        if port_text:
+            port = int(port_text[1:])
+    elif spec.count(":") == 1:
+        spec, port_text = spec.split(":")
+        port = int(port_text)
+    if not spec:
+        raise ValueError("light endpoint host must not be empty")
+    if not 0 <= universe <= 0x7FFF:
+        raise ValueError(f"invalid Art-Net universe: {universe}")
+    return LightEndpoint(host=spec, port=port, universe=universe)
+
+
+class LightOutputStage:
+    """Sends the current color as ArtDmx packets from a background thread.
+
+    The GUI thread only stores the latest RGB value and wakes the sender.
+    Frames that arrive while a send is in progress replace the pending one
+    (latest frame wins), so a slow network never blocks the engine tick.
+    Host names are resolved (IPv4 or IPv6) by the sender thread as well; a
+    host that cannot be resolved is passed to ``on_error``, called on that
+    thread, skipped and retried every RESOLVE_RETRY_S.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[LightEndpoint],
+        *,
+        fixture_count: int = 1,
+        start_channel: int = 1,
+        clock: Callable[[], float] | None = None,
+        on_error: Callable[[str], None] | None = None,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("at least one light endpoint is required")
+        if fixture_count < 1:
+            raise ValueError("fixture_count must be at least 1")
+        if start_channel < 1 or start_channel - 1 + 3 * fixture_count > DMX_UNIVERSE_SIZE:
+            raise ValueError("fixtures do not fit into one DMX universe")
+
+        self._endpoints = list(endpoints)
+        self._fixture_count = fixture_count
+        self._first_slot = _ARTDMX_HEADER.size + start_channel - 1
+        self._clock = clock or time.perf_counter
+        self._on_error = on_error
+
+        # One preallocated packet per endpoint; only the sequence byte and
+        # the fixture channels are rewritten per frame.
+        self._packets = [self._build_packet(endpoint.universe) for endpoint in self._endpoints]
+        self._dmx_sequence = 0
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending_r = 0
+        self._pending_g = 0
+        self._pending_b = 0
+        self._pending_seq = 0
+        self._pending_published_s = 0.0
+        self._sent_seq = 0
+
+        self._frames_sent = 0
+        self._frames_superseded = 0
+        self._packets_sent = 0
+        self._send_errors = 0
+        self._resolve_errors = 0
+        self._latency_total_s = 0.0
+        self._latency_max_s = 0.0
+        self._started_s: float | None = None
+
+        self._thread: threading.Thread | None = None
+        self._running = False
+        self._engine: ColorCycleEngine | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def attach(self, engine: ColorCycleEngine) -> None:
+        self.detach()
+        self._engine = engine
+        engine.color_changed.connect(self._on_color_changed)
+        # Keep frames coming while the window is minimized or covered.
+        engine.hold_awake()
+
+    def detach(self) -> None:
+        if self._engine is None:
+            return
+        self._engine.color_changed.disconnect(self._on_color_changed)
+        self._engine.release_awake()
+        self._engine = None
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._started_s = self._clock()
+        self._thread = threading.Thread(target=self._run, name="ambicolor-light-output", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            # A thread still waiting for DNS closes its sockets when done.
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def publish_rgb(self, red: int, green: int, blue: int) -> None:
+        with self._lock:
+            self._pending_r = red
+            self._pending_g = green
+            self._pending_b = blue
+            self._pending_seq += 1
+            self._pending_published_s = self._clock()
+        self._wake.set()
+
+    def stats(self) -> LightOutputStats:
+        with self._lock:
+            frames_published = self._pending_seq
+            frames_sent = self._frames_sent
+            latency_total_s = self._latency_total_s
+            latency_max_s = self._latency_max_s
+        elapsed_s = 0.0 if self._started_s is None else self._clock() - self._started_s
+        return LightOutputStats(
+            frames_published=frames_published,
+            frames_sent=frames_sent,
+            frames_superseded=self._frames_superseded,
+            packets_sent=self._packets_sent,
+            packets_per_second=self._packets_sent / elapsed_s if elapsed_s > 0 else 0.0,
+            send_latency_avg_ms=1000.0 * latency_total_s / frames_sent if frames_sent else 0.0,
+            send_latency_max_ms=1000.0 * latency_max_s,
+            send_errors=self._send_errors,
+            resolve_errors=self._resolve_errors,
+        )
+
+    def _on_color_changed(self, color: QColor, _hex: str, _display_name: str) -> None:
+        self.publish_rgb(color.red(), color.green(), color.blue())
+
+    def _build_packet(self, universe: int) -> bytearray:
+        packet = bytearray(_ARTDMX_HEADER.size + DMX_UNIVERSE_SIZE)
+        _ARTDMX_HEADER.pack_into(
+            packet,
+            0,
+            _ARTDMX_ID,
+            _ARTDMX_OPCODE,
+            0,
+            _ARTDMX_PROTOCOL_VERSION,
+            0,  # sequence, rewritten per frame
+            0,  # physical port
+            universe & 0xFF,
+            (universe >> 8) & 0x7F,
+            DMX_UNIVERSE_SIZE >> 8,
+            DMX_UNIVERSE_SIZE & 0xFF,
+        )
+        return packet
+
+    def _resolve_missing(self, targets: list[_Target], sockets: dict[int, socket.socket]) -> float | None:
+        # Returns when to retry, or None once every endpoint has a target.
+        # Sockets are per address family.
+        for index, endpoint in enumerate(self._endpoints):
+            if targets[index] is not None:
+                continue
+            try:
+                family, _type, _proto, _name, address = socket.getaddrinfo(
+                    endpoint.host, endpoint.port, type=socket.SOCK_DGRAM
+                )[0]
+                sock = sockets.get(family)
+                if sock is None:
+                    sock = socket.socket(family, socket.SOCK_DGRAM)
+                    if family == socket.AF_INET:
+                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                    sockets[family] = sock
+            except OSError as exc:
+                self._resolve_errors += 1
+                if self._on_error is not None:
+                    self._on_error(f"cannot send to {endpoint.host}: {exc}")
+                continue
+            targets[index] = (sock, address)
+        return self._clock() + RESOLVE_RETRY_S if None in targets else None
+
+    def _run(self) -> None:
+        targets: list[_Target] = [None] * len(self._endpoints)
+        sockets: dict[int, socket.socket] = {}
+        try:
+            self._send_loop(targets, sockets)
+        finally:
+            for sock in sockets.values():
+                sock.close()
+
+    def _send_loop(self, targets: list[_Target], sockets: dict[int, socket.socket]) -> None:
+        sequence_offset = 12
+        retry_at_s = self._resolve_missing(targets, sockets)
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if not self._running:
+                return
+            if retry_at_s is not None and self._clock() >= retry_at_s:
+                retry_at_s = self._resolve_missing(targets, sockets)
+
+            with self._lock:
+                seq = self._pending_seq
+                red = self._pending_r
+                green = self._pending_g
+                blue = self._pending_b
+                published_s = self._pending_published_s
+            if seq == self._sent_seq:
+                continue
+            self._frames_superseded += seq - self._sent_seq - 1
+            self._sent_seq = seq
+
+            # DMX sequence 0 means "disabled", so cycle through 1..255.
+            self._dmx_sequence = self._dmx_sequence % 255 + 1
+            for packet in self._packets:
+                packet[sequence_offset] = self._dmx_sequence
+                slot = self._first_slot
+                for _ in range(self._fixture_count):
+                    packet[slot] = red
+                    packet[slot + 1] = green
+                    packet[slot + 2] = blue
+                    slot += 3
+
+            for packet, target in zip(self._packets, targets):
+                if target is None:
+                    continue
+                sock, address = target
+                try:
+                    sock.sendto(packet, address)
+                except OSError:
+                    self._send_errors += 1
+                else:
+                    self._packets_sent += 1
+
+            latency_s = self._clock() - published_s
+            with self._lock:
+                self._frames_sent += 1
+                self._latency_total_s += latency_s
+                if latency_s > self._latency_max_s:
+                    self._latency_max_s = latency_s
@@ -0,0 +1,229 @@
+"""Memory instrumentation for long-running sessions.
+
+MemoryMonitor samples tracemalloc, the resident set size and Qt object
+counts, and attributes retained Python memory to AmbiColor subsystems (one
+per module). Attached to an engine it also measures the transient peak
+allocated between two ticks. Enable it in the app with
+``--profile-memory SECONDS``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+from PySide6.QtCore import QObject
+
+from .engine import ColorCycleEngine
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_QT_MARKER = f"{os.sep}PySide6{os.sep}"
+
+
+@dataclass(slots=True, frozen=True)
+class MemorySample:
+    elapsed_s: float
+    ticks: int
+    traced_bytes: int
+    resident_bytes: int | None
+    qt_objects: int
+    # Retained bytes and blocks by subsystem (AmbiColor module, "qt", "other").
+    by_subsystem: dict[str, int] = field(default_factory=dict)
+    blocks_by_subsystem: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(slots=True, frozen=True)
+class GrowthRate:
+    subsystem: str
+    bytes_per_tick: float
+    blocks_per_tick: float
+
+
+def resident_bytes() -> int | None:
+    """Current resident set size, or None where it cannot be read."""
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", encoding="ascii") as handle:
+                return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class _Counters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = _Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return int(counters.WorkingSetSize)
+    return None
+
+
+def qt_object_counts(roots: Iterable[QObject]) -> Counter[str]:
+    """QObjects by class name in the trees below ``roots``."""
+    counts: Counter[str] = Counter()
+    seen: set[int] = set()
+    for root in roots:
+        for obj in (root, *root.findChildren(QObject)):
+            key = id(obj)
+            if key not in seen:
+                seen.add(key)
+                counts[obj.metaObject().className()] += 1
+    return counts
+
+
+def subsystem_of(filename: str) -> str:
+    if os.path.dirname(os.path.abspath(filename)) == _PACKAGE_DIR:
+        return os.path.splitext(os.path.basename(filename))[0]
+    if _QT_MARKER in filename:
+        return "qt"
+    return "other"
+
+
+class MemoryMonitor:
+    """Samples memory use over time and derives per-tick rates.
+
+    tracemalloc counts live allocations, so the per-subsystem figures are
+    retained growth (what a leak looks like); the allocation churn of a
+    tick shows up as its transient peak instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        qt_roots: Callable[[], Iterable[QObject]] | None = None,
+        frames: int = 1,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        self._qt_roots = qt_roots or (lambda: ())
+        self._frames = frames
+        self._clock = clock or time.monotonic
+        self._started_tracing = False
+        self._origin_s = 0.0
+        self._samples: list[MemorySample] = []
+        self._engine: ColorCycleEngine | None = None
+        self.ticks = 0
+        self.max_tick_peak_bytes = 0
+        self._tick_peak_total = 0
+
+    @property
+    def samples(self) -> list[MemorySample]:
+        return list(self._samples)
+
+    @property
+    def mean_tick_peak_bytes(self) -> float:
+        return self._tick_peak_total / self.ticks if self.ticks else 0.0
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+            self._started_tracing = True
+        self._origin_s = self._clock()
+        tracemalloc.reset_peak()
+
+    def stop(self) -> None:
+        self.detach()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def attach(self, engine: ColorCycleEngine) -> None:
+        self.detach()
+        self._engine = engine
+        engine.add_event_hook(self._on_event)
+
+    def detach(self) -> None:
+        if self._engine is not None:
+            self._engine.remove_event_hook(self._on_event)
+            self._engine = None
+
+    def reset_tick_peaks(self) -> None:
+        self.max_tick_peak_bytes = 0
+        self._tick_peak_total = 0
+        self.ticks = 0
+        tracemalloc.reset_peak()
+
+    def sample(self) -> MemorySample:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"))
+        )
+        by_subsystem: Counter[str] = Counter()
+        blocks: Counter[str] = Counter()
+        for stat in snapshot.statistics("filename"):
+            name = subsystem_of(stat.traceback[0].filename)
+            by_subsystem[name] += stat.size
+            blocks[name] += stat.count
+        sample = MemorySample(
+            elapsed_s=self._clock() - self._origin_s,
+            ticks=self.ticks,
+            traced_bytes=tracemalloc.get_traced_memory()[0],
+            resident_bytes=resident_bytes(),
+            qt_objects=sum(qt_object_counts(self._qt_roots()).values()),
+            by_subsystem=dict(by_subsystem),
+            blocks_by_subsystem=dict(blocks),
+        )
+        self._samples.append(sample)
+        # Taking the snapshot must not count as a tick's allocation.
+        tracemalloc.reset_peak()
+        return sample
+
+    def growth_per_tick(self, first: MemorySample, last: MemorySample) -> list[GrowthRate]:
+        ticks = max(1, last.ticks - first.ticks)
+        names = sorted(set(first.by_subsystem) | set(last.by_subsystem))
+        rates = [
+            GrowthRate(
+                subsystem=name,
+                bytes_per_tick=(last.by_subsystem.get(name, 0) - first.by_subsystem.get(name, 0)) / ticks,
+                blocks_per_tick=(last.blocks_by_subsystem.get(name, 0) - first.blocks_by_subsystem.get(name, 0)) / ticks,
+            )
+            for name in names
+        ]
+        return sorted(rates, key=lambda rate: rate.bytes_per_tick, reverse=True)
+
+    def report(self) -> str:
+        lines = ["Memory profile:", f"  {'s':>8} {'ticks':>9} {'traced KiB':>11} {'RSS MiB':>8} {'Qt objects':>10}"]
+        for sample in self._samples:
+            rss = f"{sample.resident_bytes / 1048576:8.1f}" if sample.resident_bytes is not None else f"{'-':>8}"
+            lines.append(
+                f"  {sample.elapsed_s:8.0f} {sample.ticks:9d} {sample.traced_bytes / 1024:11.1f} {rss} {sample.qt_objects:10d}"
+            )
+        lines.append(
+            f"  per tick: mean transient {self.mean_tick_peak_bytes:.0f} B, max {self.max_tick_peak_bytes} B"
+        )
+        if len(self._samples) >= 2:
+            # The first sample includes startup; growth is measured after it.
+            lines.append("  retained growth per tick by subsystem (second to last sample):")
+            for rate in self.growth_per_tick(self._samples[1 if len(self._samples) > 2 else 0], self._samples[-1]):
+                if rate.bytes_per_tick or rate.blocks_per_tick:
+                    lines.append(f"    {rate.subsystem:<20} {rate.bytes_per_tick:+9.2f} B {rate.blocks_per_tick:+8.3f} blocks")
+        return "\n".join(lines)
+
+    def _on_event(self, kind: str, *args: object) -> None:
+        if kind != "tick":
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        transient = peak - current
+        tracemalloc.reset_peak()
+        self.ticks += 1
+        self._tick_peak_total += transient
+        if transient > self.max_tick_peak_bytes:
+            self.max_tick_peak_bytes = transient
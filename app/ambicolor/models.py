@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
+from functools import cache
 
 
 class PlaybackState(str, Enum):
@@ -19,7 +20,8 @@ class PresetId(str, Enum):
 
 @dataclass(slots=True)
 class PresetConfig:
-    preset_id: PresetId
+    # Built-in presets use PresetId; presets loaded from files may use any id.
+    preset_id: PresetId | str
     label_key: str
     description_key: str
     cycle_duration_s: float
@@ -29,6 +31,9 @@ class PresetConfig:
     hue_min_deg: float
     hue_max_deg: float
     implemented: bool
+    # Name of a generator plugin that produces the colors instead of the
+    # built-in hue cycle (see ambicolor.generators).
+    generator: str | None = None
 
 
 def preset_catalog() -> list[PresetConfig]:
@@ -84,8 +89,18 @@ def preset_catalog() -> list[PresetConfig]:
     ]
 
 
-def preset_by_id(preset_id: PresetId) -> PresetConfig:
-    for preset in preset_catalog():
-        if preset.preset_id == preset_id:
-            return preset
-    raise ValueError(f"Unknown preset id: {preset_id}")
+def preset_key(preset_id: PresetId | str) -> str:
+    return preset_id.value if isinstance(preset_id, PresetId) else preset_id
+
+
+@cache
+def _builtin_index() -> dict[str, PresetConfig]:
+    return {preset_key(preset.preset_id): preset for preset in preset_catalog()}
+
+
+def preset_by_id(preset_id: PresetId | str) -> PresetConfig:
+    # Shared instances: callers treat presets as read-only.
+    try:
+        return _builtin_index()[preset_key(preset_id)]
+    except KeyError:
+        raise ValueError(f"Unknown preset id: {preset_id}") from None
@@ -0,0 +1,229 @@
+"""Parallel headless rendering for batch jobs.
+
+On a free-threaded interpreter (e.g. python3.14t) timelines are rendered
+by a thread pool straight into shared output buffers; on a standard build
+the same API falls back to a process pool. Built-in presets are rendered
+by the Qt-free hue kernel, so PySide6 is never imported and the GIL stays
+off. Benchmark scaling with::
+
+    python -m ambicolor.parallel --max-workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .models import PresetConfig, preset_catalog
+from .timeline import Timeline, default_frame_count, render_into, render_timeline
+
+# Chunks per worker: enough to even out jobs of different lengths.
+_CHUNKS_PER_WORKER = 4
+
+
+def free_threaded() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def available_cpus() -> int:
+    count = getattr(os, "process_cpu_count", os.cpu_count)()
+    return count or 1
+
+
+def parallel_executor(workers: int | None = None) -> Executor:
+    workers = workers or available_cpus()
+    if free_threaded():
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+@dataclass(slots=True, frozen=True)
+class RenderJob:
+    config: PresetConfig
+    fps: float = 30.0
+    frame_count: int | None = None
+    seed: int | None = 0
+
+    @property
+    def frames(self) -> int:
+        return self.frame_count if self.frame_count is not None else default_frame_count(self.config, self.fps)
+
+
+def _split(jobs: Sequence[RenderJob], chunk_count: int) -> list[list[int]]:
+    # Contiguous runs of jobs with roughly equal frame totals. A timeline
+    # is never split: the hue is integrated tick by tick, and restarting
+    # mid-way would not reproduce the sequential result bit for bit.
+    total = sum(job.frames for job in jobs)
+    target = max(1, total // max(1, chunk_count))
+    chunks: list[list[int]] = [[]]
+    filled = 0
+    for index, job in enumerate(jobs):
+        if filled >= target and chunks[-1]:
+            chunks.append([])
+            filled = 0
+        chunks[-1].append(index)
+        filled += job.frames
+    return [chunk for chunk in chunks if chunk]
+
+
+def _render_chunk_into(
+    jobs: Sequence[RenderJob], indices: Sequence[int], offsets: Sequence[int], hues: memoryview, rgb: memoryview
+) -> None:
+    for index in indices:
+        job = jobs[index]
+        start, frames = offsets[index], job.frames
+        render_into(
+            job.config,
+            hues[start : start + frames],
+            rgb[3 * start : 3 * (start + frames)],
+            fps=job.fps,
+            frame_count=frames,
+            seed=job.seed,
+        )
+
+
+def _render_chunk(jobs: Sequence[RenderJob]) -> list[tuple[bytes, bytes]]:
+    rendered = []
+    for job in jobs:
+        timeline = render_timeline(job.config, fps=job.fps, frame_count=job.frames, seed=job.seed)
+        rendered.append((timeline.hues.tobytes(), timeline.rgb))
+    return rendered
+
+
+def render_many(
+    jobs: Sequence[RenderJob], *, executor: Executor | None = None, workers: int | None = None
+) -> list[Timeline]:
+    """Render every job and return the timelines in job order.
+
+    With a thread pool each chunk writes directly into one shared hue array
+    and one shared RGB buffer; a process pool returns each chunk's bytes,
+    which are copied into the same buffers. ``workers`` is the executor's
+    worker count (default: the available CPUs) and sizes the chunks.
+    Results are identical to calling render_timeline() for each job.
+    """
+    jobs = list(jobs)
+    offsets = []
+    total = 0
+    for job in jobs:
+        offsets.append(total)
+        total += job.frames
+    hues = array("d", bytes(8 * total))
+    rgb = bytearray(3 * total)
+
+    with memoryview(hues) as hue_view, memoryview(rgb) as rgb_view:
+        if executor is None:
+            _render_chunk_into(jobs, range(len(jobs)), offsets, hue_view, rgb_view)
+        else:
+            chunks = _split(jobs, (workers or available_cpus()) * _CHUNKS_PER_WORKER)
+            if isinstance(executor, ThreadPoolExecutor):
+                futures = [
+                    executor.submit(_render_chunk_into, jobs, chunk, offsets, hue_view, rgb_view) for chunk in chunks
+                ]
+                for future in futures:
+                    future.result()
+            else:
+                futures = [(chunk, executor.submit(_render_chunk, [jobs[i] for i in chunk])) for chunk in chunks]
+                byte_view = hue_view.cast("B")
+                for chunk, future in futures:
+                    for index, (hue_bytes, rgb_bytes) in zip(chunk, future.result()):
+                        start = offsets[index]
+                        byte_view[8 * start : 8 * start + len(hue_bytes)] = hue_bytes
+                        rgb_view[3 * start : 3 * start + len(rgb_bytes)] = rgb_bytes
+                byte_view.release()
+
+    timelines = []
+    with memoryview(rgb) as rgb_view:
+        for job, start in zip(jobs, offsets):
+            end = start + job.frames
+            timelines.append(Timeline(fps=job.fps, hues=hues[start:end], rgb=bytes(rgb_view[3 * start : 3 * end])))
+    return timelines
+
+
+def benchmark(
+    jobs: Sequence[RenderJob],
+    *,
+    worker_counts: Sequence[int],
+    kinds: Sequence[str] = ("thread", "process"),
+) -> list[dict]:
+    frames = sum(job.frames for job in jobs)
+    results = []
+    baseline_s = 0.0
+
+    def run(kind: str, workers: int) -> None:
+        nonlocal baseline_s
+        start = time.perf_counter()
+        if kind == "serial":
+            render_many(jobs)
+        else:
+            pool = ThreadPoolExecutor if kind == "thread" else ProcessPoolExecutor
+            with pool(max_workers=workers) as executor:
+                render_many(jobs, executor=executor, workers=workers)
+        elapsed_s = time.perf_counter() - start
+        baseline_s = baseline_s or elapsed_s
+        results.append(
+            {
+                "executor": kind,
+                "workers": workers,
+                "elapsed_s": round(elapsed_s, 4),
+                "frames_per_s": round(frames / elapsed_s, 1),
+                "speedup": round(baseline_s / elapsed_s, 2),
+                "efficiency": round(baseline_s / elapsed_s / workers, 2),
+            }
+        )
+
+    run("serial", 1)
+    for kind in kinds:
+        for workers in worker_counts:
+            if workers > 1:
+                run(kind, workers)
+    return results
+
+
+def _worker_counts(maximum: int) -> list[int]:
+    counts = [1]
+    while counts[-1] * 2 <= maximum:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != maximum:
+        counts.append(maximum)
+    return counts
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ambicolor.parallel", description="Benchmark parallel timeline rendering.")
+    parser.add_argument("--max-workers", type=int, default=available_cpus())
+    parser.add_argument("--jobs", type=int, default=32, help="timelines to render per run")
+    parser.add_argument("--frames", type=int, default=3600, help="frames per timeline")
+    parser.add_argument("--executor", choices=("thread", "process", "both"), default="both")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    presets = preset_catalog()
+    jobs = [
+        RenderJob(presets[index % len(presets)], frame_count=args.frames, seed=index) for index in range(args.jobs)
+    ]
+    kinds = ("thread", "process") if args.executor == "both" else (args.executor,)
+    results = benchmark(jobs, worker_counts=_worker_counts(max(1, args.max_workers)), kinds=kinds)
+    build = "free-threaded" if free_threaded() else "GIL"
+    if args.json:
+        print(json.dumps({"python": sys.version.split()[0], "build": build, "results": results}, indent=2))
+        return 0
+    print(f"Python {sys.version.split()[0]} ({build}), {args.jobs} x {args.frames} frames")
+    print(f"{'executor':>8} {'workers':>7} {'seconds':>9} {'frames/s':>10} {'speedup':>7} {'eff.':>5}")
+    for row in results:
+        print(
+            f"{row['executor']:>8} {row['workers']:>7} {row['elapsed_s']:>9.3f} "
+            f"{row['frames_per_s']:>10.1f} {row['speedup']:>7.2f} {row['efficiency']:>5.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,280 @@
+"""Animated gradient previews for the preset selector.
+
+Each preview is one headless timeline of the preset (a full cycle at
+PREVIEW_SAMPLES frames) drawn as a horizontal gradient strip; animating it
+means scrolling the strip. Strips are rendered on a background worker and
+cached as pixmaps keyed on the preset's parameters. Only the rows the popup
+actually paints and the selected preset are requested, and the animation
+timer runs only while the popup is open or the selector has focus. Presets
+of generator plugins keep a blank placeholder until the plugin was loaded
+by selecting the preset, so browsing the list never imports a plugin.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from PySide6.QtCore import QEvent, QModelIndex, QObject, QRect, QSize, Qt, QTimer
+from PySide6.QtGui import QIcon, QImage, QPainter, QPixmap
+from PySide6.QtWidgets import QComboBox, QStyledItemDelegate, QStyleOptionViewItem
+
+from .generators import generator_loaded
+from .models import PresetConfig
+from .preset_registry import config_digest
+from .timeline import full_cycle_seconds, render_timeline
+
+# Timeline frames per preview; the strip shows one full cycle.
+PREVIEW_SAMPLES = 32
+PREVIEW_SIZE = QSize(48, 16)
+# One animation step advances the strip by one sample.
+ANIMATION_INTERVAL_MS = 100
+# Strips kept as pixmaps; a strip of the default size is about 6 KiB.
+CACHE_CAPACITY = 64
+
+PreviewKey = tuple[str, int, int]
+
+
+def preview_key(config: PresetConfig, size: QSize = PREVIEW_SIZE) -> PreviewKey:
+    return config_digest(config), size.width(), size.height()
+
+
+def render_preview_strip(config: PresetConfig, size: QSize = PREVIEW_SIZE, samples: int = PREVIEW_SAMPLES) -> QImage:
+    """Render a strip twice the preview width holding two full cycles.
+
+    Any ``size.width()`` wide window of it is a valid animation frame, so
+    one image serves every frame. QImage (unlike QPixmap) may be created
+    off the GUI thread.
+    """
+    timeline = render_timeline(config, fps=samples / full_cycle_seconds(config), frame_count=samples, seed=0)
+    row = bytes(timeline.rgb) * 2
+    source = QImage(row, 2 * samples, 1, 6 * samples, QImage.Format.Format_RGB888)
+    # scaled() copies, so the image no longer refers to ``row``.
+    return source.scaled(
+        2 * size.width(),
+        size.height(),
+        Qt.AspectRatioMode.IgnoreAspectRatio,
+        Qt.TransformationMode.SmoothTransformation,
+    )
+
+
+class PreviewCache:
+    """Least-recently-used pixmap cache; keys that failed to render are
+    remembered so they are not retried."""
+
+    def __init__(self, capacity: int = CACHE_CAPACITY) -> None:
+        self._capacity = capacity
+        self._pixmaps: OrderedDict[PreviewKey, QPixmap] = OrderedDict()
+        self._failed: set[PreviewKey] = set()
+
+    def __len__(self) -> int:
+        return len(self._pixmaps)
+
+    def __contains__(self, key: PreviewKey) -> bool:
+        return key in self._pixmaps or key in self._failed
+
+    def get(self, key: PreviewKey) -> QPixmap | None:
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def put(self, key: PreviewKey, pixmap: QPixmap) -> None:
+        self._pixmaps[key] = pixmap
+        self._pixmaps.move_to_end(key)
+        while len(self._pixmaps) > self._capacity:
+            self._pixmaps.popitem(last=False)
+
+    def mark_failed(self, key: PreviewKey) -> None:
+        self._failed.add(key)
+
+    def clear(self) -> None:
+        self._pixmaps.clear()
+        self._failed.clear()
+
+
+class _PreviewDelegate(QStyledItemDelegate):
+    def __init__(self, previewer: PresetPreviewer) -> None:
+        super().__init__(previewer.combo)
+        self._previewer = previewer
+
+    def initStyleOption(self, option: QStyleOptionViewItem, index: QModelIndex) -> None:  # type: ignore[override]
+        super().initStyleOption(option, index)
+        # A placeholder keeps the text aligned until the strip arrives.
+        option.icon = QIcon(self._previewer.frame_for_row(index.row()))
+        option.decorationSize = self._previewer.size
+        option.features |= QStyleOptionViewItem.ViewItemFeature.HasDecoration
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:  # type: ignore[override]
+        # Views paint only the rows inside their viewport.
+        self._previewer.request(index.row())
+        super().paint(painter, option, index)
+
+
+class PresetPreviewer(QObject):
+    """Shows animated previews in a preset QComboBox.
+
+    ``preset_at(row)`` maps a combo row to its preset. Renders run one at a
+    time on a worker thread, newest request first, so the rows on screen
+    are served before rows that were scrolled past. Requests still queued
+    when the popup closes are dropped. Finished renders are collected by
+    the animation timer, which stops when nothing is pending or animating.
+    """
+
+    def __init__(
+        self,
+        combo: QComboBox,
+        preset_at: Callable[[int], PresetConfig | None],
+        *,
+        size: QSize = PREVIEW_SIZE,
+        cache: PreviewCache | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._combo = combo
+        self._preset_at = preset_at
+        self._size = QSize(size)
+        self._cache = cache if cache is not None else PreviewCache()
+        self._blank = QPixmap(self._size)
+        self._blank.fill(Qt.GlobalColor.transparent)
+        self._queue: list[tuple[PreviewKey, PresetConfig]] = []
+        self._pending: tuple[PreviewKey, Future] | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._phase = 0
+        self._icon_row = -1
+        self.renders = 0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(ANIMATION_INTERVAL_MS)
+        self._timer.timeout.connect(self._on_timer)
+
+        combo.setIconSize(self._size)
+        combo.setItemDelegate(_PreviewDelegate(self))
+        combo.currentIndexChanged.connect(self._on_current_changed)
+        combo.installEventFilter(self)
+        combo.view().installEventFilter(self)
+        self.refresh()
+
+    @property
+    def combo(self) -> QComboBox:
+        return self._combo
+
+    @property
+    def size(self) -> QSize:
+        return QSize(self._size)
+
+    @property
+    def cache(self) -> PreviewCache:
+        return self._cache
+
+    @property
+    def busy(self) -> bool:
+        return self._pending is not None or bool(self._queue)
+
+    @property
+    def animating(self) -> bool:
+        return self._combo.view().isVisible() or self._combo.hasFocus()
+
+    def request(self, row: int) -> None:
+        preset = self._preset_at(row)
+        if preset is None or (preset.generator and not generator_loaded(preset.generator)):
+            return
+        key = preview_key(preset, self._size)
+        if key in self._cache or (self._pending is not None and self._pending[0] == key):
+            return
+        self._queue = [item for item in self._queue if item[0] != key]
+        self._queue.append((key, preset))
+        self._pump()
+
+    def frame_for_row(self, row: int) -> QPixmap:
+        preset = self._preset_at(row)
+        strip = self._cache.get(preview_key(preset, self._size)) if preset is not None else None
+        if strip is None:
+            return self._blank
+        phase = self._phase if self.animating else 0
+        offset = round((phase % PREVIEW_SAMPLES) * self._size.width() / PREVIEW_SAMPLES)
+        return strip.copy(QRect(offset, 0, self._size.width(), self._size.height()))
+
+    def refresh(self) -> None:
+        """Re-request the selected preset; call after refilling the combo."""
+        self._icon_row = -1
+        self._on_current_changed(self._combo.currentIndex())
+
+    def close(self) -> None:
+        self._timer.stop()
+        self._queue.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending = None
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:  # type: ignore[override]
+        kind = event.type()
+        if kind in (QEvent.Type.Show, QEvent.Type.Hide, QEvent.Type.FocusIn, QEvent.Type.FocusOut):
+            if watched is self._combo.view() and kind == QEvent.Type.Hide:
+                # Rows scrolled past or never reached are not rendered.
+                self._queue.clear()
+                if self._icon_row >= 0:
+                    self.request(self._icon_row)
+            # Back to the still frame when the animation stops.
+            self._update_current_icon()
+            self._update_timer()
+        return super().eventFilter(watched, event)
+
+    def _on_current_changed(self, index: int) -> None:
+        if 0 <= self._icon_row < self._combo.count() and self._icon_row != index:
+            # Only the selected row carries an item icon (for the closed combo).
+            self._combo.setItemIcon(self._icon_row, QIcon())
+        self._icon_row = index
+        if index >= 0:
+            self.request(index)
+            self._update_current_icon()
+
+    def _update_current_icon(self) -> None:
+        row = self._icon_row
+        if 0 <= row < self._combo.count():
+            self._combo.setItemIcon(row, QIcon(self.frame_for_row(row)))
+
+    def _pump(self) -> None:
+        if self._pending is None and self._queue:
+            key, preset = self._queue.pop()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ambicolor-preview")
+            self._pending = (key, self._executor.submit(render_preview_strip, preset, self._size))
+        self._update_timer()
+
+    def _collect(self) -> bool:
+        if self._pending is None or not self._pending[1].done():
+            return False
+        key, future = self._pending
+        self._pending = None
+        try:
+            image = future.result()
+        except Exception:
+            # A generator plugin that cannot be loaded or fails while
+            # rendering; the row simply keeps its placeholder.
+            self._cache.mark_failed(key)
+        else:
+            self._cache.put(key, QPixmap.fromImage(image))
+            self.renders += 1
+        self._pump()
+        return True
+
+    def _on_timer(self) -> None:
+        collected = self._collect()
+        animating = self.animating
+        if animating:
+            self._phase = (self._phase + 1) % PREVIEW_SAMPLES
+        if animating or collected:
+            self._update_current_icon()
+            if self._combo.view().isVisible():
+                self._combo.view().viewport().update()
+        self._update_timer()
+
+    def _update_timer(self) -> None:
+        if self.busy or self.animating:
+            if not self._timer.isActive():
+                self._timer.start()
+        else:
+            self._timer.stop()
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable, Iterable
+from functools import cache
+from pathlib import Path
+
+from .color_math import clamp
+from .i18n import DEFAULT_LANGUAGE, tr
+from .models import PresetConfig, PresetId, preset_catalog, preset_key
+
+PRESET_SCHEMA_VERSION = 2
+PRESET_FILE_SUFFIX = ".json"
+
+
+class PresetFileError(ValueError):
+    def __init__(self, path: Path, message: str) -> None:
+        super().__init__(f"{path}: {message}")
+        self.path = path
+
+
+def _migrate_v1(data: dict) -> dict:
+    # v1 drafts stored the hue range as a pair and used short field names.
+    hue_min, hue_max = data.pop("hue_range", (0.0, 360.0))
+    migrated = {
+        "schema_version": 2,
+        "preset_id": data.pop("id"),
+        "label": data.pop("name"),
+        "description": data.pop("description", ""),
+        "cycle_duration_s": data.pop("duration_s"),
+        "saturation_pct": data.pop("saturation"),
+        "brightness_pct": data.pop("brightness"),
+        "random_start_hue": data.pop("random_start", False),
+        "hue_min_deg": hue_min,
+        "hue_max_deg": hue_max,
+    }
+    migrated.update(data)
+    return migrated
+
+
+# Maps a schema version to the function that upgrades it by one version.
+_MIGRATIONS: dict[int, Callable[[dict], dict]] = {1: _migrate_v1}
+
+_REQUIRED_FIELDS: dict[str, tuple[type, ...]] = {
+    "preset_id": (str,),
+    "label": (str,),
+    "cycle_duration_s": (int, float),
+    "saturation_pct": (int, float),
+    "brightness_pct": (int, float),
+    "hue_min_deg": (int, float),
+    "hue_max_deg": (int, float),
+}
+
+
+def parse_preset_data(data: object, path: Path) -> PresetConfig:
+    if not isinstance(data, dict):
+        raise PresetFileError(path, "preset file must contain a JSON object")
+    version = data.get("schema_version", data.get("version"))
+    if not isinstance(version, int) or version < 1:
+        raise PresetFileError(path, "missing or invalid schema_version")
+    if version > PRESET_SCHEMA_VERSION:
+        raise PresetFileError(path, f"schema_version {version} is newer than supported ({PRESET_SCHEMA_VERSION})")
+
+    data = dict(data)
+    data.pop("version", None)
+    try:
+        while version < PRESET_SCHEMA_VERSION:
+            data = _MIGRATIONS[version](data)
+            version = data["schema_version"]
+    except KeyError as exc:
+        raise PresetFileError(path, f"cannot migrate schema_version {version}: missing {exc}") from None
+
+    for field, types in _REQUIRED_FIELDS.items():
+        value = data.get(field)
+        if isinstance(value, bool) or not isinstance(value, types):
+            raise PresetFileError(path, f"field '{field}' is missing or has the wrong type")
+    if not data["preset_id"].strip():
+        raise PresetFileError(path, "preset_id must not be empty")
+
+    generator = data.get("generator")
+    if generator is not None and (not isinstance(generator, str) or not generator.strip()):
+        raise PresetFileError(path, "field 'generator' must be a plugin name")
+
+    raw_id = data["preset_id"].strip()
+    preset_id: PresetId | str
+    try:
+        preset_id = PresetId(raw_id)
+    except ValueError:
+        preset_id = raw_id
+    # tr() falls back to the key itself, so plain text works as a label.
+    return PresetConfig(
+        preset_id=preset_id,
+        label_key=data["label"],
+        description_key=str(data.get("description", "")),
+        cycle_duration_s=float(clamp(data["cycle_duration_s"], 1.0, 3600.0)),
+        saturation_pct=int(clamp(data["saturation_pct"], 0, 100)),
+        brightness_pct=int(clamp(data["brightness_pct"], 0, 100)),
+        random_start_hue=bool(data.get("random_start_hue", False)),
+        hue_min_deg=float(clamp(data["hue_min_deg"], 0.0, 360.0)),
+        hue_max_deg=float(clamp(data["hue_max_deg"], 0.0, 360.0)),
+        implemented=bool(data.get("implemented", True)),
+        generator=generator.strip() if generator else None,
+    )
+
+
+class PresetRegistry:
+    """Presets indexed by id and name.
+
+    Built-in presets come first; presets loaded from files are appended in
+    load order, and a file preset with a built-in id replaces the built-in.
+    Files are remembered by the SHA-256 of their content, so reloading an
+    unchanged file does not parse it again.
+    """
+
+    def __init__(self, presets: Iterable[PresetConfig] = ()) -> None:
+        self._by_id: dict[str, PresetConfig] = {}
+        self._by_name: dict[str, str] = {}
+        self._order: list[str] = []
+        # Per file: the preset id, the content digest and the parsed preset.
+        self._sources: dict[Path, tuple[str, str, PresetConfig]] = {}
+        # Presets without a file (built-ins) hidden by a file preset with
+        # the same id, restored when no file declares that id any more.
+        self._shadowed: dict[str, PresetConfig] = {}
+        for preset in presets:
+            self.register(preset)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, preset_id: object) -> bool:
+        return isinstance(preset_id, str) and preset_key(preset_id) in self._by_id
+
+    def presets(self) -> list[PresetConfig]:
+        return [self._by_id[key] for key in self._order]
+
+    def get(self, preset_id: PresetId | str) -> PresetConfig:
+        try:
+            return self._by_id[preset_key(preset_id)]
+        except KeyError:
+            raise ValueError(f"Unknown preset id: {preset_id}") from None
+
+    def find_by_name(self, name: str) -> PresetConfig | None:
+        key = self._by_name.get(name.strip().casefold())
+        return None if key is None else self._by_id[key]
+
+    def register(self, config: PresetConfig) -> None:
+        key = preset_key(config.preset_id)
+        previous = self._by_id.get(key)
+        if previous is not None:
+            self._unindex_names(previous, key)
+        else:
+            self._order.append(key)
+        self._by_id[key] = config
+        for name in (key, config.label_key, tr(DEFAULT_LANGUAGE, config.label_key)):
+            self._by_name[name.strip().casefold()] = key
+
+    def unregister(self, preset_id: PresetId | str) -> None:
+        key = preset_key(preset_id)
+        config = self._by_id.pop(key, None)
+        if config is None:
+            return
+        self._unindex_names(config, key)
+        self._order.remove(key)
+
+    def load_directory(self, directory: Path) -> list[PresetFileError]:
+        errors: list[PresetFileError] = []
+        for path in sorted(Path(directory).glob(f"*{PRESET_FILE_SUFFIX}")):
+            try:
+                self.load_file(path)
+            except PresetFileError as exc:
+                errors.append(exc)
+        return errors
+
+    def load_file(self, path: Path) -> PresetConfig:
+        path = Path(path)
+        try:
+            raw = path.read_bytes()
+        except OSError as exc:
+            raise PresetFileError(path, f"cannot read preset file: {exc.strerror}") from None
+        digest = hashlib.sha256(raw).hexdigest()
+        known = self._sources.get(path)
+        if known is not None and known[1] == digest:
+            return known[2]
+
+        try:
+            data = json.loads(raw)
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise PresetFileError(path, f"invalid JSON: {exc}") from None
+        config = parse_preset_data(data, path)
+
+        key = preset_key(config.preset_id)
+        if known is not None and known[0] != key:
+            del self._sources[path]
+            self._release_file_preset(known[0])
+        if key in self._by_id and key not in self._shadowed and not self._declared_by_file(key):
+            self._shadowed[key] = self._by_id[key]
+        self.register(config)
+        self._sources[path] = (key, digest, config)
+        return config
+
+    def remove_file(self, path: Path) -> str | None:
+        known = self._sources.pop(Path(path), None)
+        if known is None:
+            return None
+        self._release_file_preset(known[0])
+        return known[0]
+
+    @property
+    def source_paths(self) -> list[Path]:
+        return list(self._sources)
+
+    def _declared_by_file(self, key: str) -> bool:
+        return any(source[0] == key for source in self._sources.values())
+
+    def _release_file_preset(self, key: str) -> None:
+        # The most recently loaded file still declaring the id takes over,
+        # else the preset it shadowed, else the id goes away.
+        surviving = [source[2] for source in self._sources.values() if source[0] == key]
+        if surviving:
+            self.register(surviving[-1])
+            return
+        original = self._shadowed.pop(key, None)
+        if original is not None:
+            self.register(original)
+        else:
+            self.unregister(key)
+
+    def _unindex_names(self, config: PresetConfig, key: str) -> None:
+        for name in (key, config.label_key, tr(DEFAULT_LANGUAGE, config.label_key)):
+            folded = name.strip().casefold()
+            if self._by_name.get(folded) == key:
+                del self._by_name[folded]
+
+
+def config_digest(config: PresetConfig) -> str:
+    fields = (
+        preset_key(config.preset_id),
+        config.cycle_duration_s,
+        config.saturation_pct,
+        config.brightness_pct,
+        config.random_start_hue,
+        config.hue_min_deg,
+        config.hue_max_deg,
+    )
+    if config.generator:
+        # Appended only when set, so digests of plain presets are unchanged.
+        fields += (config.generator,)
+    return hashlib.sha256(repr(fields).encode("utf-8")).hexdigest()
+
+
+@cache
+def default_registry() -> PresetRegistry:
+    return PresetRegistry(preset_catalog())
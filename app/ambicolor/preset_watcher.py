@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+from .models import PresetConfig, preset_key
+from .preset_registry import PRESET_FILE_SUFFIX, PresetFileError, PresetRegistry
+
+
+class PresetHotReloader(QObject):
+    """Watches a preset directory and reloads only the files that changed.
+
+    File and directory notifications are collected into a pending set and
+    handled once the directory has been quiet for ``debounce_ms``, so an
+    editor's burst of saves (write, rename, touch) triggers one re-parse.
+    """
+
+    presets_reloaded = Signal(list)
+    reload_failed = Signal(str)
+
+    def __init__(
+        self,
+        registry: PresetRegistry,
+        directory: Path,
+        *,
+        debounce_ms: int = 300,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._registry = registry
+        self._directory = Path(directory)
+        self._pending: set[Path] = set()
+        self._rescan_pending = False
+        self.reload_count = 0
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.addPath(str(self._directory))
+        self._watch_known_files()
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self.flush)
+
+    def flush(self) -> None:
+        self._debounce.stop()
+        pending = self._pending
+        self._pending = set()
+        if self._rescan_pending:
+            self._rescan_pending = False
+            current = set(self._directory.glob(f"*{PRESET_FILE_SUFFIX}"))
+            pending |= current - set(self._registry.source_paths)
+            pending |= {path for path in self._registry.source_paths if path.parent == self._directory} - current
+        if not pending:
+            return
+
+        # A save that leaves the content (or the parsed preset) as it was,
+        # e.g. a touch, changes nothing: the registry skips files whose
+        # digest is unchanged, and only presets that differ are reported.
+        before = self._live_presets()
+        for path in sorted(pending):
+            try:
+                if path.exists():
+                    self._registry.load_file(path)
+                else:
+                    self._registry.remove_file(path)
+            except PresetFileError as exc:
+                self.reload_failed.emit(str(exc))
+        after = self._live_presets()
+        changed = [key for key in sorted(before.keys() | after.keys()) if before.get(key) != after.get(key)]
+        self._watch_known_files()
+        self.reload_count += 1
+        if changed:
+            self.presets_reloaded.emit(changed)
+
+    def _live_presets(self) -> dict[str, PresetConfig]:
+        return {preset_key(config.preset_id): config for config in self._registry.presets()}
+
+    def _on_file_changed(self, path: str) -> None:
+        self._pending.add(Path(path))
+        self._debounce.start()
+
+    def _on_directory_changed(self, _path: str) -> None:
+        self._rescan_pending = True
+        self._debounce.start()
+
+    def _watch_known_files(self) -> None:
+        # Editors that save by rename drop the file from the watch list.
+        watched = set(self._watcher.files())
+        for path in self._directory.glob(f"*{PRESET_FILE_SUFFIX}"):
+            if str(path) not in watched:
+                self._watcher.addPath(str(path))
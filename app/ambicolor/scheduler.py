@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import json
+from bisect import bisect_right
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
+
+from .engine import ColorCycleEngine
+from .models import PlaybackState, PresetConfig, PresetId, preset_key
+from .preset_registry import PresetRegistry, default_registry
+
+DAY_S = 86400.0
+# Crossfades are precompiled as one parameter set per step.
+CROSSFADE_STEP_S = 0.25
+# One bucket per minute of the day.
+_BUCKET_S = 60.0
+_BUCKET_COUNT = int(DAY_S / _BUCKET_S)
+
+
+class ScheduleError(ValueError):
+    pass
+
+
+@dataclass(slots=True, frozen=True)
+class ScheduleEntry:
+    # Seconds after midnight; an entry with end_s <= start_s wraps past midnight.
+    start_s: float
+    end_s: float
+    preset_id: PresetId | str
+    crossfade_s: float = 0.0
+
+
+@dataclass(slots=True, frozen=True)
+class ScheduleSegment:
+    start_s: float
+    end_s: float
+    # None for a gap with no default preset: the engine is left alone.
+    config: PresetConfig | None
+    # Parameter sets for the crossfade into this segment, one per
+    # CROSSFADE_STEP_S; empty for a hard switch.
+    fade_steps: tuple[PresetConfig, ...] = ()
+
+    @property
+    def fade_s(self) -> float:
+        return len(self.fade_steps) * CROSSFADE_STEP_S
+
+
+def parse_time_of_day(text: str) -> float:
+    parts = text.strip().split(":")
+    try:
+        if len(parts) not in (2, 3):
+            raise ValueError
+        hours, minutes = int(parts[0]), int(parts[1])
+        seconds = float(parts[2]) if len(parts) == 3 else 0.0
+    except ValueError:
+        raise ScheduleError(f"invalid time of day {text!r}, expected HH:MM[:SS]") from None
+    if not (0 <= hours <= 24 and 0 <= minutes < 60 and 0 <= seconds < 60):
+        raise ScheduleError(f"invalid time of day {text!r}")
+    value = hours * 3600 + minutes * 60 + seconds
+    if value > DAY_S:
+        raise ScheduleError(f"invalid time of day {text!r}")
+    return value % DAY_S
+
+
+def seconds_of_day(moment: datetime) -> float:
+    return moment.hour * 3600 + moment.minute * 60 + moment.second + moment.microsecond / 1e6
+
+
+def blend_configs(start: PresetConfig, end: PresetConfig, progress: float) -> PresetConfig:
+    def mix(a: float, b: float) -> float:
+        return a + (b - a) * progress
+
+    return replace(
+        end,
+        cycle_duration_s=mix(start.cycle_duration_s, end.cycle_duration_s),
+        saturation_pct=round(mix(start.saturation_pct, end.saturation_pct)),
+        brightness_pct=round(mix(start.brightness_pct, end.brightness_pct)),
+        hue_min_deg=mix(start.hue_min_deg, end.hue_min_deg),
+        hue_max_deg=mix(start.hue_max_deg, end.hue_max_deg),
+    )
+
+
+def _fade_steps(start: PresetConfig | None, end: PresetConfig | None, crossfade_s: float) -> tuple[PresetConfig, ...]:
+    if start is None or end is None or crossfade_s <= 0 or start == end:
+        return ()
+    count = max(1, round(crossfade_s / CROSSFADE_STEP_S))
+    return tuple(blend_configs(start, end, index / count) for index in range(count))
+
+
+class DailySchedule:
+    """A day split into segments, with an index for O(1) lookup.
+
+    Overlapping entries are resolved in favor of the later entry. Lookup
+    goes through a table with one bucket per minute that points at the
+    segment active at the start of that minute; at most a few boundaries
+    fall inside one minute, so finding the active segment is a table read
+    plus a short forward scan, independent of the number of entries.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[ScheduleEntry],
+        resolve: Callable[[PresetId | str], PresetConfig],
+        *,
+        default: PresetId | str | None = None,
+    ) -> None:
+        self.entries = tuple(entries)
+        default_config = resolve(default) if default is not None else None
+        configs = [resolve(entry.preset_id) for entry in self.entries]
+
+        cuts = {0.0}
+        for entry in self.entries:
+            cuts.add(entry.start_s % DAY_S)
+            cuts.add(entry.end_s % DAY_S)
+        ordered_cuts = sorted(cuts)
+
+        # Elementary intervals take the last entry covering their start.
+        pieces: list[tuple[float, int | None]] = []
+        for start in ordered_cuts:
+            owner = None
+            for index, entry in enumerate(self.entries):
+                if _covers(entry, start):
+                    owner = index
+            if pieces and pieces[-1][1] == owner:
+                continue
+            pieces.append((start, owner))
+        # The piece at midnight continues the last piece of the day.
+        if len(pieces) > 1 and pieces[0][1] == pieces[-1][1]:
+            pieces.pop(0)
+
+        segments: list[ScheduleSegment] = []
+        for position, (start, owner) in enumerate(pieces):
+            end = pieces[(position + 1) % len(pieces)][0]
+            config = configs[owner] if owner is not None else default_config
+            segments.append(ScheduleSegment(start_s=start, end_s=end, config=config))
+        compiled: list[ScheduleSegment] = []
+        for position, segment in enumerate(segments):
+            previous = segments[position - 1] if len(segments) > 1 else None
+            owner = pieces[position][1]
+            crossfade_s = self.entries[owner].crossfade_s if owner is not None else 0.0
+            steps = _fade_steps(previous.config if previous else None, segment.config, crossfade_s)
+            compiled.append(replace(segment, fade_steps=steps))
+        self.segments = tuple(compiled)
+
+        self._starts = [segment.start_s for segment in self.segments]
+        self._buckets = [self._bisect(minute * _BUCKET_S) for minute in range(_BUCKET_COUNT)]
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def index_at(self, second: float) -> int:
+        second %= DAY_S
+        index = self._buckets[int(second // _BUCKET_S)]
+        starts = self._starts
+        count = len(starts)
+        if starts[index] > second:
+            # Bucket points at the segment wrapping past midnight.
+            if starts[0] > second:
+                return index
+            index = 0
+        while index + 1 < count and starts[index + 1] <= second:
+            index += 1
+        return index
+
+    def segment_at(self, second: float) -> ScheduleSegment:
+        return self.segments[self.index_at(second)]
+
+    def _bisect(self, second: float) -> int:
+        # Before the first start (midnight belongs to a wrapping segment)
+        # the last segment of the day is active.
+        return (bisect_right(self._starts, second) - 1) % len(self._starts)
+
+
+def _covers(entry: ScheduleEntry, second: float) -> bool:
+    start = entry.start_s % DAY_S
+    end = entry.end_s % DAY_S
+    if start == end:
+        return True
+    if start < end:
+        return start <= second < end
+    return second >= start or second < end
+
+
+def load_schedule(path: Path, registry: PresetRegistry | None = None) -> DailySchedule:
+    path = Path(path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ScheduleError(f"{path}: cannot read schedule: {exc}") from None
+    if not isinstance(data, dict) or not isinstance(data.get("entries"), list):
+        raise ScheduleError(f"{path}: schedule must be an object with an 'entries' list")
+
+    registry = registry or default_registry()
+    entries = []
+    for raw in data["entries"]:
+        if not isinstance(raw, dict):
+            raise ScheduleError(f"{path}: schedule entries must be objects")
+        try:
+            entries.append(
+                ScheduleEntry(
+                    start_s=parse_time_of_day(str(raw["start"])),
+                    end_s=parse_time_of_day(str(raw["end"])),
+                    preset_id=str(raw["preset"]),
+                    crossfade_s=float(raw.get("crossfade_s", 0.0)),
+                )
+            )
+        except KeyError as exc:
+            raise ScheduleError(f"{path}: schedule entry is missing {exc}") from None
+        except (TypeError, ValueError) as exc:
+            raise ScheduleError(f"{path}: {exc}") from None
+    try:
+        return DailySchedule(entries, registry.get, default=data.get("default"))
+    except ValueError as exc:
+        raise ScheduleError(f"{path}: {exc}") from None
+
+
+class PresetScheduler(QObject):
+    """Drives a ColorCycleEngine from a DailySchedule.
+
+    A single-shot timer is armed for the next segment boundary, or for the
+    next crossfade step while a fade is running, so nothing runs between
+    boundaries. start() seeks straight to the current wall-clock time.
+
+    Presets are applied without touching playback: a paused or stopped
+    engine stays so. With ``owns_playback`` (no session was restored) a
+    seek also starts an engine at standstill.
+    """
+
+    segment_changed = Signal(str)
+
+    def __init__(
+        self,
+        engine: ColorCycleEngine,
+        schedule: DailySchedule,
+        *,
+        clock: Callable[[], datetime] | None = None,
+        owns_playback: bool = True,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._engine = engine
+        self._schedule = schedule
+        self._clock = clock or datetime.now
+        self._owns_playback = owns_playback
+        self._active_index: int | None = None
+        self._applied: PresetConfig | None = None
+        self.wakeups = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        # A coarse timer may fire a crossfade step up to 5% late; the
+        # scheduler wakes rarely, so precision costs nothing.
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._on_wake)
+
+    @property
+    def schedule(self) -> DailySchedule:
+        return self._schedule
+
+    @property
+    def active_segment(self) -> ScheduleSegment | None:
+        return None if self._active_index is None else self._schedule.segments[self._active_index]
+
+    @property
+    def next_wake_in_s(self) -> float | None:
+        return self._timer.remainingTime() / 1000.0 if self._timer.isActive() else None
+
+    def start(self) -> None:
+        self.seek(self._clock())
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def seek(self, moment: datetime) -> None:
+        second = seconds_of_day(moment)
+        self._active_index = None
+        self._applied = None
+        self._update(second, seeking=True)
+
+    def _on_wake(self) -> None:
+        self.wakeups += 1
+        self._update(seconds_of_day(self._clock()), seeking=False)
+
+    def _update(self, second: float, *, seeking: bool) -> None:
+        index = self._schedule.index_at(second)
+        segment = self._schedule.segments[index]
+        elapsed = (second - segment.start_s) % DAY_S
+        entered = index != self._active_index
+        self._active_index = index
+
+        if segment.config is not None:
+            step = int(elapsed / CROSSFADE_STEP_S)
+            target = segment.fade_steps[step] if step < len(segment.fade_steps) else segment.config
+            if seeking:
+                self._engine.apply_preset(target)
+                if self._owns_playback and self._engine.state == PlaybackState.STANDSTILL:
+                    self._engine.start()
+            elif target is not self._applied:
+                self._engine.update_preset_in_place(target)
+            self._applied = target
+            if entered:
+                self.segment_changed.emit(preset_key(segment.config.preset_id))
+
+            if step < len(segment.fade_steps):
+                self._arm((step + 1) * CROSSFADE_STEP_S - elapsed)
+                return
+        self._arm((segment.end_s - second) % DAY_S or DAY_S)
+
+    def _arm(self, seconds: float) -> None:
+        # Round up so the wake lands at or just after the boundary.
+        self._timer.start(max(1, int(seconds * 1000.0) + 1))
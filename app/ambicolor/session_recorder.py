@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+import random
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+
+from .color_math import clamp
+from .engine import ColorCycleEngine
+from .frame_ring import STATE_CODES
+from .models import PresetConfig, preset_key
+from .timeline import ManualClock
+
+SESSION_MAGIC = b"AMBISES3"
+SESSION_SUFFIX = ".ambisession"
+
+# timestamp, kind, padding, payload
+_RECORD = struct.Struct("<dB7x16s")
+RECORD_SIZE = _RECORD.size
+# magic, record size, record count, records overwritten before the first one
+_FILE_HEADER = struct.Struct("<8sIIQ")
+
+_TICK = struct.Struct("<3B")
+_DOUBLE = struct.Struct("<d")
+_DOUBLE_PAIR = struct.Struct("<dd")
+_SHORT = struct.Struct("<h")
+_BOOL = struct.Struct("<?")
+_PRESET = struct.Struct("<dhh?")
+_KEY_STATE = struct.Struct("<dhhBb??")
+_TEXT_HEAD = struct.Struct("<H14s")
+
+_STATES_BY_CODE = {code: state for state, code in STATE_CODES.items()}
+
+
+class RecordKind(IntEnum):
+    TICK = 1
+    START = 2
+    PAUSE = 3
+    RESUME = 4
+    STOP = 5
+    # Hue and bounce direction after an input that may pick a random hue.
+    HUE = 6
+    PRESET = 7
+    PRESET_IN_PLACE = 8
+    # Hue range of the preceding PRESET / PRESET_IN_PLACE record.
+    RANGE = 9
+    PRESET_ID = 10
+    CYCLE_DURATION = 11
+    SATURATION = 12
+    BRIGHTNESS = 13
+    RANDOM_START = 14
+    LANGUAGE = 15
+    NAME_HEX = 16
+    NAME_TEXT = 17
+    # KEY_STATE, KEY_HUE, KEY_RANGE and KEY_GENERATOR (followed by a
+    # GENERATOR record) together are a full engine snapshot; replay starts
+    # at the first complete one.
+    KEY_STATE = 18
+    KEY_HUE = 19
+    KEY_RANGE = 20
+    # Continuation of the preceding text record.
+    TEXT_MORE = 21
+    # Generator plugin of the preceding PRESET_ID or KEY_GENERATOR record;
+    # empty for none.
+    GENERATOR = 22
+    # Generator time of the keyframe.
+    KEY_GENERATOR = 23
+
+
+class SessionRecorder:
+    """Records every engine input and tick into a fixed-size binary ring.
+
+    Each record is 32 bytes (timestamp, kind, 16-byte payload); the ring is
+    preallocated from ``capacity_bytes`` and overwrites the oldest records
+    when full. A keyframe with the full motion state and the active generator
+    plugin is written on attach and every ``keyframe_interval_s``, so the
+    surviving tail of the ring can always be replayed on its own.
+    """
+
+    def __init__(self, *, capacity_bytes: int = 4 * 1024 * 1024, keyframe_interval_s: float = 30.0) -> None:
+        capacity = capacity_bytes // RECORD_SIZE
+        if capacity < 16:
+            raise ValueError("session recorder capacity must hold at least 16 records")
+        self._buffer = bytearray(capacity * RECORD_SIZE)
+        self._capacity = capacity
+        self._next = 0
+        self._count = 0
+        self.overwritten = 0
+        self._keyframe_interval_s = keyframe_interval_s
+        self._last_keyframe_s: float | None = None
+        self._engine: ColorCycleEngine | None = None
+
+    @property
+    def record_count(self) -> int:
+        return self._count
+
+    @property
+    def capacity_records(self) -> int:
+        return self._capacity
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._buffer)
+
+    def attach(self, engine: ColorCycleEngine) -> None:
+        self.detach()
+        self._engine = engine
+        engine.add_event_hook(self._on_event)
+        self._write_keyframe(engine.now())
+
+    def detach(self) -> None:
+        if self._engine is not None:
+            self._engine.remove_event_hook(self._on_event)
+            self._engine = None
+
+    def snapshot(self) -> bytes:
+        """Return the recorded records, oldest first."""
+        size = self._count * RECORD_SIZE
+        if self._count < self._capacity:
+            return bytes(self._buffer[:size])
+        split = self._next * RECORD_SIZE
+        return bytes(self._buffer[split:]) + bytes(self._buffer[:split])
+
+    def save(self, path: Path) -> None:
+        header = _FILE_HEADER.pack(SESSION_MAGIC, RECORD_SIZE, self._count, self.overwritten)
+        Path(path).write_bytes(header + self.snapshot())
+
+    def _append(self, timestamp: float, kind: RecordKind, payload: bytes = b"") -> None:
+        _RECORD.pack_into(self._buffer, self._next * RECORD_SIZE, timestamp, kind, payload)
+        self._next = (self._next + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+        else:
+            self.overwritten += 1
+
+    def _append_text(self, timestamp: float, kind: RecordKind, text: str) -> None:
+        data = text.encode("utf-8")[:0xFFFF]
+        self._append(timestamp, kind, _TEXT_HEAD.pack(len(data), data[:14]))
+        for offset in range(14, len(data), 16):
+            self._append(timestamp, RecordKind.TEXT_MORE, data[offset : offset + 16])
+
+    def _write_keyframe(self, timestamp: float) -> None:
+        state = self._engine.capture_state()
+        last_tick = state["last_tick_s"]
+        self._append(
+            timestamp,
+            RecordKind.KEY_STATE,
+            _KEY_STATE.pack(
+                state["cycle_duration_s"],
+                state["saturation_pct"],
+                state["brightness_pct"],
+                STATE_CODES[state["state"]],
+                -1 if state["bounded_direction"] < 0 else 1,
+                state["random_start_hue"],
+                last_tick is not None,
+            ),
+        )
+        self._append(timestamp, RecordKind.KEY_HUE, _DOUBLE_PAIR.pack(state["hue_deg"], last_tick or 0.0))
+        self._append(timestamp, RecordKind.KEY_RANGE, _DOUBLE_PAIR.pack(state["hue_min_deg"], state["hue_max_deg"]))
+        self._append(timestamp, RecordKind.KEY_GENERATOR, _DOUBLE.pack(self._engine.generator_time_s))
+        self._append_text(timestamp, RecordKind.GENERATOR, self._engine.generator_name or "")
+        self._last_keyframe_s = timestamp
+
+    def _append_hue(self, timestamp: float) -> None:
+        state = self._engine.capture_state()
+        self._append(timestamp, RecordKind.HUE, _DOUBLE_PAIR.pack(state["hue_deg"], state["bounded_direction"]))
+
+    def _on_event(self, kind: str, *args: object) -> None:
+        engine = self._engine
+        now = engine.now()
+        if kind == "tick":
+            color = engine.current_color
+            self._append(args[0], RecordKind.TICK, _TICK.pack(color.red(), color.green(), color.blue()))
+            now = args[0]
+        elif kind == "start":
+            self._append(now, RecordKind.START)
+            self._append_hue(now)
+        elif kind == "pause":
+            self._append(now, RecordKind.PAUSE)
+        elif kind == "resume":
+            self._append(now, RecordKind.RESUME)
+        elif kind == "stop":
+            self._append(now, RecordKind.STOP)
+        elif kind in ("preset", "preset_in_place"):
+            config: PresetConfig = args[0]
+            record_kind = RecordKind.PRESET if kind == "preset" else RecordKind.PRESET_IN_PLACE
+            self._append(
+                now,
+                record_kind,
+                _PRESET.pack(
+                    config.cycle_duration_s,
+                    int(clamp(config.saturation_pct, 0, 100)),
+                    int(clamp(config.brightness_pct, 0, 100)),
+                    config.random_start_hue,
+                ),
+            )
+            self._append(now, RecordKind.RANGE, _DOUBLE_PAIR.pack(config.hue_min_deg, config.hue_max_deg))
+            self._append_text(now, RecordKind.PRESET_ID, preset_key(config.preset_id))
+            self._append_text(now, RecordKind.GENERATOR, config.generator or "")
+            self._append_hue(now)
+        elif kind == "cycle_duration":
+            self._append(now, RecordKind.CYCLE_DURATION, _DOUBLE.pack(args[0]))
+        elif kind == "saturation":
+            self._append(now, RecordKind.SATURATION, _SHORT.pack(args[0]))
+        elif kind == "brightness":
+            self._append(now, RecordKind.BRIGHTNESS, _SHORT.pack(args[0]))
+        elif kind == "random_start":
+            self._append(now, RecordKind.RANDOM_START, _BOOL.pack(args[0]))
+        elif kind == "language":
+            self._append_text(now, RecordKind.LANGUAGE, args[0])
+        elif kind == "hue_name":
+            self._append_text(now, RecordKind.NAME_HEX, args[0])
+            self._append_text(now, RecordKind.NAME_TEXT, args[1])
+        elif kind in ("restore", "history_jump"):
+            self._write_keyframe(now)
+            return
+
+        if self._last_keyframe_s is None or now - self._last_keyframe_s >= self._keyframe_interval_s:
+            self._write_keyframe(now)
+
+
+def load_session(path: Path) -> bytes:
+    data = Path(path).read_bytes()
+    if len(data) < _FILE_HEADER.size:
+        raise ValueError(f"{path}: session file is truncated")
+    magic, record_size, count, _overwritten = _FILE_HEADER.unpack_from(data)
+    if magic != SESSION_MAGIC or record_size != RECORD_SIZE:
+        raise ValueError(f"{path}: not an AmbiColor session recording")
+    records = data[_FILE_HEADER.size :]
+    if len(records) != count * RECORD_SIZE:
+        raise ValueError(f"{path}: session file is truncated")
+    return records
+
+
+def iter_records(records: bytes) -> Iterator[tuple[float, RecordKind, bytes]]:
+    for timestamp, kind, payload in _RECORD.iter_unpack(records):
+        yield timestamp, RecordKind(kind), payload
+
+
+@dataclass(slots=True, frozen=True)
+class ReplayFrame:
+    timestamp_s: float
+    rgb: tuple[int, int, int]
+    recorded_rgb: tuple[int, int, int]
+
+
+def _preset_from(payload: bytes, hue_range: bytes, preset_id: str, generator: str) -> PresetConfig:
+    duration, saturation, brightness, random_start = _PRESET.unpack_from(payload)
+    hue_min, hue_max = _DOUBLE_PAIR.unpack_from(hue_range)
+    return PresetConfig(
+        preset_id=preset_id,
+        label_key=preset_id,
+        description_key="",
+        cycle_duration_s=duration,
+        saturation_pct=saturation,
+        brightness_pct=brightness,
+        random_start_hue=random_start,
+        hue_min_deg=hue_min,
+        hue_max_deg=hue_max,
+        implemented=True,
+        generator=generator or None,
+    )
+
+
+def _read_text(first: bytes, pending: Iterator[tuple[float, RecordKind, bytes]]) -> str:
+    length, head = _TEXT_HEAD.unpack_from(first)
+    data = bytearray(head[:length])
+    while len(data) < length:
+        _timestamp, kind, payload = next(pending)
+        if kind != RecordKind.TEXT_MORE:
+            raise ValueError("text record is missing its continuation")
+        data += payload[: length - len(data)]
+    return data.decode("utf-8")
+
+
+def replay_session(records: bytes) -> Iterator[ReplayFrame]:
+    """Replay recorded records against a headless engine on a virtual clock.
+
+    Yields one frame per recorded tick with the replayed and the recorded
+    color. Records before the first complete keyframe (the part of a group
+    cut off by ring overwrite) are skipped.
+    """
+    clock = ManualClock()
+    engine = ColorCycleEngine(clock=clock.now, rng=random.Random(0))
+    engine.set_render_suspended(True)
+    pending = iter_records(records)
+    started = False
+    try:
+        for timestamp, kind, payload in pending:
+            clock.value = timestamp
+            if kind == RecordKind.KEY_STATE:
+                duration, saturation, brightness, state_code, direction, random_start, has_tick = _KEY_STATE.unpack_from(
+                    payload
+                )
+                _ts, hue_kind, hue_payload = next(pending)
+                _ts, range_kind, range_payload = next(pending)
+                _ts, key_generator_kind, key_generator_payload = next(pending)
+                _ts, generator_kind, generator_payload = next(pending)
+                if (
+                    hue_kind != RecordKind.KEY_HUE
+                    or range_kind != RecordKind.KEY_RANGE
+                    or key_generator_kind != RecordKind.KEY_GENERATOR
+                    or generator_kind != RecordKind.GENERATOR
+                ):
+                    raise ValueError("incomplete keyframe in session recording")
+                generator = _read_text(generator_payload, pending)
+                hue, last_tick = _DOUBLE_PAIR.unpack_from(hue_payload)
+                hue_min, hue_max = _DOUBLE_PAIR.unpack_from(range_payload)
+                engine.restore_state(
+                    {
+                        "state": _STATES_BY_CODE[state_code],
+                        "cycle_duration_s": duration,
+                        "saturation_pct": saturation,
+                        "brightness_pct": brightness,
+                        "random_start_hue": random_start,
+                        "hue_min_deg": hue_min,
+                        "hue_max_deg": hue_max,
+                        "hue_deg": hue,
+                        "bounded_direction": direction,
+                        "last_tick_s": last_tick if has_tick else None,
+                    }
+                )
+                # A history jump drops the plugin and a tail cut by ring
+                # overwrite may start inside a generator preset.
+                engine.restore_generator(generator or None, _DOUBLE.unpack_from(key_generator_payload)[0])
+                started = True
+                continue
+            if not started:
+                continue
+
+            if kind == RecordKind.TICK:
+                engine._on_timer_tick()
+                color = engine.current_color
+                yield ReplayFrame(timestamp, (color.red(), color.green(), color.blue()), _TICK.unpack_from(payload))
+            elif kind == RecordKind.START:
+                engine.start()
+            elif kind == RecordKind.PAUSE:
+                engine.pause()
+            elif kind == RecordKind.RESUME:
+                engine.resume()
+            elif kind == RecordKind.STOP:
+                engine.stop_standstill()
+            elif kind == RecordKind.HUE:
+                hue, direction = _DOUBLE_PAIR.unpack_from(payload)
+                state = engine.capture_state()
+                state["hue_deg"] = hue
+                state["bounded_direction"] = direction
+                engine.restore_state(state)
+            elif kind in (RecordKind.PRESET, RecordKind.PRESET_IN_PLACE):
+                _ts, _range_kind, range_payload = next(pending)
+                _ts, _id_kind, id_payload = next(pending)
+                preset_id = _read_text(id_payload, pending)
+                _ts, _generator_kind, generator_payload = next(pending)
+                config = _preset_from(payload, range_payload, preset_id, _read_text(generator_payload, pending))
+                if kind == RecordKind.PRESET:
+                    engine.apply_preset(config)
+                else:
+                    engine.update_preset_in_place(config)
+            elif kind == RecordKind.CYCLE_DURATION:
+                engine.set_cycle_duration(_DOUBLE.unpack_from(payload)[0])
+            elif kind == RecordKind.SATURATION:
+                engine.set_saturation(_SHORT.unpack_from(payload)[0])
+            elif kind == RecordKind.BRIGHTNESS:
+                engine.set_brightness(_SHORT.unpack_from(payload)[0])
+            elif kind == RecordKind.RANDOM_START:
+                engine.set_random_start_hue(_BOOL.unpack_from(payload)[0])
+            elif kind == RecordKind.LANGUAGE:
+                engine.set_language(_read_text(payload, pending))
+            elif kind == RecordKind.NAME_HEX:
+                hex_color = _read_text(payload, pending)
+                _ts, _name_kind, name_payload = next(pending)
+                engine.set_hue_name(hex_color, _read_text(name_payload, pending))
+    except StopIteration:
+        # The newest group was cut short by the end of the recording.
+        return
+    finally:
+        engine.stop_standstill()
+        engine.deleteLater()
+
+
+def session_frames(records: bytes, *, fps: float) -> Iterator[tuple[int, int, int]]:
+    """Resample the replayed ticks to a constant frame rate for export."""
+    frame_interval = 1.0 / fps
+    next_time: float | None = None
+    current: tuple[int, int, int] | None = None
+    for frame in replay_session(records):
+        if next_time is None:
+            next_time = frame.timestamp_s
+        while current is not None and next_time < frame.timestamp_s:
+            yield current
+            next_time += frame_interval
+        current = frame.rgb
+    if current is not None:
+        yield current
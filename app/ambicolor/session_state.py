@@ -0,0 +1,203 @@
+"""Persist the running session across restarts and crashes.
+
+The active preset, parameters, playback state, hue phase and fullscreen
+mode are saved as a small JSON file after every change (debounced, so a
+slider drag causes one write) and restored before the first frame is
+painted. A running cycle continues as if it had kept running while the
+application was down.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QStandardPaths, QTimer
+
+from .engine import ColorCycleEngine
+from .generators import register_plugin_presets
+from .models import PlaybackState, preset_key
+from .preset_registry import PresetRegistry
+
+STATE_VERSION = 1
+STATE_FILE_NAME = "session.json"
+DEFAULT_DEBOUNCE_MS = 750
+
+
+def default_state_path() -> Path:
+    location = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppLocalDataLocation)
+    return Path(location or Path.home() / ".ambicolor") / STATE_FILE_NAME
+
+
+class SessionStateFile:
+    """A JSON state file replaced atomically on every write.
+
+    The new state is written to a temporary file in the same directory,
+    flushed to disk and renamed over the old one, so a crash or power cut
+    leaves either the old or the new state, never a torn file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self) -> dict | None:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+            return None
+        return data
+
+    def write(self, state: dict) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self._path.with_name(f".{self._path.name}.{os.getpid()}.tmp")
+        with temporary.open("w", encoding="utf-8") as handle:
+            json.dump(state, handle, separators=(",", ":"))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self._path)
+        if os.name == "posix":
+            # Make the rename itself durable.
+            directory = os.open(self._path.parent, os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+
+def capture_session(
+    engine: ColorCycleEngine, *, fullscreen: bool = False, wall_clock: Callable[[], float] | None = None
+) -> dict:
+    now_wall = (wall_clock or time.time)()
+    state = engine.capture_state()
+    last_tick = state.pop("last_tick_s")
+    # The hue belongs to the last tick; keep the wall-clock time of that
+    # tick so a restore can integrate exactly the time since.
+    hue_at = now_wall if last_tick is None else now_wall - max(0.0, engine.now() - last_tick)
+    return {
+        "version": STATE_VERSION,
+        "saved_at": now_wall,
+        "hue_at": hue_at,
+        "preset": preset_key(engine.active_preset.preset_id),
+        "engine": state,
+        "fullscreen": fullscreen,
+    }
+
+
+def restore_session(
+    engine: ColorCycleEngine,
+    presets: PresetRegistry,
+    data: dict,
+    *,
+    wall_clock: Callable[[], float] | None = None,
+) -> float:
+    """Restore a state from capture_session(); returns the seconds of
+    downtime that were played forward."""
+    key = data.get("preset")
+    if isinstance(key, str):
+        if key not in presets:
+            # Plugin presets are normally listed after the first frame.
+            register_plugin_presets(presets)
+        try:
+            engine.apply_preset(presets.get(key))
+        except ValueError:
+            # The preset (or its generator plugin) is gone; the saved
+            # parameters below still apply on top of the default preset.
+            pass
+
+    state = dict(data["engine"])
+    elapsed_s = 0.0
+    if state["state"] == PlaybackState.RUNNING.value:
+        # A wall clock set back while the machine was down counts as no time.
+        elapsed_s = max(0.0, (wall_clock or time.time)() - float(data.get("hue_at", data["saved_at"])))
+        state["last_tick_s"] = engine.now() - elapsed_s
+    else:
+        state["last_tick_s"] = None
+    engine.restore_state(state)
+    if elapsed_s:
+        engine.catch_up()
+    return elapsed_s
+
+
+class SessionStatePersister(QObject):
+    """Saves the session whenever the engine or the window changes.
+
+    Changes restart a debounce timer; when it fires, the state is captured
+    on the GUI thread (a few fields) and written by a background thread.
+    Ticks alone do not trigger writes: the hue phase of a running cycle is
+    recomputed from the saved time on restore.
+    """
+
+    def __init__(
+        self,
+        engine: ColorCycleEngine,
+        state_file: SessionStateFile,
+        *,
+        fullscreen: Callable[[], bool] | None = None,
+        debounce_ms: int = DEFAULT_DEBOUNCE_MS,
+        wall_clock: Callable[[], float] | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._engine = engine
+        self._file = state_file
+        self._fullscreen = fullscreen or (lambda: False)
+        self._wall_clock = wall_clock or time.time
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self.save_now)
+        self._executor: ThreadPoolExecutor | None = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ambicolor-session-state"
+        )
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.write_errors = 0
+        engine.add_event_hook(self._on_event)
+
+    @property
+    def save_pending(self) -> bool:
+        return self._debounce.isActive()
+
+    def schedule(self) -> None:
+        self._debounce.start()
+
+    def save_now(self) -> None:
+        self._debounce.stop()
+        if self._executor is None:
+            return
+        state = capture_session(self._engine, fullscreen=self._fullscreen(), wall_clock=self._wall_clock)
+        self._executor.submit(self._write, state)
+
+    def close(self) -> None:
+        """Write any pending change and wait for the writer; call on exit."""
+        if self._executor is None:
+            return
+        self._engine.remove_event_hook(self._on_event)
+        self.save_now()
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    def _on_event(self, kind: str, *args: object) -> None:
+        if kind != "tick":
+            self.schedule()
+
+    def _write(self, state: dict) -> None:
+        try:
+            self._file.write(state)
+        except OSError:
+            with self._lock:
+                self.write_errors += 1
+            return
+        with self._lock:
+            self.writes += 1
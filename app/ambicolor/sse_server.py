@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from collections.abc import Callable
+
+from PySide6.QtGui import QColor
+
+from .engine import ColorCycleEngine
+
+_RESPONSE_HEADERS = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/event-stream\r\n"
+    b"Cache-Control: no-cache\r\n"
+    b"Connection: keep-alive\r\n"
+    b"Access-Control-Allow-Origin: *\r\n"
+    b"\r\n"
+)
+
+_MIRROR_PAGE = b"""<!doctype html>
+<html lang="en"><head><meta charset="utf-8"><title>AmbiColor</title>
+<meta name="viewport" content="width=device-width, initial-scale=1"></head>
+<body style="margin:0;height:100vh;background:#000">
+<p id="name" role="status" aria-live="polite"
+   style="position:fixed;bottom:1em;left:1em;color:#fff;font:1.2em sans-serif"></p>
+<script>
+const source = new EventSource("/events");
+source.addEventListener("color", (e) => {
+  const c = JSON.parse(e.data);
+  document.body.style.background = c.hex;
+  document.getElementById("name").textContent = c.name;
+});
+</script></body></html>
+"""
+
+
+class _Subscriber:
+    """Bounded per-client queue of pre-encoded SSE chunks.
+
+    When the queue is full the backlog collapses to the latest chunk of each
+    event kind, so a slow client skips intermediate values instead of
+    holding the server's memory or delaying other clients.
+    """
+
+    __slots__ = ("_chunks", "_max_chunks", "wake", "dropped", "disconnected")
+
+    def __init__(self, max_chunks: int) -> None:
+        self._chunks: deque[tuple[str, bytes]] = deque()
+        self._max_chunks = max_chunks
+        self.wake = asyncio.Event()
+        self.dropped = 0
+        self.disconnected = False
+
+    def push(self, kind: str, chunk: bytes) -> None:
+        if len(self._chunks) >= self._max_chunks:
+            latest: dict[str, bytes] = {}
+            for queued_kind, queued_chunk in self._chunks:
+                latest[queued_kind] = queued_chunk
+            self.dropped += len(self._chunks) - len(latest)
+            self._chunks.clear()
+            self._chunks.extend(latest.items())
+        self._chunks.append((kind, chunk))
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._chunks)
+
+    def take_all(self) -> list[bytes]:
+        chunks = [chunk for _kind, chunk in self._chunks]
+        self._chunks.clear()
+        self.wake.clear()
+        return chunks
+
+
+class ColorEventBroadcaster:
+    """Streams engine color/state/params changes as Server-Sent Events.
+
+    Every event is serialized once and the same bytes object is queued for
+    all subscribers. Engine signals and the asyncio loop (QtAsyncioBridge)
+    share the GUI thread; call_soon_threadsafe is used only because it
+    writes the loop's self-pipe and so wakes the bridge's socket notifier.
+    """
+
+    def __init__(
+        self,
+        engine: ColorCycleEngine,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        max_queue: int = 16,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        self._engine = engine
+        self._host = host
+        self._port = port
+        self._max_queue = max_queue
+        self._clock = clock or time.time
+        self._subscribers: set[_Subscriber] = set()
+        self._latest: dict[str, bytes] = {}
+        self._server: asyncio.AbstractServer | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake_pending = False
+        self._closing = False
+        self._holding_engine = False
+        self.events_published = 0
+
+        engine.color_changed.connect(self._on_color_changed)
+        engine.state_changed.connect(self._on_state_changed)
+        engine.params_changed.connect(self._on_params_changed)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def dropped_events(self) -> int:
+        return sum(subscriber.dropped for subscriber in self._subscribers)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        if self._server is None:
+            raise RuntimeError("event stream server is not running")
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_client, host=self._host, port=self._port)
+
+    async def close(self) -> None:
+        self._engine.color_changed.disconnect(self._on_color_changed)
+        self._engine.state_changed.disconnect(self._on_state_changed)
+        self._engine.params_changed.disconnect(self._on_params_changed)
+        if self._server is None:
+            return
+        self._closing = True
+        self._server.close()
+        for subscriber in list(self._subscribers):
+            subscriber.wake.set()
+        self._subscribers.clear()
+        self._update_engine_hold()
+        await self._server.wait_closed()
+        self._server = None
+
+    def publish(self, kind: str, payload: dict) -> None:
+        payload["ts"] = self._clock()
+        data = json.dumps(payload, separators=(",", ":"))
+        chunk = f"event: {kind}\ndata: {data}\n\n".encode("utf-8")
+        self._latest[kind] = chunk
+        self.events_published += 1
+        for subscriber in self._subscribers:
+            subscriber.push(kind, chunk)
+        self._schedule_wake()
+
+    def _on_color_changed(self, _color: QColor, hex_color: str, display_name: str) -> None:
+        self.publish("color", {"hex": hex_color, "name": display_name})
+
+    def _on_state_changed(self, text: str) -> None:
+        self.publish("state", {"state": self._engine.state.value, "text": text})
+
+    def _on_params_changed(self, snapshot: dict) -> None:
+        self.publish("params", dict(snapshot))
+
+    def _update_engine_hold(self) -> None:
+        # Dashboards keep receiving colors while the window is minimized or
+        # covered, but only while someone is watching.
+        wanted = self._server is not None and not self._closing and bool(self._subscribers)
+        if wanted == self._holding_engine:
+            return
+        self._holding_engine = wanted
+        if wanted:
+            self._engine.hold_awake()
+        else:
+            self._engine.release_awake()
+
+    def _schedule_wake(self) -> None:
+        # Waking the loop once per event is enough: one callback sets every
+        # subscriber's Event inside the loop.
+        if self._loop is None or self._wake_pending or self._loop.is_closed():
+            return
+        self._wake_pending = True
+        self._loop.call_soon_threadsafe(self._wake_subscribers)
+
+    def _wake_subscribers(self) -> None:
+        self._wake_pending = False
+        for subscriber in self._subscribers:
+            if subscriber.has_pending:
+                subscriber.wake.set()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        subscriber: _Subscriber | None = None
+        watcher: asyncio.Task | None = None
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+            parts = request_line.split()
+            path = (parts[1] if len(parts) >= 2 else b"/").split(b"?", 1)[0]
+            if path == b"/":
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                    + f"Content-Length: {len(_MIRROR_PAGE)}\r\nConnection: close\r\n\r\n".encode()
+                    + _MIRROR_PAGE
+                )
+                await writer.drain()
+                return
+            if path != b"/events":
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                return
+
+            subscriber = _Subscriber(self._max_queue)
+            for kind, chunk in self._latest.items():
+                subscriber.push(kind, chunk)
+            subscriber.wake.set()
+            self._subscribers.add(subscriber)
+            self._update_engine_hold()
+            writer.write(_RESPONSE_HEADERS)
+            watcher = asyncio.create_task(self._watch_disconnect(reader, subscriber))
+            while not self._closing and not subscriber.disconnected:
+                await subscriber.wake.wait()
+                chunks = subscriber.take_all()
+                if chunks:
+                    writer.writelines(chunks)
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            if subscriber is not None:
+                self._subscribers.discard(subscriber)
+                self._update_engine_hold()
+            writer.close()
+
+    @staticmethod
+    async def _watch_disconnect(reader: asyncio.StreamReader, subscriber: _Subscriber) -> None:
+        # Clients send nothing after the request, so EOF (or a reset) means
+        # they left; without it an idle stream would never notice and the
+        # subscriber would hold the engine awake for good.
+        try:
+            while await reader.read(4096):
+                pass
+        except ConnectionError:
+            pass
+        subscriber.disconnected = True
+        subscriber.wake.set()
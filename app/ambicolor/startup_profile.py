@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import importlib
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import ModuleType
+
+
+@dataclass(slots=True, frozen=True)
+class StartupPhase:
+    name: str
+    # Seconds since the profile's origin.
+    start_s: float
+    duration_s: float
+    # Modules newly loaded while the phase ran.
+    modules_loaded: int = 0
+
+
+class StartupProfile:
+    """Wall-clock breakdown of application startup.
+
+    Phases are timed with phase() or import_module(); milestones such as
+    the first paint are recorded with mark() as zero-length phases.
+    """
+
+    def __init__(self, *, origin_s: float | None = None, clock: Callable[[], float] | None = None) -> None:
+        self._clock = clock or time.perf_counter
+        self._origin_s = self._clock() if origin_s is None else origin_s
+        self._phases: list[StartupPhase] = []
+
+    @property
+    def phases(self) -> list[StartupPhase]:
+        return list(self._phases)
+
+    def elapsed_s(self) -> float:
+        return self._clock() - self._origin_s
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        modules_before = len(sys.modules)
+        started = self._clock()
+        try:
+            yield
+        finally:
+            ended = self._clock()
+            self._phases.append(
+                StartupPhase(
+                    name=name,
+                    start_s=started - self._origin_s,
+                    duration_s=ended - started,
+                    modules_loaded=max(0, len(sys.modules) - modules_before),
+                )
+            )
+
+    def import_module(self, name: str) -> ModuleType:
+        with self.phase(f"import {name}"):
+            return importlib.import_module(name)
+
+    def add(self, name: str, duration_s: float) -> None:
+        # A phase timed elsewhere that ended just now.
+        ended = self.elapsed_s()
+        self._phases.append(StartupPhase(name=name, start_s=ended - duration_s, duration_s=duration_s))
+
+    def mark(self, name: str) -> None:
+        self._phases.append(StartupPhase(name=name, start_s=self.elapsed_s(), duration_s=0.0))
+
+    def report(self) -> str:
+        lines = ["Startup profile (ms since launch):", f"  {'at':>8}  {'took':>8}  phase"]
+        for phase in sorted(self._phases, key=lambda item: item.start_s):
+            took = f"{phase.duration_s * 1000.0:8.1f}" if phase.duration_s else f"{'-':>8}"
+            modules = f" (+{phase.modules_loaded} modules)" if phase.modules_loaded else ""
+            lines.append(f"  {phase.start_s * 1000.0:8.1f}  {took}  {phase.name}{modules}")
+        return "\n".join(lines)
@@ -0,0 +1,368 @@
+"""Structured operational log for unattended installations.
+
+Events (state transitions, preset switches, tick overruns, naming, ...)
+are queued from the GUI thread without blocking and written by a
+background thread as gzip-compressed JSON lines. Query them with::
+
+    python -m ambicolor.telemetry LOG_DIR --since 2h --kind preset
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import re
+import sys
+import threading
+import time
+import zlib
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .engine import ColorCycleEngine
+from .models import PresetConfig, preset_key
+
+DEFAULT_CAPACITY = 4096
+DEFAULT_FLUSH_INTERVAL_S = 1.0
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+DEFAULT_MAX_FILES = 30
+# A tick arriving this many intervals after the previous one is an overrun.
+OVERRUN_FACTOR = 1.5
+
+_FILE_PREFIX = "telemetry-"
+_FILE_SUFFIX = ".jsonl.gz"
+# File names carry the UTC time of their first event, so name order is
+# time order and a query can skip whole files.
+_FILE_TIME_FORMAT = "%Y%m%dT%H%M%S%fZ"
+_STATE_ACTIONS = ("start", "pause", "resume", "stop")
+
+
+@dataclass(slots=True, frozen=True)
+class TelemetryStats:
+    queued: int
+    written: int
+    dropped: int
+    files: int
+    write_errors: int
+
+
+def _file_name(timestamp: float) -> str:
+    stamp = datetime.fromtimestamp(timestamp, timezone.utc).strftime(_FILE_TIME_FORMAT)
+    return f"{_FILE_PREFIX}{stamp}{_FILE_SUFFIX}"
+
+
+def _file_start(path: Path) -> float | None:
+    stamp = path.name[len(_FILE_PREFIX) : -len(_FILE_SUFFIX)]
+    try:
+        return datetime.strptime(stamp, _FILE_TIME_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+
+def log_files(directory: Path) -> list[Path]:
+    return sorted(path for path in Path(directory).glob(f"{_FILE_PREFIX}*{_FILE_SUFFIX}") if _file_start(path) is not None)
+
+
+class TelemetryLog:
+    """Bounded, non-blocking event log with a background gzip writer.
+
+    log() stores the event in a preallocated ring of ``capacity`` slots
+    and returns at once; when the ring is full the event is dropped and
+    counted, and the count is written as a "dropped" event with the next
+    batch. The writer drains the ring every ``flush_interval_s`` (or when
+    it is half full) and appends each batch as one gzip member, so a file
+    stays readable up to its last complete batch after a crash. Files are
+    rotated at ``max_file_bytes`` and only the newest ``max_files`` kept.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S,
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+        max_files: int = DEFAULT_MAX_FILES,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        if capacity < 2:
+            raise ValueError("telemetry capacity must be at least 2")
+        self._directory = Path(directory)
+        self._capacity = capacity
+        self._flush_interval_s = flush_interval_s
+        self._max_file_bytes = max_file_bytes
+        self._max_files = max(1, max_files)
+        self._clock = clock or time.time
+
+        self._times = array("d", bytes(8 * capacity))
+        self._kinds: list[str | None] = [None] * capacity
+        self._fields: list[dict | None] = [None] * capacity
+        self._head = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        # Serializes writes between the writer thread and flush().
+        self._write_lock = threading.Lock()
+
+        self._dropped = 0
+        self._dropped_reported = 0
+        self._written = 0
+        self._write_errors = 0
+        self._file: Path | None = None
+        self._thread: threading.Thread | None = None
+        self._running = False
+
+        self._engine: ColorCycleEngine | None = None
+        self._last_tick_s: float | None = None
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def log(self, kind: str, **fields: object) -> bool:
+        """Queue one event; returns False if it was dropped."""
+        timestamp = self._clock()
+        with self._lock:
+            if self._size == self._capacity:
+                self._dropped += 1
+                return False
+            slot = (self._head + self._size) % self._capacity
+            self._times[slot] = timestamp
+            self._kinds[slot] = kind
+            self._fields[slot] = fields or None
+            self._size += 1
+            wake = self._size * 2 >= self._capacity
+        if wake:
+            self._wake.set()
+        return True
+
+    def attach(self, engine: ColorCycleEngine) -> None:
+        self.detach()
+        self._engine = engine
+        self._last_tick_s = None
+        engine.add_event_hook(self._on_event)
+
+    def detach(self) -> None:
+        if self._engine is not None:
+            self._engine.remove_event_hook(self._on_event)
+            self._engine = None
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="ambicolor-telemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._running:
+            self._running = False
+            self._wake.set()
+            if self._thread is not None:
+                self._thread.join(timeout=2.0)
+                self._thread = None
+        self.flush()
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of events written."""
+        with self._write_lock:
+            return self._write_batch(self._drain())
+
+    def stats(self) -> TelemetryStats:
+        with self._lock:
+            queued = self._size
+        return TelemetryStats(
+            queued=queued,
+            written=self._written,
+            dropped=self._dropped,
+            files=len(log_files(self._directory)) if self._directory.is_dir() else 0,
+            write_errors=self._write_errors,
+        )
+
+    def _on_event(self, kind: str, *args: object) -> None:
+        if kind == "tick":
+            now = args[0]
+            last = self._last_tick_s
+            self._last_tick_s = now
+            # Read per tick: frame pacing changes the interval at runtime.
+            if last is not None and now - last > OVERRUN_FACTOR * self._engine.tick_interval_s:
+                self.log("tick_overrun", interval_ms=round(1000.0 * (now - last), 1))
+            return
+        engine = self._engine
+        if kind in _STATE_ACTIONS:
+            # The engine's tick clock restarts with every transition.
+            self._last_tick_s = None
+            self.log("state", action=kind, state=engine.state.value)
+        elif kind in ("preset", "preset_in_place"):
+            config: PresetConfig = args[0]
+            fields: dict[str, object] = {"preset": preset_key(config.preset_id)}
+            if kind == "preset_in_place":
+                fields["in_place"] = True
+            if config.generator:
+                fields["generator"] = config.generator
+            self.log("preset", **fields)
+        elif kind == "hue_name":
+            self.log("name", hex=args[0], name=args[1])
+        elif kind == "history_jump":
+            self.log("history_jump", seq=args[0])
+        elif kind == "restore":
+            self._last_tick_s = None
+            self.log("restore", state=engine.state.value)
+        elif kind == "render_suspended":
+            self._last_tick_s = None
+            self.log("render", suspended=args[0])
+
+    def _drain(self) -> list[tuple[float, str, dict | None]]:
+        with self._lock:
+            events = []
+            for offset in range(self._size):
+                slot = (self._head + offset) % self._capacity
+                events.append((self._times[slot], self._kinds[slot], self._fields[slot]))
+                self._kinds[slot] = None
+                self._fields[slot] = None
+            self._head = (self._head + self._size) % self._capacity
+            self._size = 0
+            dropped = self._dropped - self._dropped_reported
+            self._dropped_reported = self._dropped
+        if dropped:
+            events.append((self._clock(), "dropped", {"count": dropped}))
+        return events
+
+    def _write_batch(self, events: list[tuple[float, str, dict | None]]) -> int:
+        if not events:
+            return 0
+        lines = []
+        for timestamp, kind, fields in events:
+            record = {"t": round(timestamp, 6), "kind": kind}
+            if fields:
+                record.update(fields)
+            lines.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        data = gzip.compress(("\n".join(lines) + "\n").encode("utf-8"), compresslevel=6)
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            if self._file is None or not self._file.exists() or self._file.stat().st_size >= self._max_file_bytes:
+                self._file = self._directory / _file_name(events[0][0])
+                self._prune()
+            with self._file.open("ab") as handle:
+                handle.write(data)
+        except OSError:
+            # The log must never take the application down; the batch is lost.
+            self._write_errors += 1
+            return 0
+        self._written += len(events)
+        return len(events)
+
+    def _prune(self) -> None:
+        # Called before the new file is created, so keep one fewer.
+        files = log_files(self._directory)
+        for path in files[: max(0, len(files) - self._max_files + 1)]:
+            path.unlink(missing_ok=True)
+
+    def _run(self) -> None:
+        while self._running:
+            self._wake.wait(self._flush_interval_s)
+            self._wake.clear()
+            with self._write_lock:
+                self._write_batch(self._drain())
+
+
+def _read_file(path: Path) -> Iterator[dict]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+    except (EOFError, gzip.BadGzipFile, zlib.error, json.JSONDecodeError):
+        # A batch cut short by a crash ends the readable part of the file.
+        return
+
+
+def read_events(
+    directory: Path,
+    *,
+    since: float | None = None,
+    until: float | None = None,
+    kinds: Iterable[str] | None = None,
+) -> Iterator[dict]:
+    """Events with ``since <= t < until`` in time order, optionally of some kinds only."""
+    wanted = set(kinds) if kinds else None
+    files = log_files(directory)
+    for index, path in enumerate(files):
+        start = _file_start(path)
+        if until is not None and start >= until:
+            break
+        next_start = _file_start(files[index + 1]) if index + 1 < len(files) else None
+        if since is not None and next_start is not None and next_start <= since:
+            continue
+        for event in _read_file(path):
+            timestamp = event.get("t", 0.0)
+            # Wall-clock time may step back and the "dropped" count is
+            # stamped when written, so one event past ``until`` does not
+            # mean the rest of the file is.
+            if since is not None and timestamp < since:
+                continue
+            if until is not None and timestamp >= until:
+                continue
+            if wanted is None or event.get("kind") in wanted:
+                yield event
+
+
+_RELATIVE = re.compile(r"^(\d+(?:\.\d+)?)([smhd])$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_time(text: str, *, now: float | None = None) -> float:
+    """A Unix time from ISO 8601 (local time unless an offset is given) or
+    a duration ago such as ``90s``, ``15m``, ``2h`` or ``1d``."""
+    match = _RELATIVE.match(text.strip())
+    if match:
+        now = time.time() if now is None else now
+        return now - float(match.group(1)) * _UNITS[match.group(2)]
+    try:
+        moment = datetime.fromisoformat(text.strip())
+    except ValueError:
+        raise ValueError(f"invalid time {text!r}; use ISO 8601 or e.g. 30m, 2h, 1d") from None
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return moment.timestamp()
+
+
+def format_event(event: dict) -> str:
+    moment = datetime.fromtimestamp(event.get("t", 0.0)).isoformat(sep=" ", timespec="milliseconds")
+    details = " ".join(f"{key}={value}" for key, value in event.items() if key not in ("t", "kind"))
+    return f"{moment}  {event.get('kind', '?'):<14} {details}".rstrip()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ambicolor.telemetry", description="Query AmbiColor telemetry logs.")
+    parser.add_argument("directory", type=Path, help="directory passed to --telemetry-dir")
+    parser.add_argument("--since", help="ISO 8601 time or a duration ago (e.g. 2h)")
+    parser.add_argument("--until", help="ISO 8601 time or a duration ago")
+    parser.add_argument("--kind", action="append", default=[], help="only events of this kind (repeatable)")
+    parser.add_argument("--json", action="store_true", help="print raw JSON lines")
+    args = parser.parse_args(argv)
+
+    try:
+        since = parse_time(args.since) if args.since else None
+        until = parse_time(args.until) if args.until else None
+    except ValueError as exc:
+        parser.error(str(exc))
+    if not args.directory.is_dir():
+        print(f"No telemetry directory at {args.directory}", file=sys.stderr)
+        return 1
+    for event in read_events(args.directory, since=since, until=until, kinds=args.kind):
+        print(json.dumps(event, ensure_ascii=False) if args.json else format_event(event))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import random
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+
+from .hue_kernel import iter_hue_frames
+from .models import PresetConfig
+
+
+class ManualClock:
+    def __init__(self, start: float = 0.0) -> None:
+        self.value = start
+
+    def now(self) -> float:
+        return self.value
+
+
+@dataclass(slots=True, frozen=True)
+class Timeline:
+    fps: float
+    hues: array
+    # Packed RGB, three bytes per frame.
+    rgb: bytes
+
+    def __len__(self) -> int:
+        return len(self.hues)
+
+    def rgb_at(self, frame: int) -> tuple[int, int, int]:
+        offset = frame * 3
+        return self.rgb[offset], self.rgb[offset + 1], self.rgb[offset + 2]
+
+
+def with_overrides(
+    config: PresetConfig,
+    *,
+    cycle_duration_s: float | None = None,
+    saturation_pct: int | None = None,
+    brightness_pct: int | None = None,
+) -> PresetConfig:
+    changes: dict[str, object] = {}
+    if cycle_duration_s is not None:
+        changes["cycle_duration_s"] = cycle_duration_s
+    if saturation_pct is not None:
+        changes["saturation_pct"] = saturation_pct
+    if brightness_pct is not None:
+        changes["brightness_pct"] = brightness_pct
+    return replace(config, **changes) if changes else config
+
+
+def full_cycle_seconds(config: PresetConfig) -> float:
+    # A bounded range needs a full bounce (up and back) to show both edges.
+    span = (config.hue_max_deg - config.hue_min_deg) % 360.0 or 360.0
+    if span >= 360.0:
+        return config.cycle_duration_s
+    return max(config.cycle_duration_s, config.cycle_duration_s * 2.0 * span / 360.0)
+
+
+def default_frame_count(config: PresetConfig, fps: float) -> int:
+    return int(round(full_cycle_seconds(config) * fps)) + 1
+
+
+def iter_frames(
+    config: PresetConfig,
+    *,
+    fps: float = 30.0,
+    frame_count: int | None = None,
+    seed: int | None = 0,
+) -> Iterator[tuple[float, int, int, int]]:
+    """Yield (hue, r, g, b) per frame of the preset as the engine plays it.
+
+    Frame 0 is the color right after start(); frame i is the color after the
+    tick at ``i / fps`` seconds. With a fixed ``seed`` the random start hue
+    and therefore the whole sequence is reproducible. Frames are produced
+    lazily, so arbitrarily long sequences use constant memory. The hue
+    cycle is computed by the Qt-free kernel (ambicolor.hue_kernel); only
+    generator presets run a real engine.
+    """
+    if frame_count is None:
+        frame_count = default_frame_count(config, fps)
+    if config.generator:
+        return _iter_engine_frames(config, fps=fps, frame_count=frame_count, seed=seed)
+    return iter_hue_frames(config, fps=fps, frame_count=frame_count, seed=seed)
+
+
+def _iter_engine_frames(
+    config: PresetConfig,
+    *,
+    fps: float,
+    frame_count: int,
+    seed: int | None,
+) -> Iterator[tuple[float, int, int, int]]:
+    # Run a real engine against a manual clock. Imported here: batch renders
+    # of built-in presets never load PySide6.
+    from .engine import ColorCycleEngine
+
+    clock = ManualClock()
+    rng = random.Random(seed) if seed is not None else None
+    engine = ColorCycleEngine(clock=clock.now, rng=rng)
+    # Headless: keep the QTimer stopped, ticks are driven below.
+    engine.set_render_suspended(True)
+    engine.apply_preset(config)
+    engine.start()
+    tick = engine._on_timer_tick
+    try:
+        for frame in range(frame_count):
+            if frame:
+                clock.value = frame / fps
+                tick()
+            color = engine.current_color
+            yield engine.frame_params()[0], color.red(), color.green(), color.blue()
+    finally:
+        engine.stop_standstill()
+        engine.deleteLater()
+
+
+def render_into(
+    config: PresetConfig,
+    hues: memoryview,
+    rgb: memoryview,
+    *,
+    fps: float = 30.0,
+    frame_count: int,
+    seed: int | None = 0,
+) -> None:
+    # Writes frame i to hues[i] and rgb[3 * i : 3 * i + 3]; the views may be
+    # slices of larger buffers shared with other writers.
+    for frame, (hue, red, green, blue) in enumerate(iter_frames(config, fps=fps, frame_count=frame_count, seed=seed)):
+        hues[frame] = hue
+        offset = frame * 3
+        rgb[offset] = red
+        rgb[offset + 1] = green
+        rgb[offset + 2] = blue
+
+
+def render_timeline(
+    config: PresetConfig,
+    *,
+    fps: float = 30.0,
+    frame_count: int | None = None,
+    seed: int | None = 0,
+) -> Timeline:
+    if frame_count is None:
+        frame_count = default_frame_count(config, fps)
+    hues = array("d", bytes(8 * frame_count))
+    rgb = bytearray(3 * frame_count)
+    with memoryview(hues) as hue_view, memoryview(rgb) as rgb_view:
+        render_into(config, hue_view, rgb_view, fps=fps, frame_count=frame_count, seed=seed)
+    return Timeline(fps=fps, hues=hues, rgb=bytes(rgb))
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+from array import array
+from collections.abc import Callable
+from pathlib import Path
+
+from .models import PresetConfig
+from .preset_registry import config_digest
+from .timeline import Timeline, render_timeline
+
+TIMELINE_MAGIC = b"AMBITLC1"
+TIMELINE_SUFFIX = ".tlc"
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+# Cache hits only change last-use times; they are written at most this
+# often (and on close), so a busy cache does not rewrite the index per hit.
+INDEX_SAVE_INTERVAL_S = 30.0
+
+# magic, fps, frame count, hue table offset, rgb table offset, key digest;
+# padded to 64 bytes so the hue table is 8-byte aligned.
+_HEADER = struct.Struct("<8sdIII32s")
+_HEADER_SIZE = 64
+
+
+def timeline_key(config: PresetConfig, *, fps: float, frame_count: int, seed: int) -> str:
+    return hashlib.sha256(repr((config_digest(config), float(fps), frame_count, seed)).encode("utf-8")).hexdigest()
+
+
+class MappedTimeline:
+    """A rendered timeline read straight from a memory-mapped cache file.
+
+    Frames are looked up by slicing the mapping; nothing is decoded up
+    front, so opening a multi-hour timeline costs the same as a short one.
+    """
+
+    __slots__ = ("key", "fps", "_mmap", "_file", "_hues", "_rgb_offset", "_frames")
+
+    def __init__(self, path: Path, key: str) -> None:
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path}: empty timeline file") from None
+        try:
+            if len(self._mmap) < _HEADER_SIZE:
+                raise ValueError(f"{path}: truncated timeline file")
+            magic, fps, frames, hue_offset, rgb_offset, digest = _HEADER.unpack_from(self._mmap)
+            if magic != TIMELINE_MAGIC or digest != bytes.fromhex(key):
+                raise ValueError(f"{path}: not a timeline for key {key}")
+            if len(self._mmap) < rgb_offset + 3 * frames or hue_offset + 8 * frames > rgb_offset:
+                raise ValueError(f"{path}: timeline file is shorter than its header says")
+        except ValueError:
+            self._mmap.close()
+            self._file.close()
+            raise
+        self.key = key
+        self.fps = fps
+        self._frames = frames
+        self._hues = memoryview(self._mmap)[hue_offset : hue_offset + 8 * frames].cast("d")
+        self._rgb_offset = rgb_offset
+
+    def __len__(self) -> int:
+        return self._frames
+
+    def hue_at(self, frame: int) -> float:
+        return self._hues[frame]
+
+    def rgb_at(self, frame: int) -> tuple[int, int, int]:
+        offset = self._rgb_offset + frame * 3
+        return tuple(self._mmap[offset : offset + 3])
+
+    def close(self) -> None:
+        self._hues.release()
+        self._mmap.close()
+        self._file.close()
+
+
+def write_timeline_file(path: Path, key: str, timeline: Timeline) -> int:
+    frames = len(timeline)
+    hue_offset = _HEADER_SIZE
+    rgb_offset = hue_offset + 8 * frames
+    # Native byte order: the cache is machine-local and read via memoryview.
+    hues = array("d", timeline.hues)
+    header = _HEADER.pack(TIMELINE_MAGIC, timeline.fps, frames, hue_offset, rgb_offset, bytes.fromhex(key))
+    temp = path.with_suffix(".tmp")
+    with open(temp, "wb") as handle:
+        handle.write(header.ljust(_HEADER_SIZE, b"\0"))
+        handle.write(hues.tobytes())
+        handle.write(timeline.rgb)
+    os.replace(temp, path)
+    return rgb_offset + 3 * frames
+
+
+class TimelineCache:
+    """Rendered timelines on disk, keyed by (preset parameters, seed, fps, frames).
+
+    ``index.json`` records each file's size and last use; when the total
+    exceeds ``max_bytes`` the least recently used timelines are deleted.
+    Timelines that are currently open are never evicted. This is a library
+    API for tools and scripts; the app does not create a cache itself.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_bytes: int = 512 * 1024 * 1024,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._clock = clock or time.time
+        self._entries: dict[str, dict] = self._load_index()
+        self._open: dict[str, MappedTimeline] = {}
+        self._index_dirty = False
+        self._index_saved_at = self._clock()
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry["bytes"] for entry in self._entries.values())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def keys(self) -> list[str]:
+        return list(self._entries)
+
+    def get(self, key: str) -> MappedTimeline | None:
+        timeline = self._open.get(key)
+        if timeline is None:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            try:
+                timeline = MappedTimeline(self._directory / entry["file"], key)
+            except (OSError, ValueError):
+                self._discard(key)
+                self._save_index()
+                return None
+            self._open[key] = timeline
+        now = self._clock()
+        self._entries[key]["last_used"] = now
+        self._index_dirty = True
+        if now - self._index_saved_at >= INDEX_SAVE_INTERVAL_S:
+            self._save_index()
+        return timeline
+
+    def put(self, key: str, timeline: Timeline) -> MappedTimeline:
+        self.release(key)
+        name = f"{key}{TIMELINE_SUFFIX}"
+        size = write_timeline_file(self._directory / name, key, timeline)
+        self._entries[key] = {"file": name, "bytes": size, "last_used": self._clock()}
+        self._evict(keep=key)
+        self._save_index()
+        mapped = self.get(key)
+        assert mapped is not None
+        return mapped
+
+    def get_or_render(
+        self,
+        config: PresetConfig,
+        *,
+        fps: float = 30.0,
+        frame_count: int,
+        seed: int = 0,
+    ) -> MappedTimeline:
+        key = timeline_key(config, fps=fps, frame_count=frame_count, seed=seed)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        return self.put(key, render_timeline(config, fps=fps, frame_count=frame_count, seed=seed))
+
+    def release(self, key: str) -> None:
+        timeline = self._open.pop(key, None)
+        if timeline is not None:
+            timeline.close()
+
+    def close(self) -> None:
+        for key in list(self._open):
+            self.release(key)
+        if self._index_dirty:
+            self._save_index()
+
+    def _evict(self, *, keep: str) -> None:
+        total = self.total_bytes
+        for key in sorted(self._entries, key=lambda item: self._entries[item]["last_used"]):
+            if total <= self._max_bytes:
+                break
+            if key == keep or key in self._open:
+                continue
+            total -= self._entries[key]["bytes"]
+            self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        self.release(key)
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            try:
+                (self._directory / entry["file"]).unlink()
+            except OSError:
+                pass
+
+    def _load_index(self) -> dict[str, dict]:
+        try:
+            data = json.loads((self._directory / INDEX_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return {}
+        entries = data.get("entries", {})
+        return {
+            key: entry
+            for key, entry in entries.items()
+            if isinstance(entry, dict) and (self._directory / str(entry.get("file", ""))).is_file()
+        }
+
+    def _save_index(self) -> None:
+        self._index_dirty = False
+        self._index_saved_at = self._clock()
+        target = self._directory / INDEX_FILE
+        temp = target.with_suffix(".tmp")
+        try:
+            temp.write_text(json.dumps({"version": INDEX_VERSION, "entries": self._entries}), encoding="utf-8")
+            os.replace(temp, target)
+        except OSError:
+            pass
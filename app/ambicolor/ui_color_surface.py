@@ -1,20 +1,34 @@
 from __future__ import annotations
 
+from PySide6.QtCore import Signal
 from PySide6.QtGui import QColor, QPainter
 from PySide6.QtWidgets import QWidget
 
 
 class ColorSurface(QWidget):
+    first_painted = Signal()
+    painted = Signal()
+
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self._color = QColor("#000000")
+        self._painted = False
         self.setAutoFillBackground(False)
 
-    def set_color(self, color: QColor) -> None:
+    def set_color(self, color: QColor) -> bool:
+        """Show ``color``; returns whether a repaint was scheduled."""
+        if color.rgba() == self._color.rgba():
+            # Nothing new to show (e.g. a slow cycle between 8-bit steps).
+            return False
         self._color = QColor(color)
         self.update()
+        return True
 
     def paintEvent(self, event) -> None:  # type: ignore[override]
         painter = QPainter(self)
         painter.fillRect(self.rect(), self._color)
         super().paintEvent(event)
+        self.painted.emit()
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
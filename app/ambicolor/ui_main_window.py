@@ -1,63 +1,237 @@
 from __future__ import annotations
 
-from PySide6.QtCore import QSignalBlocker, Qt, QTimer
+import time
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QEvent, QObject, QSignalBlocker, Qt, QTimer, Signal
 from PySide6.QtGui import QKeySequence, QShortcut
 from PySide6.QtWidgets import QHBoxLayout, QMainWindow, QVBoxLayout, QWidget
 
 from .engine import ColorCycleEngine
+from .generators import GeneratorError
 from .i18n import tr
-from .models import PlaybackState, PresetConfig, preset_catalog
+from .models import PlaybackState, PresetConfig, preset_key
+from .preset_registry import PresetRegistry, default_registry
 from .ui_color_surface import ColorSurface
-from .ui_controls import ControlPanel
+from .ui_screen_surfaces import ScreenSurfaceSet
+
+if TYPE_CHECKING:
+    from .latency_trace import LatencyTracer
+    from .preset_preview import PresetPreviewer
+    from .preset_watcher import PresetHotReloader
+    from .telemetry import TelemetryLog
+    from .ui_controls import ControlPanel
 
 
 class MainWindow(QMainWindow):
-    def __init__(self, *, language: str = "en") -> None:
+    first_frame_painted = Signal()
+    controls_built = Signal()
+    fullscreen_changed = Signal(bool)
+
+    def __init__(
+        self,
+        *,
+        language: str = "en",
+        presets: PresetRegistry | None = None,
+        defer_controls: bool = False,
+    ) -> None:
         super().__init__()
         self._language = language
         self._initial_focus_done = False
         self._fullscreen_enabled = False
+        self._expose_filter_installed = False
+        self._controls: ControlPanel | None = None
+        self._preset_previews: PresetPreviewer | None = None
+        self._latency: LatencyTracer | None = None
+        self._telemetry: TelemetryLog | None = None
+        self.controls_build_s = 0.0
 
         self.setWindowTitle(tr(self._language, "app.title"))
         self._engine = ColorCycleEngine(language=self._language)
-        self._presets: list[PresetConfig] = preset_catalog()
+        self._preset_registry = presets or default_registry()
+        self._presets: list[PresetConfig] = self._preset_registry.presets()
+        self._screen_surfaces = ScreenSurfaceSet(self._engine, self)
+        self._engine.apply_preset(self._presets[0])
 
         self._surface = ColorSurface(self)
-        self.controls = ControlPanel(language=self._language, parent=self._surface)
-        self.controls.setFixedWidth(420)
+        self._surface.set_color(self._engine.current_color)
+        self.setCentralWidget(self._surface)
+        self._engine.color_changed.connect(self._on_color_changed)
+        self._engine.state_changed.connect(self._on_state_changed)
+        self._engine.generator_failed.connect(self._on_generator_failed)
+
+        self._fullscreen_shortcut = QShortcut(QKeySequence("F11"), self)
+        self._fullscreen_shortcut.activated.connect(self.toggle_fullscreen)
+        self._screen_surfaces_shortcut = QShortcut(QKeySequence("F10"), self)
+        self._screen_surfaces_shortcut.activated.connect(self.toggle_screen_surfaces)
+
+        # With defer_controls the color surface is painted first and the
+        # control panel (and its imports) is built right after that first
+        # frame, or earlier if something asks for self.controls.
+        self._surface.first_painted.connect(self._on_first_paint)
+        if not defer_controls:
+            self._build_controls()
+
+    @property
+    def engine(self) -> ColorCycleEngine:
+        return self._engine
+
+    @property
+    def preset_registry(self) -> PresetRegistry:
+        return self._preset_registry
+
+    @property
+    def controls(self) -> ControlPanel:
+        if self._controls is None:
+            self._build_controls()
+        return self._controls
+
+    @property
+    def controls_ready(self) -> bool:
+        return self._controls is not None
+
+    @property
+    def preset_previews(self) -> PresetPreviewer:
+        self.controls  # builds the panel and its previewer on first use
+        return self._preset_previews
+
+    @property
+    def fullscreen_enabled(self) -> bool:
+        return self._fullscreen_enabled
+
+    def show_initial(self, *, fullscreen: bool = False) -> None:
+        if fullscreen:
+            self._fullscreen_enabled = True
+            self.showFullScreen()
+        else:
+            self.showMaximized()
+
+    def enable_preset_hot_reload(self, directory: Path) -> PresetHotReloader:
+        from .preset_watcher import PresetHotReloader
+
+        self._preset_reloader = PresetHotReloader(self._preset_registry, directory, parent=self)
+        self._preset_reloader.presets_reloaded.connect(self._on_presets_reloaded)
+        self._preset_reloader.reload_failed.connect(
+            lambda message: self._update_status(note=tr(self._language, "status.preset_reload_failed", error=message))
+        )
+        return self._preset_reloader
+
+    def enable_latency_tracing(self, tracer: LatencyTracer | None = None) -> LatencyTracer:
+        from .latency_trace import LatencyTracer
+
+        if self._latency is None:
+            self._latency = tracer or LatencyTracer()
+            self._engine.add_event_hook(self._latency.engine_event)
+            self._surface.painted.connect(self._latency.painted)
+        return self._latency
+
+    @property
+    def latency_tracer(self) -> LatencyTracer | None:
+        return self._latency
+
+    def enable_telemetry(self, log: TelemetryLog) -> None:
+        self._telemetry = log
+        log.attach(self._engine)
+
+    def _log_event(self, kind: str, **fields: object) -> None:
+        if self._telemetry is not None:
+            self._telemetry.log(kind, **fields)
+
+    def _interaction(self, name: str) -> AbstractContextManager[None]:
+        if self._latency is None:
+            return nullcontext()
+        return self._latency.interaction(name)
+
+    def _on_first_paint(self) -> None:
+        self.first_frame_painted.emit()
+        if self._controls is None:
+            # Queued so the first frame reaches the screen before the build.
+            QTimer.singleShot(0, self._build_controls)
+
+    def _build_controls(self) -> None:
+        if self._controls is not None:
+            return
+        started = time.perf_counter()
+        from .ui_controls import ControlPanel
+
+        self._controls = ControlPanel(language=self._language, parent=self._surface)
+        self._controls.setFixedWidth(420)
 
         overlay = QVBoxLayout(self._surface)
         overlay.setContentsMargins(16, 16, 16, 16)
         top_row = QHBoxLayout()
-        top_row.addWidget(self.controls, alignment=Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        top_row.addWidget(self._controls, alignment=Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
         top_row.addStretch(1)
         overlay.addLayout(top_row)
         overlay.addStretch(1)
 
-        self.setCentralWidget(self._surface)
-        self.showMaximized()
-
-        self._fullscreen_shortcut = QShortcut(QKeySequence("F11"), self)
-        self._fullscreen_shortcut.activated.connect(self.toggle_fullscreen)
-
         self._setup_presets()
+        self._setup_preset_previews()
         self._connect_signals()
         self._set_tab_order()
         self._sync_controls_from_engine(self._engine.current_snapshot())
         self._refresh_playback_buttons(self._engine.state)
-        self._refresh_fullscreen_button()
+        self._controls.set_current_color_text(self._engine.current_display_name)
         self._update_status()
+        if self.isVisible():
+            self._controls.show()
+            self._initial_focus_done = True
+            QTimer.singleShot(0, self._controls.preset_combo.setFocus)
+        self.controls_build_s = time.perf_counter() - started
+        self.controls_built.emit()
 
     def _setup_presets(self) -> None:
+        # The engine already runs the default preset (or whatever was applied
+        # before the panel existed); only the panel is filled here. Generator
+        # plugins are listed from package metadata now, after the first frame,
+        # and imported only once selected.
+        from .generators import register_plugin_presets
+
+        register_plugin_presets(self._preset_registry)
+        self._presets = self._preset_registry.presets()
+        self._fill_preset_combo()
+        # Usually the first preset, unless a saved session was restored.
+        active_key = preset_key(self._engine.active_preset.preset_id)
+        default_index = max(self.controls.preset_combo.findData(active_key), 0)
+        self.controls.preset_combo.setCurrentIndex(default_index)
+        self._update_preset_description(self._presets[default_index])
+
+    def _setup_preset_previews(self) -> None:
+        from .preset_preview import PresetPreviewer
+
+        self._preset_previews = PresetPreviewer(self.controls.preset_combo, self._preset_at_row, parent=self)
+
+    def _preset_at_row(self, row: int) -> PresetConfig | None:
+        return self._presets[row] if 0 <= row < len(self._presets) else None
+
+    def _fill_preset_combo(self) -> None:
         self.controls.preset_combo.clear()
         for preset in self._presets:
-            self.controls.preset_combo.addItem(tr(self._language, preset.label_key), preset.preset_id.value)
-
-        default_index = 0
-        self.controls.preset_combo.setCurrentIndex(default_index)
-        default_preset = self._presets[default_index]
-        self._engine.apply_preset(default_preset)
-        self._update_preset_description(default_preset)
+            self.controls.preset_combo.addItem(tr(self._language, preset.label_key), preset_key(preset.preset_id))
+
+    def _on_presets_reloaded(self, changed_keys: list) -> None:
+        current_key = self.controls.preset_combo.currentData()
+        self._presets = self._preset_registry.presets()
+        with QSignalBlocker(self.controls.preset_combo):
+            self._fill_preset_combo()
+            index = self.controls.preset_combo.findData(current_key)
+            self.controls.preset_combo.setCurrentIndex(max(index, 0))
+        if self._preset_previews is not None:
+            self._preset_previews.refresh()
+
+        if index < 0:
+            # The selected preset's file was deleted: fall back like a user selection.
+            self._on_preset_changed(0)
+            return
+        if current_key in changed_keys:
+            preset = self._presets[index]
+            self._engine.update_preset_in_place(preset)
+            self._update_preset_description(preset)
+        self._log_event("presets_reloaded", presets=[str(key) for key in changed_keys])
+        names = ", ".join(str(key) for key in changed_keys)
+        self._update_status(note=tr(self._language, "status.presets_reloaded", names=names))
 
     def _connect_signals(self) -> None:
         self.controls.preset_combo.currentIndexChanged.connect(self._on_preset_changed)
@@ -82,8 +256,6 @@ class MainWindow(QMainWindow):
         self.controls.save_name_button.clicked.connect(self._save_color_name)
         self.controls.color_name_input.returnPressed.connect(self._save_color_name)
 
-        self._engine.color_changed.connect(self._on_color_changed)
-        self._engine.state_changed.connect(self._on_state_changed)
         self._engine.params_changed.connect(self._sync_controls_from_engine)
 
     def _set_tab_order(self) -> None:
@@ -110,8 +282,23 @@ class MainWindow(QMainWindow):
     def _on_preset_changed(self, index: int) -> None:
         if index < 0 or index >= len(self._presets):
             return
-        preset = self._presets[index]
-        self._engine.apply_preset(preset)
+        with self._interaction("preset"):
+            self._apply_selected_preset(self._presets[index])
+
+    def _on_generator_failed(self, name: str, error: str) -> None:
+        self._log_event("generator_failed", generator=name, error=error, dropped=True)
+        self._update_status(note=tr(self._language, "status.generator_dropped", error=error))
+
+    def _apply_selected_preset(self, preset: PresetConfig) -> None:
+        try:
+            self._engine.apply_preset(preset)
+        except GeneratorError as exc:
+            self._log_event("generator_failed", preset=preset_key(preset.preset_id), error=str(exc))
+            self._update_status(note=tr(self._language, "status.generator_failed", error=exc))
+            return
+        if preset.generator and self._preset_previews is not None:
+            # The plugin is loaded now, so its preview can be rendered.
+            self._preset_previews.refresh()
         self._update_preset_description(preset)
         if not preset.implemented:
             preset_name = tr(self._language, preset.label_key)
@@ -120,37 +307,43 @@ class MainWindow(QMainWindow):
         self._update_status()
 
     def _on_speed_slider_changed(self, value: int) -> None:
-        with QSignalBlocker(self.controls.speed_spin):
-            self.controls.speed_spin.setValue(float(value))
-        self._engine.set_cycle_duration(float(value))
+        with self._interaction("speed_slider"):
+            with QSignalBlocker(self.controls.speed_spin):
+                self.controls.speed_spin.setValue(float(value))
+            self._engine.set_cycle_duration(float(value))
 
     def _on_speed_spin_changed(self, value: float) -> None:
-        ivalue = int(round(value))
-        with QSignalBlocker(self.controls.speed_slider):
-            self.controls.speed_slider.setValue(ivalue)
-        self._engine.set_cycle_duration(float(ivalue))
+        with self._interaction("speed_spin"):
+            ivalue = int(round(value))
+            with QSignalBlocker(self.controls.speed_slider):
+                self.controls.speed_slider.setValue(ivalue)
+            self._engine.set_cycle_duration(float(ivalue))
 
     def _on_saturation_slider_changed(self, value: int) -> None:
-        with QSignalBlocker(self.controls.saturation_spin):
-            self.controls.saturation_spin.setValue(float(value))
-        self._engine.set_saturation(value)
+        with self._interaction("saturation_slider"):
+            with QSignalBlocker(self.controls.saturation_spin):
+                self.controls.saturation_spin.setValue(float(value))
+            self._engine.set_saturation(value)
 
     def _on_saturation_spin_changed(self, value: float) -> None:
-        ivalue = int(round(value))
-        with QSignalBlocker(self.controls.saturation_slider):
-            self.controls.saturation_slider.setValue(ivalue)
-        self._engine.set_saturation(ivalue)
+        with self._interaction("saturation_spin"):
+            ivalue = int(round(value))
+            with QSignalBlocker(self.controls.saturation_slider):
+                self.controls.saturation_slider.setValue(ivalue)
+            self._engine.set_saturation(ivalue)
 
     def _on_brightness_slider_changed(self, value: int) -> None:
-        with QSignalBlocker(self.controls.brightness_spin):
-            self.controls.brightness_spin.setValue(float(value))
-        self._engine.set_brightness(value)
+        with self._interaction("brightness_slider"):
+            with QSignalBlocker(self.controls.brightness_spin):
+                self.controls.brightness_spin.setValue(float(value))
+            self._engine.set_brightness(value)
 
     def _on_brightness_spin_changed(self, value: float) -> None:
-        ivalue = int(round(value))
-        with QSignalBlocker(self.controls.brightness_slider):
-            self.controls.brightness_slider.setValue(ivalue)
-        self._engine.set_brightness(ivalue)
+        with self._interaction("brightness_spin"):
+            ivalue = int(round(value))
+            with QSignalBlocker(self.controls.brightness_slider):
+                self.controls.brightness_slider.setValue(ivalue)
+            self._engine.set_brightness(ivalue)
 
     def _save_color_name(self) -> None:
         snapshot = self._engine.current_snapshot()
@@ -163,11 +356,16 @@ class MainWindow(QMainWindow):
         self._update_status(note=note)
 
     def _on_color_changed(self, color, _hex: str, display_name: str) -> None:
-        self._surface.set_color(color)
-        self.controls.set_current_color_text(display_name)
+        repaint = self._surface.set_color(color)
+        if self._latency is not None:
+            self._latency.color_changed(repaint)
+        if self._controls is not None:
+            self._controls.set_current_color_text(display_name)
 
     def _on_state_changed(self, text: str) -> None:
         del text
+        if self._controls is None:
+            return
         self._update_status()
         self._refresh_playback_buttons(self._engine.state)
 
@@ -217,28 +415,31 @@ class MainWindow(QMainWindow):
             self._update_status(note=tr(self._language, "status.ready"))
 
     def _on_random_start_toggled(self, checked: bool) -> None:
-        self._engine.set_random_start_hue(checked)
-        note_key = "status.random_start_on" if checked else "status.random_start_off"
-        self._update_status(note=tr(self._language, note_key))
-        self._focus_later(self.controls.random_start_checkbox)
+        with self._interaction("random_start"):
+            self._engine.set_random_start_hue(checked)
+            note_key = "status.random_start_on" if checked else "status.random_start_off"
+            self._update_status(note=tr(self._language, note_key))
+            self._focus_later(self.controls.random_start_checkbox)
 
     def _on_playback_clicked(self) -> None:
-        state = self._engine.state
-        if state == PlaybackState.STANDSTILL:
-            self._engine.start()
-        elif state == PlaybackState.RUNNING:
-            self._engine.pause()
-        else:
-            self._engine.resume()
-        self._focus_later(self.controls.playback_button)
+        with self._interaction("playback"):
+            state = self._engine.state
+            if state == PlaybackState.STANDSTILL:
+                self._engine.start()
+            elif state == PlaybackState.RUNNING:
+                self._engine.pause()
+            else:
+                self._engine.resume()
+            self._focus_later(self.controls.playback_button)
 
     def _on_stop_clicked(self) -> None:
-        previous_state = self._engine.state
-        self._engine.stop_standstill()
-        if self._engine.state == previous_state:
-            # Prevent visual toggle changes when stop does not cause a state transition.
-            self._refresh_playback_buttons(self._engine.state)
-        self._focus_later(self.controls.stop_button)
+        with self._interaction("stop"):
+            previous_state = self._engine.state
+            self._engine.stop_standstill()
+            if self._engine.state == previous_state:
+                # Prevent visual toggle changes when stop does not cause a state transition.
+                self._refresh_playback_buttons(self._engine.state)
+            self._focus_later(self.controls.stop_button)
 
     def _invoke_action(self, source_widget: QWidget, action) -> None:
         action()
@@ -249,6 +450,8 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(0, widget.setFocus)
 
     def _update_status(self, note: str | None = None) -> None:
+        if self._controls is None:
+            return
         playback_text = tr(self._language, f"state.{self._engine.state.value}")
         fullscreen_text = tr(self._language, "status.on" if self._fullscreen_enabled else "status.off")
         status_text = tr(
@@ -287,11 +490,64 @@ class MainWindow(QMainWindow):
             self._fullscreen_enabled = True
             self._update_status(note=tr(self._language, "status.fullscreen_on"))
 
+        self._log_event("fullscreen", on=self._fullscreen_enabled)
+        self.fullscreen_changed.emit(self._fullscreen_enabled)
         if focus_widget is not None:
             QTimer.singleShot(0, focus_widget.setFocus)
 
+    def toggle_screen_surfaces(self, hue_offsets: list[float] | None = None) -> None:
+        if self._screen_surfaces.is_open:
+            self._screen_surfaces.close()
+            self._update_render_suspension()
+            self._log_event("screen_surfaces", count=0)
+            self._update_status(note=tr(self._language, "status.screen_surfaces_off"))
+            return
+        self._screen_surfaces.open(hue_offsets=hue_offsets)
+        self._update_render_suspension()
+        count = len(self._screen_surfaces.surfaces)
+        self._log_event("screen_surfaces", count=count)
+        self._update_status(note=tr(self._language, "status.screen_surfaces_on", count=count))
+
+    def closeEvent(self, event) -> None:  # type: ignore[override]
+        self._screen_surfaces.close()
+        if self._preset_previews is not None:
+            self._preset_previews.close()
+        super().closeEvent(event)
+        self._update_render_suspension()
+
     def showEvent(self, event) -> None:  # type: ignore[override]
         super().showEvent(event)
-        if not self._initial_focus_done:
+        handle = self.windowHandle()
+        if handle is not None and not self._expose_filter_installed:
+            # Expose events only reach the native window, not the widget.
+            handle.installEventFilter(self)
+            self._expose_filter_installed = True
+        self._update_render_suspension()
+        if not self._initial_focus_done and self._controls is not None:
             self._initial_focus_done = True
             QTimer.singleShot(0, self.controls.preset_combo.setFocus)
+
+    def hideEvent(self, event) -> None:  # type: ignore[override]
+        super().hideEvent(event)
+        self._update_render_suspension()
+
+    def changeEvent(self, event) -> None:  # type: ignore[override]
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self._update_render_suspension()
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:  # type: ignore[override]
+        if watched is self.windowHandle() and event.type() == QEvent.Type.Expose:
+            self._update_render_suspension()
+        return super().eventFilter(watched, event)
+
+    def _update_render_suspension(self) -> None:
+        handle = self.windowHandle()
+        exposed = handle.isExposed() if handle is not None else False
+        visible = self.isVisible() and not self.isMinimized() and exposed
+        # Per-screen surfaces keep rendering even when the main window is hidden.
+        visible = visible or self._screen_surfaces.is_open
+        # Headless outputs (Art-Net, frame ring, event stream) hold the
+        # engine awake instead: it ignores this request while held, and
+        # applies it once the last hold is released.
+        self._engine.set_render_suspended(not visible)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QObject, Qt
+from PySide6.QtGui import QGuiApplication, QScreen
+
+from .engine import ColorCycleEngine
+from .ui_color_surface import ColorSurface
+
+
+class ScreenSurfaceSet(QObject):
+    """Borderless color surfaces, one per screen, driven by a single engine."""
+
+    def __init__(self, engine: ColorCycleEngine, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._engine = engine
+        self._screens: list[QScreen] = []
+        self._surfaces: list[ColorSurface] = []
+        self._engine.screen_colors_changed.connect(self._on_screen_colors_changed)
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self._surfaces)
+
+    @property
+    def surfaces(self) -> list[ColorSurface]:
+        return list(self._surfaces)
+
+    def open(self, screens: list[QScreen] | None = None, hue_offsets: list[float] | None = None) -> None:
+        self.close()
+        targets = list(screens) if screens is not None else QGuiApplication.screens()
+        offsets = list(hue_offsets) if hue_offsets is not None else []
+        offsets.extend([0.0] * (len(targets) - len(offsets)))
+
+        for screen in targets:
+            surface = ColorSurface()
+            surface.setWindowFlags(Qt.WindowType.Window | Qt.WindowType.FramelessWindowHint)
+            # Keep keyboard focus on the control panel when surfaces appear.
+            surface.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+            surface.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+            surface.setAccessibleName(f"AmbiColor Surface ({screen.name()})")
+            surface.setScreen(screen)
+            surface.setGeometry(screen.geometry())
+            self._screens.append(screen)
+            self._surfaces.append(surface)
+            surface.show()
+
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.screenRemoved.connect(self._on_screen_removed)
+        self._engine.set_screen_hue_offsets(offsets[: len(targets)])
+
+    def close(self) -> None:
+        if not self._surfaces:
+            return
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.screenRemoved.disconnect(self._on_screen_removed)
+        self._engine.set_screen_hue_offsets([])
+        for surface in self._surfaces:
+            surface.close()
+            surface.deleteLater()
+        self._screens.clear()
+        self._surfaces.clear()
+
+    def _on_screen_colors_changed(self, colors: list) -> None:
+        for surface, color in zip(self._surfaces, colors):
+            surface.set_color(color)
+
+    def _on_screen_removed(self, screen: QScreen) -> None:
+        if screen not in self._screens:
+            return
+        remaining = [s for s in self._screens if s is not screen]
+        offsets = [
+            offset
+            for s, offset in zip(self._screens, self._engine.screen_hue_offsets)
+            if s is not screen
+        ]
+        if remaining:
+            self.open(remaining, offsets)
+        else:
+            self.close()
@@ -1,10 +1,124 @@
 from __future__ import annotations
 
+import argparse
 import sys
+import time
+from pathlib import Path
 
-from PySide6.QtWidgets import QApplication
+from ambicolor.startup_profile import StartupProfile
 
-from ambicolor.ui_main_window import MainWindow
+_LAUNCHED_S = time.perf_counter()
+
+
+def _parse_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(prog="ambicolor")
+    parser.add_argument(
+        "--light-output",
+        metavar="HOST[:PORT][/UNIVERSE]",
+        action="append",
+        default=[],
+        help="send the current color as Art-Net DMX to this UDP endpoint (repeatable)",
+    )
+    parser.add_argument(
+        "--light-fixtures",
+        type=int,
+        default=1,
+        help="number of RGB fixtures per universe (default: 1)",
+    )
+    parser.add_argument(
+        "--frame-ring",
+        metavar="NAME",
+        help="publish every frame into a shared-memory ring buffer with this name",
+    )
+    control = parser.add_mutually_exclusive_group()
+    control.add_argument(
+        "--control-port",
+        type=int,
+        metavar="PORT",
+        help="serve JSON-RPC remote control on 127.0.0.1:PORT",
+    )
+    control.add_argument(
+        "--control-socket",
+        metavar="PATH",
+        help="serve JSON-RPC remote control on a Unix socket",
+    )
+    parser.add_argument(
+        "--events-port",
+        type=int,
+        metavar="PORT",
+        help="stream live color/state as Server-Sent Events on PORT (/events, mirror page at /)",
+    )
+    parser.add_argument(
+        "--events-host",
+        default="127.0.0.1",
+        metavar="HOST",
+        help="address the event stream listens on (default: 127.0.0.1; 0.0.0.0 for the LAN)",
+    )
+    parser.add_argument(
+        "--preset-dir",
+        metavar="DIR",
+        help="load additional presets from *.json files in this directory",
+    )
+    parser.add_argument(
+        "--watch-presets",
+        action="store_true",
+        help="reload changed preset files from --preset-dir while running",
+    )
+    parser.add_argument(
+        "--schedule",
+        metavar="FILE",
+        help="follow the daily preset program in this JSON file",
+    )
+    parser.add_argument(
+        "--record-session",
+        metavar="FILE",
+        help="record all inputs and frames (last ~1 hour, 4 MiB) and save them to FILE on exit",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print a timing breakdown of imports and startup phases to stderr",
+    )
+    parser.add_argument(
+        "--state-file",
+        metavar="FILE",
+        help="save the session here and continue it on the next start (default: in the app data directory)",
+    )
+    parser.add_argument(
+        "--no-restore",
+        action="store_true",
+        help="start with the default preset instead of the saved session (changes are still saved)",
+    )
+    parser.add_argument(
+        "--telemetry-dir",
+        metavar="DIR",
+        help="write state, preset, overrun and naming events as rotating compressed JSONL to DIR",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        type=float,
+        metavar="SECONDS",
+        help="sample tracemalloc, RSS and Qt object counts every SECONDS and print per-tick growth to stderr on exit",
+    )
+    parser.add_argument(
+        "--trace-latency",
+        action="store_true",
+        help="trace control-to-paint latency per interaction and print the distribution to stderr on exit",
+    )
+    parser.add_argument(
+        "--frame-pacing",
+        choices=("auto", "display", "timer", "fixed"),
+        default="auto",
+        help="tick once per presented frame (display), at the screen refresh rate (timer), either (auto, default) "
+        "or every 33 ms (fixed)",
+    )
+    parser.add_argument(
+        "--frame-stats",
+        action="store_true",
+        help="print presented fps, missed frames and frame interval spread to stderr on exit",
+    )
+    # Unknown arguments are left for Qt (e.g. -platform).
+    return parser.parse_known_args(argv[1:])
 
 
 def main() -> int:
@@ -14,10 +128,192 @@ def main() -> int:
             f"(current: {sys.version.split()[0]})."
         )
 
-    app = QApplication(sys.argv)
-    window = MainWindow(language="en")
-    window.show()
-    return app.exec()
+    profile = StartupProfile(origin_s=_LAUNCHED_S)
+    args, qt_args = _parse_args(sys.argv)
+    # Only what the first frame needs is imported up front; the control
+    # panel and all optional outputs are imported when they are built.
+    qt_widgets = profile.import_module("PySide6.QtWidgets")
+    with profile.phase("create QApplication"):
+        app = qt_widgets.QApplication([sys.argv[0], *qt_args])
+        app.setApplicationName("AmbiColor")
+    main_window = profile.import_module("ambicolor.ui_main_window")
+    presets = None
+    if args.preset_dir:
+        from ambicolor.models import preset_catalog
+        from ambicolor.preset_registry import PresetRegistry
+
+        preset_dir = Path(args.preset_dir)
+        with profile.phase("load preset directory"):
+            presets = PresetRegistry(preset_catalog())
+            errors = presets.load_directory(preset_dir)
+        for error in errors:
+            print(f"Skipping preset file: {error}", file=sys.stderr)
+
+    with profile.phase("create main window"):
+        window = main_window.MainWindow(language="en", presets=presets, defer_controls=True)
+    window.first_frame_painted.connect(lambda: profile.mark("first frame painted"))
+
+    from ambicolor.session_state import SessionStateFile, SessionStatePersister, default_state_path, restore_session
+
+    state_file = SessionStateFile(Path(args.state_file) if args.state_file else default_state_path())
+    saved = None if args.no_restore else state_file.load()
+    if saved is not None:
+        # Before the window is shown, so the first frame already continues
+        # the saved session.
+        with profile.phase("restore session"):
+            try:
+                restore_session(window.engine, window.preset_registry, saved)
+            except (KeyError, TypeError, ValueError) as exc:
+                print(f"Ignoring saved session {state_file.path}: {exc}", file=sys.stderr)
+                saved = None
+    persister = SessionStatePersister(window.engine, state_file, fullscreen=lambda: window.fullscreen_enabled, parent=window)
+    window.fullscreen_changed.connect(lambda _enabled: persister.schedule())
+
+    def _on_controls_built() -> None:
+        profile.add("build control panel", window.controls_build_s)
+        if args.profile_startup:
+            print(profile.report(), file=sys.stderr)
+
+    window.controls_built.connect(_on_controls_built)
+    pacer = None
+    if args.frame_pacing != "fixed":
+        from ambicolor.frame_pacing import FramePacer
+
+        pacer = FramePacer(window.engine, window, mode=args.frame_pacing, parent=window)
+    latency = window.enable_latency_tracing() if args.trace_latency else None
+    memory = None
+    if args.profile_memory:
+        from PySide6.QtCore import QTimer
+
+        from ambicolor.memory_profile import MemoryMonitor
+
+        memory = MemoryMonitor(qt_roots=lambda: [window.engine, *app.topLevelWidgets()])
+        memory.start()
+        memory.attach(window.engine)
+        memory_timer = QTimer(window)
+        memory_timer.timeout.connect(memory.sample)
+        memory_timer.start(max(1, int(args.profile_memory * 1000)))
+    if args.watch_presets and args.preset_dir:
+        window.enable_preset_hot_reload(preset_dir)
+
+    if args.schedule:
+        from ambicolor.generators import register_plugin_presets
+        from ambicolor.preset_registry import default_registry
+        from ambicolor.scheduler import PresetScheduler, ScheduleError, load_schedule
+
+        # Schedules may name generator plugin presets.
+        register_plugin_presets(presets or default_registry())
+        try:
+            schedule = load_schedule(Path(args.schedule), presets)
+        except ScheduleError as exc:
+            print(f"Cannot load schedule: {exc}", file=sys.stderr)
+            return 2
+        # A restored session keeps its playback state (e.g. paused).
+        PresetScheduler(window.engine, schedule, owns_playback=saved is None, parent=window).start()
+
+    # Servers bind before outputs and logs are started, so a port that is
+    # taken ends the app at once instead of leaving it running without it.
+    bridge = None
+    if args.control_port is not None or args.control_socket or args.events_port is not None:
+        from ambicolor.asyncio_bridge import QtAsyncioBridge
+
+        bridge = QtAsyncioBridge(app)
+
+    control_server = None
+    if args.control_port is not None or args.control_socket:
+        from ambicolor.control_server import ControlServer
+
+        if args.control_socket:
+            control_server = ControlServer(window.engine, unix_path=args.control_socket, presets=presets)
+        else:
+            control_server = ControlServer(window.engine, port=args.control_port, presets=presets)
+        try:
+            bridge.run_until_complete(control_server.start())
+        except OSError as exc:
+            print(f"Cannot start control server: {exc}", file=sys.stderr)
+            bridge.close()
+            return 2
+
+    event_stream = None
+    if args.events_port is not None:
+        from ambicolor.sse_server import ColorEventBroadcaster
+
+        event_stream = ColorEventBroadcaster(window.engine, host=args.events_host, port=args.events_port)
+        try:
+            bridge.run_until_complete(event_stream.start())
+        except OSError as exc:
+            print(f"Cannot start event stream: {exc}", file=sys.stderr)
+            if control_server is not None:
+                bridge.run_until_complete(control_server.close())
+            bridge.close()
+            return 2
+
+    telemetry = None
+    if args.telemetry_dir:
+        from ambicolor.telemetry import TelemetryLog
+
+        telemetry = TelemetryLog(Path(args.telemetry_dir))
+        window.enable_telemetry(telemetry)
+        telemetry.log("app", action="start")
+        telemetry.start()
+
+    recorder = None
+    if args.record_session:
+        from ambicolor.session_recorder import SessionRecorder
+
+        recorder = SessionRecorder()
+        recorder.attach(window.engine)
+
+    light_output = None
+    if args.light_output:
+        from ambicolor.light_output import LightOutputStage, parse_endpoint
+
+        light_output = LightOutputStage(
+            [parse_endpoint(spec) for spec in args.light_output],
+            fixture_count=args.light_fixtures,
+            # Called on the sender thread; the GUI never waits for DNS.
+            on_error=lambda message: print(f"Light output: {message}", file=sys.stderr),
+        )
+        light_output.attach(window.engine)
+        light_output.start()
+
+    frame_ring = None
+    if args.frame_ring:
+        from ambicolor.frame_ring import SharedFrameRingPublisher
+
+        frame_ring = SharedFrameRingPublisher(args.frame_ring)
+        frame_ring.attach(window.engine)
+
+    with profile.phase("show window"):
+        window.show_initial(fullscreen=bool(saved and saved.get("fullscreen")))
+    try:
+        return app.exec()
+    finally:
+        persister.close()
+        if event_stream is not None:
+            bridge.run_until_complete(event_stream.close())
+        if control_server is not None:
+            bridge.run_until_complete(control_server.close())
+        if bridge is not None:
+            bridge.close()
+        if light_output is not None:
+            light_output.stop()
+        if frame_ring is not None:
+            frame_ring.close()
+        if recorder is not None:
+            recorder.detach()
+            recorder.save(args.record_session)
+        if telemetry is not None:
+            telemetry.log("app", action="exit")
+            telemetry.stop()
+        if pacer is not None and args.frame_stats:
+            print(pacer.report(), file=sys.stderr)
+        if latency is not None:
+            print(latency.report(), file=sys.stderr)
+        if memory is not None:
+            memory.sample()
+            print(memory.report(), file=sys.stderr)
+            memory.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from ambicolor.calibration_analyzer import analyze_timeline, main, rgb8_to_oklab, run_analysis, sweep_configs
+from ambicolor.models import PresetId, preset_by_id, preset_catalog
+from ambicolor.timeline import render_timeline, with_overrides
+
+
+def test_oklab_reference_values() -> None:
+    white = rgb8_to_oklab(255, 255, 255)
+    assert abs(white[0] - 1.0) < 1e-3 and abs(white[1]) < 1e-3 and abs(white[2]) < 1e-3
+    red = rgb8_to_oklab(255, 0, 0)
+    assert abs(red[0] - 0.628) < 1e-3
+    assert abs(red[1] - 0.2249) < 1e-3
+    assert abs(red[2] - 0.1258) < 1e-3
+
+
+def test_timeline_is_reproducible_with_seed() -> None:
+    config = preset_by_id(PresetId.CLASSIC)
+    first = render_timeline(config, frame_count=120, seed=7)
+    second = render_timeline(config, frame_count=120, seed=7)
+
+    assert first.rgb == second.rgb
+    assert list(first.hues) == list(second.hues)
+
+
+def test_slow_dim_preset_reports_stalls() -> None:
+    config = with_overrides(preset_by_id(PresetId.CLASSIC), cycle_duration_s=3600.0, brightness_pct=10)
+    metrics = analyze_timeline(render_timeline(config, frame_count=600), config)
+
+    assert metrics.frames == 600
+    assert metrics.stall_fraction > 0.5
+    assert metrics.longest_stall_s > 0.5
+    assert metrics.visible_stalls >= 1
+
+
+def test_bounded_preset_reports_bounce_edges() -> None:
+    bounded = next(preset for preset in preset_catalog() if preset.hue_max_deg - preset.hue_min_deg < 360.0)
+    config = with_overrides(bounded, cycle_duration_s=30.0)
+    metrics = analyze_timeline(render_timeline(config), config)
+
+    assert metrics.bounce_count >= 1
+    assert metrics.max_bounce_kink >= metrics.mean_curvature
+    assert 0 < metrics.max_delta_frame < metrics.frames
+    assert metrics.max_delta_e >= metrics.p95_delta_e >= 0.0
+
+
+def test_sweep_in_process_pool_matches_serial() -> None:
+    configs = sweep_configs([preset_by_id(PresetId.CLASSIC)], saturations=[40, 80], durations=[10.0])
+    assert len(configs) == 2
+
+    serial = run_analysis(configs, fps=10.0)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = run_analysis(configs, fps=10.0, executor=executor, workers=2)
+
+    assert serial == parallel
+
+
+def test_cli_writes_json_report(tmp_path) -> None:
+    output = tmp_path / "report.json"
+    exit_code = main(
+        ["--preset", PresetId.CLASSIC.value, "--fps", "10", "--duration", "5,10", "--workers", "1", "--output", str(output)]
+    )
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert exit_code == 0
+    assert report["report_version"] == 1
+    assert [item["cycle_duration_s"] for item in report["results"]] == [5.0, 10.0]
+
+
+@pytest.mark.parametrize("sweep", ["10:90:0", "10:90:-5", "90:10:5"])
+def test_cli_rejects_invalid_ranges(sweep) -> None:
+    with pytest.raises(SystemExit) as raised:
+        main(["--preset", PresetId.CLASSIC.value, "--saturation", sweep, "--workers", "1"])
+    assert raised.value.code == 2
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from ambicolor.color_history import ColorHistory
+from ambicolor.control_server import ControlDispatcher
+from ambicolor.engine import ColorCycleEngine
+from ambicolor.models import PlaybackState
+
+
+class FakeClock:
+    def __init__(self, start: float = 0.0) -> None:
+        self.value = start
+
+    def now(self) -> float:
+        return self.value
+
+    def advance(self, seconds: float) -> None:
+        self.value += seconds
+
+
+def test_records_distinct_colors_and_looks_them_up() -> None:
+    history = ColorHistory(capacity=8, index_seconds=60)
+    assert history.latest() is None
+    assert history.at_time(5.0) is None
+
+    assert history.record(1.2, 10.0, 80, 60, 0x112233)
+    assert not history.record(1.5, 10.5, 80, 60, 0x112233)
+    assert history.record(3.7, 20.0, 80, 60, 0x445566)
+    assert len(history) == 2
+
+    assert history.at_time(1.0) is None
+    assert history.at_time(1.2).hex == "#112233"
+    assert history.at_time(3.5).hex == "#112233"
+    assert history.at_time(3.7).hex == "#445566"
+    assert history.at_time(100.0).hex == "#445566"
+    assert history.find_hex("445566").hue_deg == 20.0
+    assert history.find_hex("#000000") is None
+    assert [entry.hex for entry in history.entries()] == ["#445566", "#112233"]
+
+
+def test_overwritten_entries_disappear_from_every_index() -> None:
+    history = ColorHistory(capacity=4, index_seconds=10)
+    for step in range(10):
+        history.record(float(step), float(step), 50, 50, step + 1)
+
+    assert len(history) == 4
+    assert [entry.seq for entry in history.entries()] == [9, 8, 7, 6]
+    assert history.find_hex("#000001") is None
+    assert history.find_hex("#000007").seq == 6
+    assert history.at_time(5.5) is None
+    assert history.at_time(6.5).seq == 6
+    # A color shown again points at its newest occurrence.
+    history.record(10.0, 0.0, 50, 50, 7)
+    assert history.find_hex("#000007").seq == 10
+
+
+def test_hex_lookup_matches_a_linear_scan_under_churn() -> None:
+    # Few distinct colors, so evictions and reinsertions collide a lot in
+    # the fixed-size color table.
+    rng = random.Random(5)
+    history = ColorHistory(capacity=16, index_seconds=10)
+    for step in range(5000):
+        history.record(step * 0.01, 0.0, 50, 50, rng.randrange(40) * 0x010203)
+        if step % 97 == 0:
+            live = {int(entry.hex[1:], 16): entry.seq for entry in reversed(history.entries())}
+            for value in range(40):
+                rgb = value * 0x010203
+                entry = history.find_hex(f"#{rgb:06X}")
+                assert (entry.seq if entry else None) == live.get(rgb)
+
+
+def test_time_lookup_matches_a_linear_scan() -> None:
+    rng = random.Random(3)
+    history = ColorHistory(capacity=64, index_seconds=30)
+    shown: list[tuple[float, int]] = []
+    now = 0.0
+    for step in range(400):
+        # Bursts of colors within a second, and gaps of several seconds.
+        now += rng.choice((0.03, 0.03, 0.2, 1.0, 4.5))
+        if history.record(now, 0.0, 50, 50, step):
+            shown.append((now, step))
+
+    live = shown[-64:]
+    for _ in range(500):
+        query = rng.uniform(now - 40.0, now + 1.0)
+        expected = [rgb for timestamp, rgb in live if timestamp <= query]
+        entry = history.at_time(query)
+        if not expected or query < live[0][0] or now - query > 29.0:
+            continue
+        assert entry is not None and int(entry.hex[1:], 16) == expected[-1]
+
+
+def test_engine_jumps_back_to_a_history_entry() -> None:
+    clock = FakeClock()
+    engine = ColorCycleEngine(clock=clock.now)
+    engine.set_random_start_hue(False)
+    engine.start()
+    for _ in range(60):
+        clock.advance(1.0)
+        engine._on_timer_tick()
+
+    entry = engine.history.at_time(clock.value - 30.0)
+    assert entry is not None
+    states: list[str] = []
+    engine.state_changed.connect(states.append)
+    engine.jump_to_history(entry)
+
+    assert engine.state == PlaybackState.STANDSTILL
+    assert states
+    assert engine.current_snapshot()["hex"] == entry.hex
+    assert engine.history.latest().hex == entry.hex
+
+
+def test_dispatcher_jump_to_history() -> None:
+    clock = FakeClock()
+    engine = ColorCycleEngine(clock=clock.now)
+    dispatcher = ControlDispatcher(engine)
+    engine.start()
+    for _ in range(20):
+        clock.advance(1.0)
+        engine._on_timer_tick()
+    target = engine.history.at_time(clock.value - 10.0)
+
+    reply = dispatcher.handle({"jsonrpc": "2.0", "id": 1, "method": "jump_to_history", "params": {"seconds_ago": 10}})
+    assert reply["result"]["hex"] == target.hex
+    assert reply["result"]["state"] == PlaybackState.STANDSTILL.value
+
+    reply = dispatcher.handle({"jsonrpc": "2.0", "id": 2, "method": "jump_to_history", "params": {"hex": "#010203"}})
+    assert reply["error"]["code"] == -32602
+    reply = dispatcher.handle({"jsonrpc": "2.0", "id": 3, "method": "jump_to_history", "params": {}})
+    assert reply["error"]["code"] == -32602
+
+
+def test_invalid_capacity() -> None:
+    with pytest.raises(ValueError):
+        ColorHistory(capacity=0)
@@ -30,3 +30,58 @@ def test_invalid_hex_raises(value: str) -> None:
     store = ColorNameStore()
     with pytest.raises(ValueError):
         store.set_name(value, "x")
+
+
+def test_search_ranks_literal_and_fuzzy_matches() -> None:
+    store = ColorNameStore()
+    store.set_name("#00807F", "That Teal Last Week")
+    store.set_name("#008080", "Teal")
+    store.set_name("#20B2AA", "Light Sea Green")
+    store.set_name("#FF7F50", "Coral Evening")
+
+    assert [match.hex for match in store.search("teal")][:2] == ["#008080", "#00807F"]
+    assert store.search("that teal")[0].label == "That Teal Last Week (#00807F)"
+    assert store.search("evning")[0].name == "Coral Evening"
+    assert store.search("se")[0].hex == "#20B2AA"
+    assert store.search("t") == []
+    assert store.search("zzzz") == []
+
+
+def test_search_index_follows_renames_and_deletes() -> None:
+    store = ColorNameStore()
+    store.set_name("#112233", "Ocean Deep")
+    store.set_name("#445566", "Ocean Mist")
+    assert {match.hex for match in store.search("ocean")} == {"#112233", "#445566"}
+    # Equal scores list the most recently named color first.
+    assert store.search("ocean")[0].hex == "#445566"
+
+    store.set_name("#112233", "Forest Floor")
+    assert [match.hex for match in store.search("ocean")] == ["#445566"]
+    assert store.search("forest")[0].hex == "#112233"
+
+    store.set_name("#445566", "")
+    assert store.search("ocean") == []
+    assert len(store) == 1
+    assert all(store._index.values())
+
+
+def test_search_over_100k_names_is_fast() -> None:
+    import random
+    import time
+
+    words = ["teal", "ocean", "sky", "calm", "evening", "dusk", "amber", "rose", "violet", "forest", "mint", "coral"]
+    rng = random.Random(1)
+    store = ColorNameStore()
+    for value in range(100_000):
+        name = " ".join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+        store.set_name(f"#{value:06X}", f"{name} {value}")
+    store.set_name("#ABCDEF", "Lagoon at dusk")
+
+    timings = []
+    for query in ("lagoon", "lagon dusk", "violet ro", "ev", "amber 4242"):
+        start = time.perf_counter()
+        matches = store.search(query, limit=10)
+        timings.append(time.perf_counter() - start)
+        assert matches
+    assert store.search("lagon")[0].hex == "#ABCDEF"
+    assert sorted(timings)[len(timings) // 2] < 0.05
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import socket
+import statistics
+import threading
+import time
+
+import pytest
+
+from ambicolor.asyncio_bridge import QtAsyncioBridge
+from ambicolor.control_server import ControlDispatcher, ControlServer
+from ambicolor.engine import ColorCycleEngine
+from ambicolor.models import PlaybackState
+
+
+def _request(method: str, params=None, request_id=1) -> dict:
+    message = {"jsonrpc": "2.0", "method": method, "id": request_id}
+    if params is not None:
+        message["params"] = params
+    return message
+
+
+def test_dispatcher_methods_and_errors() -> None:
+    engine = ColorCycleEngine()
+    dispatcher = ControlDispatcher(engine)
+
+    assert dispatcher.handle(_request("set_saturation", [42]))["result"] is None
+    assert dispatcher.handle(_request("current_snapshot"))["result"]["saturation_pct"] == 42
+    assert dispatcher.handle(_request("apply_preset", {"preset_id": "spectrum_sweep"}))["result"][
+        "saturation_pct"
+    ] == 95
+    assert dispatcher.handle(_request("apply_preset", ["nope"]))["error"]["code"] == -32602
+    assert dispatcher.handle(_request("explode"))["error"]["code"] == -32601
+    engine.set_hue_name("#008080", "Teal")
+    (match,) = dispatcher.handle(_request("search_color_names", {"query": "tea"}))["result"]
+    assert match["hex"] == "#008080" and match["label"] == "Teal (#008080)"
+    assert dispatcher.handle({"method": "start"})["error"]["code"] == -32600
+    assert dispatcher.handle({"jsonrpc": "2.0", "method": "start"}) is None
+    assert engine.state == PlaybackState.RUNNING
+
+    batch = json.dumps([_request("pause", request_id=7), {"jsonrpc": "2.0", "method": "resume"}])
+    replies = json.loads(dispatcher.handle_line(batch.encode()))
+    assert [reply["id"] for reply in replies] == [7]
+    batch = json.dumps([{"jsonrpc": "2.0", "method": ["x"], "id": 1}, _request("current_snapshot", request_id=2)])
+    invalid, snapshot = json.loads(dispatcher.handle_line(batch.encode()))
+    assert invalid["id"] == 1 and invalid["error"]["code"] == -32600
+    assert snapshot["id"] == 2 and "result" in snapshot
+    assert json.loads(dispatcher.handle_line(b"{oops"))["error"]["code"] == -32700
+
+
+@pytest.fixture
+def running_server(qtbot):
+    engine = ColorCycleEngine()
+    bridge = QtAsyncioBridge()
+    server = ControlServer(engine)
+    task = bridge.create_task(server.start())
+    qtbot.waitUntil(task.done, timeout=2000)
+    task.result()
+    yield engine, bridge, server
+    close_task = bridge.create_task(server.close())
+    qtbot.waitUntil(close_task.done, timeout=2000)
+    bridge.close()
+
+
+def test_idle_bridge_only_wakes_for_timers_and_io(qtbot, running_server) -> None:
+    _engine, bridge, server = running_server
+    qtbot.wait(50)
+    assert not bridge._timer.isActive()
+
+    fired = []
+    bridge.loop.call_later(0.05, fired.append, "timer")
+    assert bridge._timer.isActive()
+    qtbot.waitUntil(lambda: bool(fired), timeout=2000)
+    qtbot.wait(20)
+    assert not bridge._timer.isActive()
+
+    payload = (json.dumps(_request("current_snapshot", request_id=1)) + "\n").encode()
+    results = _drive(qtbot, server.address, [payload], pipelined=False)
+    assert results["replies"][0]["id"] == 1
+    qtbot.wait(50)
+    assert not bridge._timer.isActive()
+
+
+def test_failed_bind_is_raised_at_startup(qtbot) -> None:
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        bridge = QtAsyncioBridge()
+        server = ControlServer(ColorCycleEngine(), port=taken.getsockname()[1])
+        with pytest.raises(OSError):
+            bridge.run_until_complete(server.start())
+        bridge.close()
+
+
+def _run_client(address, payloads: list[bytes], results: dict, *, pipelined: bool) -> None:
+    with socket.create_connection(address, timeout=10) as sock:
+        stream = sock.makefile("rwb")
+        latencies = []
+        start = time.perf_counter()
+        if pipelined:
+            stream.write(b"".join(payloads))
+            stream.flush()
+            replies = [stream.readline() for _ in payloads]
+        else:
+            replies = []
+            for payload in payloads:
+                sent = time.perf_counter()
+                stream.write(payload)
+                stream.flush()
+                replies.append(stream.readline())
+                latencies.append(time.perf_counter() - sent)
+        results["elapsed_s"] = time.perf_counter() - start
+        results["replies"] = [json.loads(reply) for reply in replies]
+        results["latencies"] = latencies
+
+
+def _drive(qtbot, address, payloads, *, pipelined: bool) -> dict:
+    results: dict = {}
+    client = threading.Thread(target=_run_client, args=(address, payloads, results), kwargs={"pipelined": pipelined})
+    client.start()
+    qtbot.waitUntil(lambda: not client.is_alive(), timeout=20000)
+    client.join()
+    return results
+
+
+def test_pipelined_requests_are_answered_in_order(qtbot, running_server) -> None:
+    engine, _bridge, server = running_server
+    payloads = [
+        (json.dumps(_request("set_brightness", [value % 101], request_id=value)) + "\n").encode()
+        for value in range(2000)
+    ]
+    results = _drive(qtbot, server.address, payloads, pipelined=True)
+
+    assert [reply["id"] for reply in results["replies"]] == list(range(2000))
+    assert engine.current_snapshot()["brightness_pct"] == 1999 % 101
+    assert len(payloads) / results["elapsed_s"] > 500
+
+
+def test_round_trip_latency_and_batches(qtbot, running_server) -> None:
+    _engine, _bridge, server = running_server
+    single = [(json.dumps(_request("current_snapshot", request_id=i)) + "\n").encode() for i in range(300)]
+    batch = (json.dumps([_request("set_saturation", [i], request_id=i) for i in range(50)]) + "\n").encode()
+
+    results = _drive(qtbot, server.address, single + [batch], pipelined=False)
+
+    latencies_ms = sorted(latency * 1000 for latency in results["latencies"][:-1])
+    p50 = statistics.median(latencies_ms)
+    p99 = latencies_ms[int(len(latencies_ms) * 0.99) - 1]
+    assert p50 < 50
+    assert p99 < 250
+    assert [reply["id"] for reply in results["replies"][-1]] == list(range(50))
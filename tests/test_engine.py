@@ -102,3 +102,63 @@ def test_restricted_hue_range_bounces_without_hard_wrap() -> None:
     engine._on_timer_tick()
     hue_next = engine.current_snapshot()["hue_deg"]
     assert hue_next < hue_after_bounce
+
+
+def test_suspended_rendering_keeps_logical_clock_and_counts_wakeups() -> None:
+    clock = FakeClock()
+    reference = ColorCycleEngine(clock=clock.now)
+    engine = ColorCycleEngine(clock=clock.now)
+    for candidate in (reference, engine):
+        candidate.set_random_start_hue(False)
+        candidate.start()
+
+    engine.set_render_suspended(True)
+    assert engine.render_suspended
+    clock.advance(33.0)
+    engine._on_timer_tick()
+    assert engine.wakeups_avoided == 1000
+
+    engine.set_render_suspended(False)
+    reference._on_timer_tick()
+    assert engine.current_snapshot()["hex"] == reference.current_snapshot()["hex"]
+    assert engine.wakeups_avoided == 1000
+
+
+def test_bounded_hue_catches_up_after_long_gap() -> None:
+    clock = FakeClock()
+    stepped = ColorCycleEngine(clock=clock.now)
+    jumped = ColorCycleEngine(clock=clock.now)
+    for engine in (stepped, jumped):
+        engine._hue_min_deg = 18.0
+        engine._hue_max_deg = 95.0
+        engine._current_hue_deg = 18.0
+        engine._bounded_direction = 1.0
+        engine._state = PlaybackState.RUNNING
+        engine._last_tick_s = clock.now()
+        engine.set_cycle_duration(60.0)
+
+    for _ in range(2000):
+        clock.advance(0.5)
+        stepped._on_timer_tick()
+    jumped._on_timer_tick()
+
+    assert abs(jumped.current_snapshot()["hue_deg"] - stepped.current_snapshot()["hue_deg"]) < 1e-6
+    assert jumped._bounded_direction == stepped._bounded_direction
+
+
+def test_screen_colors_follow_hue_offsets() -> None:
+    clock = FakeClock()
+    engine = ColorCycleEngine(clock=clock.now)
+    emitted: list[list] = []
+    engine.screen_colors_changed.connect(emitted.append)
+
+    engine.set_random_start_hue(False)
+    engine.set_screen_hue_offsets([0.0, 120.0, 240.0])
+    engine.start()
+    clock.advance(1.0)
+    engine._on_timer_tick()
+
+    colors = emitted[-1]
+    assert len(colors) == 3
+    assert colors[0].name().upper() == engine.current_snapshot()["hex"]
+    assert len({color.name() for color in colors}) == 3
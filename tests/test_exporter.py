@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import io
+import itertools
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtGui import QImage, QImageReader
+
+from ambicolor.exporter import export, main, rgb_runs, rgb_to_ycbcr, write_apng, write_y4m
+
+FRAMES = [(255, 0, 0)] * 3 + [(0, 128, 255)] * 2 + [(10, 20, 30)]
+
+
+def _png_chunks(data: bytes) -> list[tuple[bytes, bytes]]:
+    chunks = []
+    offset = 8
+    while offset < len(data):
+        (length,) = struct.unpack_from(">I", data, offset)
+        chunks.append((data[offset + 4 : offset + 8], data[offset + 8 : offset + 8 + length]))
+        offset += length + 12
+    return chunks
+
+
+def test_runs_collapse_identical_consecutive_frames() -> None:
+    assert list(rgb_runs(FRAMES)) == [((255, 0, 0), 3), ((0, 128, 255), 2), ((10, 20, 30), 1)]
+
+
+def test_y4m_stream_layout() -> None:
+    stream = io.BytesIO()
+
+    written = write_y4m(stream, rgb_runs(FRAMES), width=5, height=3, fps=25)
+
+    data = stream.getvalue()
+    header, body = data.split(b"\n", 1)
+    frame_size = len(b"FRAME\n") + 5 * 3 + 2 * (3 * 2)
+    assert written == 6
+    assert header.startswith(b"YUV4MPEG2 W5 H3 F25:1")
+    assert len(body) == 6 * frame_size
+    y, cb, cr = rgb_to_ycbcr(0, 128, 255)
+    fourth = body[3 * frame_size : 4 * frame_size]
+    assert fourth == b"FRAME\n" + bytes((y,)) * 15 + bytes((cb,)) * 6 + bytes((cr,)) * 6
+
+
+def test_ycbcr_limited_range() -> None:
+    assert rgb_to_ycbcr(0, 0, 0) == (16, 128, 128)
+    assert rgb_to_ycbcr(255, 255, 255) == (235, 128, 128)
+
+
+def test_png_sequence_decodes(qtbot, tmp_path) -> None:
+    written = export(iter(FRAMES), "png", tmp_path / "frames", width=8, height=4, fps=10, workers=2)
+
+    files = sorted((tmp_path / "frames").iterdir())
+    assert written == 6
+    assert [path.name for path in files][:2] == ["frame_000000.png", "frame_000001.png"]
+    assert len(files) == 6
+    assert QImage(str(files[3])).pixelColor(7, 3).getRgb()[:3] == (0, 128, 255)
+    assert files[0].read_bytes() == files[2].read_bytes()
+
+
+def test_apng_merges_runs_into_longer_frames() -> None:
+    stream = io.BytesIO()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        write_apng(stream, rgb_runs(FRAMES), width=4, height=4, fps=10, executor=executor, window=2)
+
+    chunks = _png_chunks(stream.getvalue())
+    kinds = [kind for kind, _data in chunks]
+    assert struct.unpack(">II", dict(chunks)[b"acTL"]) == (3, 0)
+    delays = [struct.unpack(">IIIIIHHBB", data)[5] for kind, data in chunks if kind == b"fcTL"]
+    assert delays == [300, 200, 100]
+    assert kinds.count(b"IDAT") == 1
+    assert kinds.count(b"fdAT") == 2
+    sequence = [struct.unpack_from(">I", data)[0] for kind, data in chunks if kind in (b"fcTL", b"fdAT")]
+    assert sequence == list(range(5))
+
+
+def test_gif_frames_and_delays(qtbot, tmp_path) -> None:
+    path = tmp_path / "preview.gif"
+    export(iter(FRAMES), "gif", path, width=37, height=23, fps=10)
+
+    reader = QImageReader(str(path))
+    seen = []
+    for _ in range(reader.imageCount()):
+        image = reader.read()
+        seen.append((image.pixelColor(36, 22).getRgb()[:3], reader.nextImageDelay()))
+    assert seen == [((255, 0, 0), 300), ((0, 128, 255), 200), ((10, 20, 30), 100)]
+
+
+def test_pipeline_consumes_frames_lazily() -> None:
+    consumed = 0
+
+    def endless_frames():
+        nonlocal consumed
+        index = 0
+        while True:
+            consumed += 1
+            yield (index // 2 % 256, 0, 0)
+            index += 1
+
+    first_runs = list(itertools.islice(rgb_runs(endless_frames()), 3))
+
+    assert first_runs == [((0, 0, 0), 2), ((1, 0, 0), 2), ((2, 0, 0), 2)]
+    assert consumed == 7
+
+
+def test_cli_exports_preset(tmp_path) -> None:
+    output = tmp_path / "classic.y4m"
+
+    assert main(["--preset", "classic", "--duration", "2", "--fps", "10", "--size", "4x2", "-o", str(output)]) == 0
+
+    header, body = output.read_bytes().split(b"\n", 1)
+    assert header.startswith(b"YUV4MPEG2 W4 H2 F10:1")
+    assert body.count(b"FRAME\n") == 20
+
+
+def test_cli_exports_recorded_session(tmp_path) -> None:
+    from ambicolor.engine import ColorCycleEngine
+    from ambicolor.session_recorder import SessionRecorder
+
+    clock_value = [0.0]
+    engine = ColorCycleEngine(clock=lambda: clock_value[0])
+    engine.set_render_suspended(True)
+    recorder = SessionRecorder()
+    recorder.attach(engine)
+    engine.start()
+    for _ in range(60):
+        clock_value[0] += 1 / 30
+        engine._on_timer_tick()
+    recorder.detach()
+    engine.stop_standstill()
+    session = tmp_path / "field.ambisession"
+    recorder.save(session)
+    output = tmp_path / "field.y4m"
+
+    assert main(["--session", str(session), "--fps", "10", "--size", "2x2", "-o", str(output)]) == 0
+
+    assert output.read_bytes().count(b"FRAME\n") in (20, 21)
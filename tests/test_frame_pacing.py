@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pytest
+
+from ambicolor.frame_pacing import FrameIntervals, FramePacer
+from ambicolor.ui_main_window import MainWindow
+
+
+def test_intervals_count_missed_frames_but_not_pauses() -> None:
+    intervals = FrameIntervals()
+    refresh_s = 1.0 / 60.0
+    now = 0.0
+    for step in (1, 1, 1, 2, 1, 3, 1):
+        now += step * refresh_s
+        intervals.frame(now, refresh_s)
+    intervals.end_run()
+    # A pause: the gap to the next frame is not an interval.
+    intervals.frame(now + 5.0, refresh_s)
+
+    stats = intervals.stats("display", 60.0)
+    assert stats.frames == 8
+    assert stats.missed_frames == 1 + 2
+    assert stats.max_interval_ms == pytest.approx(50.0)
+    assert stats.presented_fps == pytest.approx(1000.0 / stats.mean_interval_ms)
+    assert stats.p5_interval_ms == pytest.approx(1000.0 * refresh_s)
+    assert stats.stdev_interval_ms > 0
+
+
+def test_display_mode_ticks_once_per_update_request(qtbot) -> None:
+    window = MainWindow(language="en")
+    qtbot.addWidget(window)
+    pacer = FramePacer(window.engine, window, mode="display")
+    window.show()
+    qtbot.waitExposed(window)
+    window.engine.start()
+    assert not window.engine._timer.isActive()
+
+    qtbot.waitUntil(lambda: pacer.frame_intervals.frames >= 20, timeout=2000)
+    assert pacer.mode == "display"
+    assert not window.engine._timer.isActive()
+
+    window.engine.pause()
+    frames = pacer.frame_intervals.frames
+    qtbot.wait(50)
+    assert pacer.frame_intervals.frames == frames
+
+    # Resuming restarts the frame loop, not the engine timer.
+    window.engine.resume()
+    qtbot.waitUntil(lambda: pacer.frame_intervals.frames > frames + 5, timeout=2000)
+    assert not window.engine._timer.isActive()
+    window.engine.stop_standstill()
+    pacer.close()
+
+
+def test_auto_mode_falls_back_to_refresh_rate_timer_when_requests_are_unpaced(qtbot) -> None:
+    # The offscreen platform answers update requests from a 5 ms timer.
+    window = MainWindow(language="en")
+    qtbot.addWidget(window)
+    pacer = FramePacer(window.engine, window, mode="auto")
+    window.show()
+    qtbot.waitExposed(window)
+    window.engine.start()
+
+    qtbot.waitUntil(lambda: pacer.mode == "timer", timeout=2000)
+    assert "not paced" in pacer.fallback_reason
+    assert window.engine._timer.isActive()
+    assert window.engine._timer.interval() == round(1000.0 / pacer.refresh_hz)
+    assert window.engine.tick_interval_s == pytest.approx(1.0 / pacer.refresh_hz, abs=0.001)
+    assert "missed" in pacer.report()
+    window.engine.stop_standstill()
+    pacer.close()
+
+
+def test_unknown_mode_is_rejected(qtbot) -> None:
+    window = MainWindow(language="en")
+    qtbot.addWidget(window)
+    with pytest.raises(ValueError):
+        FramePacer(window.engine, window, mode="vsync")
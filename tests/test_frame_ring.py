@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import gc
+import struct
+import time
+
+import pytest
+
+from ambicolor.engine import ColorCycleEngine
+from ambicolor.frame_ring import SharedFrameRingPublisher, SharedFrameRingReader
+
+
+@pytest.fixture
+def publisher():
+    ring = SharedFrameRingPublisher(capacity=8)
+    yield ring
+    ring.close()
+
+
+def _publish(ring: SharedFrameRingPublisher, value: int) -> int:
+    return ring.publish(
+        value,
+        0,
+        255 - value,
+        hue_deg=float(value),
+        saturation_pct=80,
+        brightness_pct=60,
+        cycle_duration_s=120.0,
+        state_code=1,
+        timestamp_s=float(value),
+    )
+
+
+def test_reader_sees_frames_in_order(publisher) -> None:
+    reader = SharedFrameRingReader(publisher.name)
+    try:
+        for value in range(5):
+            _publish(publisher, value)
+        frames = reader.read_new()
+    finally:
+        reader.close()
+
+    assert [frame.frame_seq for frame in frames] == [1, 2, 3, 4, 5]
+    assert (frames[-1].red, frames[-1].blue) == (4, 251)
+    assert frames[-1].state == "running"
+    assert reader.dropped == 0
+
+
+def test_reader_counts_overwritten_frames(publisher) -> None:
+    reader = SharedFrameRingReader(publisher.name)
+    try:
+        for value in range(20):
+            _publish(publisher, value)
+        frames = reader.read_new()
+    finally:
+        reader.close()
+
+    assert [frame.frame_seq for frame in frames] == list(range(13, 21))
+    assert reader.dropped == 12
+
+
+def test_engine_frames_are_published(publisher) -> None:
+    engine = ColorCycleEngine()
+    publisher.attach(engine)
+    reader = SharedFrameRingReader(publisher.name)
+    try:
+        engine.set_saturation(55)
+        frame = reader.read_new()[-1]
+    finally:
+        reader.close()
+        publisher.detach()
+
+    snapshot = engine.current_snapshot()
+    assert f"#{frame.red:02X}{frame.green:02X}{frame.blue:02X}" == snapshot["hex"]
+    assert frame.saturation_pct == 55
+    assert frame.state == "standstill"
+
+
+def test_attached_ring_keeps_the_engine_awake(publisher) -> None:
+    engine = ColorCycleEngine()
+    publisher.attach(engine)
+    engine.set_render_suspended(True)
+    assert engine.held_awake and not engine.render_suspended
+
+    publisher.detach()
+    assert engine.render_suspended
+
+
+def _best_costs_s(fns, count: int = 10000, repeats: int = 9) -> list[float]:
+    # Rounds alternate between the functions so a busy runner slows all of
+    # them alike; the fastest round of each is kept.
+    best = [float("inf")] * len(fns)
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            for index, fn in enumerate(fns):
+                start = time.perf_counter()
+                for value in range(count):
+                    fn(value)
+                best[index] = min(best[index], (time.perf_counter() - start) / count)
+    finally:
+        gc.enable()
+    return best
+
+
+def test_publish_cost_stays_small(publisher) -> None:
+    # Relative to one bare pack_into on the same machine, so the budget
+    # holds on slow runners. A publish (three pack_into calls plus the call
+    # itself) measures 6-7x; twice that cost fails.
+    word = bytearray(8)
+    pack_word = struct.Struct("<Q").pack_into
+    publish = publisher.publish
+    baseline, cost = _best_costs_s(
+        [
+            lambda value: pack_word(word, 0, value),
+            lambda value: publish(
+                value & 0xFF,
+                0,
+                0,
+                hue_deg=1.0,
+                saturation_pct=80,
+                brightness_pct=60,
+                cycle_duration_s=120.0,
+                state_code=1,
+                timestamp_s=1.0,
+            ),
+        ]
+    )
+
+    assert cost < 10 * baseline
+    assert cost < 20e-6
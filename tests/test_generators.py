@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+import time
+from dataclasses import replace
+from importlib.metadata import EntryPoint
+
+import pytest
+
+import ambicolor.generators as generators
+from ambicolor.engine import ColorCycleEngine
+from ambicolor.generators import (
+    GENERATOR_GROUP,
+    OVERRUN_LIMIT,
+    GeneratorError,
+    GeneratorHost,
+    GeneratorParams,
+    generator_loaded,
+    plugin_presets,
+    register_plugin_presets,
+    render_frames,
+)
+from ambicolor.models import PresetId, preset_catalog
+from ambicolor.preset_registry import PresetRegistry
+
+PLUGIN_SOURCE = textwrap.dedent(
+    """
+    class Ramp:
+        def color_at(self, t_s, params):
+            level = int(t_s * 10) % 256
+            return level, params.saturation_pct, params.brightness_pct
+    """
+)
+
+
+class FakeClock:
+    def __init__(self, start: float = 0.0) -> None:
+        self.value = start
+
+    def now(self) -> float:
+        return self.value
+
+    def advance(self, seconds: float) -> None:
+        self.value += seconds
+
+
+PARAMS = GeneratorParams(cycle_duration_s=60.0, saturation_pct=50, brightness_pct=40, hue_min_deg=0.0, hue_max_deg=360.0)
+
+
+@pytest.fixture
+def ramp_plugin(tmp_path, monkeypatch):
+    (tmp_path / "ambicolor_test_ramp.py").write_text(PLUGIN_SOURCE, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "ambicolor_test_ramp", raising=False)
+    entries = [EntryPoint(name="ramp", value="ambicolor_test_ramp:Ramp", group=GENERATOR_GROUP)]
+    monkeypatch.setattr(generators, "entry_points", lambda group: entries if group == GENERATOR_GROUP else [])
+    monkeypatch.setattr(generators, "_loaded_generators", set())
+    return "ambicolor_test_ramp"
+
+
+def test_plugins_are_listed_without_import_and_loaded_on_apply(ramp_plugin) -> None:
+    registry = PresetRegistry(preset_catalog())
+    assert register_plugin_presets(registry) == ["plugin:ramp"]
+    assert register_plugin_presets(registry) == []
+    assert ramp_plugin not in sys.modules
+    assert not generator_loaded("ramp")
+
+    preset = registry.get("plugin:ramp")
+    assert preset.generator == "ramp" and preset.label_key == "Ramp"
+
+    clock = FakeClock()
+    engine = ColorCycleEngine(clock=clock.now)
+    engine.apply_preset(preset)
+    assert ramp_plugin in sys.modules
+    assert engine.generator_name == "ramp"
+    assert generator_loaded("ramp")
+
+    engine.start()
+    clock.advance(2.0)
+    engine._on_timer_tick()
+    assert engine.current_snapshot()["hex"] == "#14503C"
+
+    engine.set_brightness(30)
+    assert engine.current_color.blue() == 30
+    engine.pause()
+    clock.advance(5.0)
+    engine.resume()
+    clock.advance(1.0)
+    engine._on_timer_tick()
+    assert engine.current_color.red() == 30
+    assert engine.generator_stats.ticks >= 3
+
+    engine.apply_preset(preset_catalog()[0])
+    assert engine.generator_name is None and engine.generator_stats is None
+
+
+def test_missing_or_broken_plugin_raises_before_state_changes(monkeypatch) -> None:
+    monkeypatch.setattr(generators, "entry_points", lambda group: [])
+    engine = ColorCycleEngine()
+    before = engine.current_snapshot()
+    broken = plugin_presets({"ghost": EntryPoint(name="ghost", value="no_such_module:X", group=GENERATOR_GROUP)})[0]
+    with pytest.raises(GeneratorError):
+        engine.apply_preset(broken)
+    assert engine.current_snapshot() == before
+
+
+def test_raising_plugin_is_rejected_on_apply_and_dropped_while_running(monkeypatch) -> None:
+    class Bad:
+        def color_at(self, t_s, params):
+            return 1 // 0
+
+    class Flaky:
+        def color_at(self, t_s, params):
+            if t_s >= 1.0:
+                raise RuntimeError("sensor gone")
+            return 200, 10, 10
+
+    plugins = {"bad": Bad, "flaky": Flaky}
+    monkeypatch.setattr(generators, "load_generator", lambda name: plugins[name]())
+    monkeypatch.setattr("ambicolor.engine.load_generator", lambda name: plugins[name]())
+    base = preset_catalog()[0]
+
+    clock = FakeClock()
+    engine = ColorCycleEngine(clock=clock.now)
+    before = engine.current_snapshot()
+    with pytest.raises(GeneratorError, match="ZeroDivisionError"):
+        engine.apply_preset(replace(base, preset_id="plugin:bad", generator="bad"))
+    assert engine.generator_name is None
+    assert engine.current_snapshot() == before
+
+    failures = []
+    engine.generator_failed.connect(lambda name, error: failures.append((name, error)))
+    engine.apply_preset(replace(base, preset_id="plugin:flaky", generator="flaky"))
+    engine.start()
+    clock.advance(0.5)
+    engine._on_timer_tick()
+    assert engine.current_snapshot()["hex"] == "#C80A0A"
+
+    clock.advance(0.6)
+    engine._on_timer_tick()
+    assert engine.generator_name is None
+    assert failures and failures[0][0] == "flaky" and "sensor gone" in failures[0][1]
+    hue = engine.current_snapshot()["hue_deg"]
+    clock.advance(1.0)
+    engine._on_timer_tick()
+    assert engine.current_snapshot()["hue_deg"] != hue
+    engine.stop_standstill()
+
+
+def test_tick_interval_changes_reach_the_generator_budget(monkeypatch) -> None:
+    class Flat:
+        def color_at(self, t_s, params):
+            return 1, 2, 3
+
+    monkeypatch.setattr("ambicolor.engine.load_generator", lambda name: Flat())
+    engine = ColorCycleEngine()
+    engine.apply_preset(replace(preset_catalog()[0], preset_id="plugin:flat", generator="flat"))
+    assert engine.generator_stats.budget_ms == pytest.approx(1000.0 * engine.tick_interval_s * 0.25)
+
+    engine.set_tick_interval_s(1.0 / 120.0)
+    assert engine.generator_stats.budget_ms == pytest.approx(2.0)
+
+
+def test_slow_generator_is_throttled() -> None:
+    clock = FakeClock()
+
+    class Slow:
+        def color_at(self, t_s, params):
+            clock.advance(0.030)
+            return 1, 2, 3
+
+    host = GeneratorHost(Slow(), PARAMS, frame_interval_s=0.033, clock=clock.now)
+    for _ in range(OVERRUN_LIMIT):
+        host.color_at(0.0)
+    stats = host.stats()
+    assert stats.mode == "throttled"
+    assert stats.overruns == OVERRUN_LIMIT
+    assert stats.throttle_every >= 4
+
+    computed = stats.computed
+    for _ in range(40):
+        assert host.color_at(0.0) == (1, 2, 3)
+    assert host.stats().computed - computed <= 40 // stats.throttle_every + 1
+
+
+def test_slow_generator_with_batches_moves_to_worker() -> None:
+    clock = FakeClock()
+
+    class Batched:
+        def color_at(self, t_s, params):
+            clock.advance(0.030)
+            return 0, 0, 0
+
+        def frames(self, start_s, step_s, count, params):
+            return b"".join(bytes((index % 256, 7, 9)) for index in range(count))
+
+    host = GeneratorHost(Batched(), PARAMS, frame_interval_s=0.033, clock=clock.now)
+    for _ in range(OVERRUN_LIMIT):
+        host.color_at(0.0)
+    assert host.mode == "worker"
+    try:
+        deadline = time.monotonic() + 2.0
+        while host.color_at(1.0) == (0, 0, 0) and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert host.color_at(1.0 + 2 * 0.033) == (2, 7, 9)
+        computed = host.stats().computed
+        host.color_at(1.1)
+        assert host.stats().computed == computed
+    finally:
+        host.close()
+
+
+def test_render_frames_falls_back_to_color_at() -> None:
+    class Plain:
+        def color_at(self, t_s, params):
+            return int(t_s), 0, 255
+
+    assert render_frames(Plain(), 0.0, 1.0, 3, PARAMS) == bytes((0, 0, 255, 1, 0, 255, 2, 0, 255))
+
+
+def test_out_of_range_channels_are_clamped_and_non_finite_ones_fail() -> None:
+    class Wild:
+        def color_at(self, t_s, params):
+            return (256, -1, 300.7) if t_s < 1.0 else (float("nan"), 0, 0)
+
+    host = GeneratorHost(Wild(), PARAMS, frame_interval_s=0.033)
+    assert host.color_at(0.0) == (255, 0, 255)
+    with pytest.raises(GeneratorError, match="ValueError"):
+        host.color_at(1.0)
+    assert render_frames(Wild(), 0.0, 0.5, 2, PARAMS) == bytes((255, 0, 255)) * 2
+    host.close()
+
+
+def test_preset_files_may_name_a_generator(tmp_path) -> None:
+    (tmp_path / "aurora.json").write_text(
+        '{"schema_version": 2, "preset_id": "aurora", "label": "Aurora", "cycle_duration_s": 60,'
+        ' "saturation_pct": 70, "brightness_pct": 50, "hue_min_deg": 0, "hue_max_deg": 360,'
+        ' "generator": "aurora"}',
+        encoding="utf-8",
+    )
+    registry = PresetRegistry(preset_catalog())
+    assert registry.load_file(tmp_path / "aurora.json").generator == "aurora"
+    assert registry.get(PresetId.CLASSIC).generator is None
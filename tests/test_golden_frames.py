@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pathlib
+import time
+from array import array
+
+import pytest
+
+from ambicolor.golden_frames import (
+    GOLDEN_CASES,
+    GOLDEN_FRAMES,
+    compare_timelines,
+    decode_timeline,
+    encode_timeline,
+    golden_path,
+    read_golden,
+)
+from ambicolor.timeline import Timeline
+
+GOLDEN_DIR = pathlib.Path(__file__).resolve().parent / "golden"
+
+
+@pytest.mark.parametrize("case", GOLDEN_CASES, ids=lambda case: case.name)
+def test_engine_matches_golden_timeline(case) -> None:
+    expected = read_golden(golden_path(GOLDEN_DIR, case))
+
+    started = time.perf_counter()
+    diff = compare_timelines(expected, case.render())
+    elapsed = time.perf_counter() - started
+
+    assert diff.frames_compared == GOLDEN_FRAMES
+    assert diff.matches, f"{case.name}: {diff.describe()} (regenerate with python -m ambicolor.golden_frames)"
+    assert elapsed < 1.0
+
+
+def test_encoding_round_trip() -> None:
+    timeline = Timeline(fps=25.0, hues=array("d", [0.0, 1.5, 359.75]), rgb=bytes(range(9)))
+
+    decoded = decode_timeline(encode_timeline(timeline))
+
+    assert decoded.fps == 25.0
+    assert list(decoded.hues) == [0.0, 1.5, 359.75]
+    assert decoded.rgb == timeline.rgb
+
+
+def test_corrupt_file_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        decode_timeline(b"NOTGOLD!" + bytes(32))
+
+
+def test_diff_reports_first_divergent_frame_and_max_error() -> None:
+    expected = read_golden(golden_path(GOLDEN_DIR, GOLDEN_CASES[0]))
+    rgb = bytearray(expected.rgb)
+    for offset, delta in ((1500 * 3 + 1, 7), (2000 * 3, 2)):
+        rgb[offset] += delta if rgb[offset] < 128 else -delta
+    hues = array("d", expected.hues)
+    hues[1800] += 0.25
+
+    diff = compare_timelines(expected, Timeline(fps=expected.fps, hues=hues, rgb=bytes(rgb)))
+
+    assert not diff.matches
+    assert diff.first_divergent_frame == 1500
+    assert diff.max_channel_error == 7
+    assert diff.max_hue_error_deg == pytest.approx(0.25)
+
+
+def test_shorter_timeline_diverges_at_its_end() -> None:
+    expected = read_golden(golden_path(GOLDEN_DIR, GOLDEN_CASES[0]))
+    truncated = Timeline(fps=expected.fps, hues=expected.hues[:100], rgb=expected.rgb[:300])
+
+    diff = compare_timelines(expected, truncated)
+
+    assert diff.first_divergent_frame == 100
+    assert diff.frames_compared == 100
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import random
+import subprocess
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+from ambicolor.color_math import hsv_to_qcolor
+from ambicolor.hue_kernel import hsv_to_rgb8, iter_hue_frames
+from ambicolor.models import preset_catalog
+from ambicolor.timeline import _iter_engine_frames
+
+
+def test_hsv_conversion_matches_qcolor() -> None:
+    rng = random.Random(5)
+    samples = [(rng.uniform(0.0, 360.0), rng.randint(0, 100), rng.randint(0, 100)) for _ in range(20000)]
+    samples += [(code / 100.0, rng.randint(0, 100), rng.randint(0, 100)) for code in range(36001)]
+    samples += [(hue, 0, 50) for hue in (0.0, 359.99999999999994, -1e-20)]
+    for hue, saturation, brightness in samples:
+        color = hsv_to_qcolor(hue, saturation, brightness)
+        assert hsv_to_rgb8(hue, saturation, brightness) == (color.red(), color.green(), color.blue())
+
+
+def test_kernel_frames_match_the_engine() -> None:
+    rng = random.Random(11)
+    configs = []
+    for preset in preset_catalog():
+        configs.append(preset)
+        configs.append(
+            replace(
+                preset,
+                cycle_duration_s=rng.choice([0.5, 3.7, 12.0]),
+                saturation_pct=rng.randint(0, 100),
+                brightness_pct=rng.randint(0, 100),
+                hue_min_deg=rng.uniform(-400.0, 400.0),
+                hue_max_deg=rng.uniform(-400.0, 400.0),
+                random_start_hue=not preset.random_start_hue,
+            )
+        )
+    for config in configs:
+        for seed, fps in ((0, 30.0), (7, 59.94)):
+            expected = list(_iter_engine_frames(config, fps=fps, frame_count=600, seed=seed))
+            assert list(iter_hue_frames(config, fps=fps, frame_count=600, seed=seed)) == expected
+
+
+def test_batch_rendering_does_not_import_qt() -> None:
+    code = "import sys, ambicolor.parallel, ambicolor.golden_frames; print(any('PySide6' in m for m in sys.modules))"
+    app = Path(__file__).resolve().parents[1] / "app"
+    result = subprocess.run([sys.executable, "-c", code], cwd=app, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from PySide6.QtCore import Qt
+
+from ambicolor.latency_trace import LatencyTracer
+from ambicolor.ui_main_window import MainWindow
+
+# Control event to painted frame, per keyboard step. Two frames at 30 fps.
+LATENCY_BUDGET_MS = 66.0
+
+
+class FakeClock:
+    def __init__(self, start: float = 0.0) -> None:
+        self.value = start
+
+    def now(self) -> float:
+        return self.value
+
+    def advance(self, seconds: float) -> None:
+        self.value += seconds
+
+
+def test_tracer_stages_and_merged_paints() -> None:
+    clock = FakeClock()
+    tracer = LatencyTracer(clock=clock.now)
+
+    with tracer.interaction("saturation_slider"):
+        clock.advance(0.001)
+        tracer.color_changed(repaint=True)
+        clock.advance(0.001)
+        tracer.engine_event("saturation", 50)
+    clock.advance(0.004)
+    with tracer.interaction("brightness_slider"):
+        tracer.color_changed(repaint=True)
+        tracer.engine_event("tick", 1.0)
+    clock.advance(0.010)
+    # One paint completes both interactions.
+    tracer.painted()
+
+    assert tracer.samples_ms("saturation_slider", "color_changed") == [1.0]
+    assert tracer.samples_ms("saturation_slider", "engine") == [2.0]
+    assert [round(value, 6) for value in tracer.samples_ms("saturation_slider")] == [16.0]
+    assert tracer.samples_ms("brightness_slider", "engine") == []
+    assert [round(value, 6) for value in tracer.samples_ms("brightness_slider")] == [10.0]
+
+    with tracer.interaction("speed_slider"):
+        tracer.engine_event("cycle_duration", 60.0)
+    with tracer.interaction("preset"):
+        tracer.color_changed(repaint=True)
+    clock.advance(5.0)
+    tracer.painted()
+    assert tracer.unpainted == 1 and tracer.dropped == 1
+    assert tracer.samples_ms("preset") == []
+
+    rows = {(row.interaction, row.stage): row for row in tracer.stats()}
+    assert rows["saturation_slider", "paint"].count == 1
+    assert "saturation_slider" in tracer.report()
+
+
+def test_samples_are_bounded() -> None:
+    clock = FakeClock()
+    tracer = LatencyTracer(capacity=4, clock=clock.now)
+    for step in range(10):
+        with tracer.interaction("speed_spin"):
+            clock.advance(step / 1000.0)
+            tracer.engine_event("cycle_duration", 1.0)
+    assert sorted(round(value) for value in tracer.samples_ms("speed_spin", "engine")) == [6, 7, 8, 9]
+
+
+def test_keyboard_replay_stays_within_latency_budget(qtbot) -> None:
+    window = MainWindow(language="en")
+    qtbot.addWidget(window)
+    window.show()
+    qtbot.wait(120)
+    tracer = window.enable_latency_tracing()
+
+    replay = [
+        (window.controls.saturation_slider, Qt.Key.Key_Left, 10),
+        (window.controls.brightness_slider, Qt.Key.Key_Right, 10),
+        (window.controls.saturation_spin, Qt.Key.Key_Up, 5),
+        (window.controls.preset_combo, Qt.Key.Key_Down, 2),
+    ]
+    for widget, key, presses in replay:
+        widget.setFocus()
+        for _ in range(presses):
+            qtbot.keyClick(widget, key)
+            qtbot.waitUntil(lambda: tracer.waiting_for_paint == 0, timeout=1000)
+
+    for interaction, expected in (("saturation_slider", 10), ("brightness_slider", 10), ("saturation_spin", 5)):
+        samples = tracer.samples_ms(interaction)
+        assert len(samples) == expected
+        assert len(tracer.samples_ms(interaction, "engine")) == expected
+    assert len(tracer.samples_ms("preset", "engine")) == 2
+    assert tracer.dropped == 0
+
+    for row in tracer.stats():
+        if row.stage == "paint":
+            assert row.p95_ms <= LATENCY_BUDGET_MS, tracer.report()
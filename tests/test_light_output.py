@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import socket
+import time
+
+import pytest
+from PySide6.QtGui import QColor
+
+from ambicolor.engine import ColorCycleEngine
+from ambicolor.light_output import LightEndpoint, LightOutputStage, parse_endpoint
+
+
+@pytest.fixture
+def receiver():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2.0)
+    yield sock
+    sock.close()
+
+
+def _drain_last(sock: socket.socket, expected_rgb: tuple[int, int, int]) -> bytes:
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline:
+        packet = sock.recv(1024)
+        if tuple(packet[18:21]) == expected_rgb:
+            return packet
+    raise AssertionError(f"no packet with {expected_rgb} received")
+
+
+def test_parse_endpoint() -> None:
+    assert parse_endpoint("10.0.0.5") == LightEndpoint("10.0.0.5", 6454, 0)
+    assert parse_endpoint("10.0.0.5:7000/3") == LightEndpoint("10.0.0.5", 7000, 3)
+    assert parse_endpoint("fd00::5") == LightEndpoint("fd00::5", 6454, 0)
+    assert parse_endpoint("[fd00::5]:7000/3") == LightEndpoint("fd00::5", 7000, 3)
+    with pytest.raises(ValueError):
+        parse_endpoint(":7000")
+    with pytest.raises(ValueError):
+        parse_endpoint("[fd00::5")
+
+
+def test_hosts_are_resolved_off_the_calling_thread(receiver) -> None:
+    errors = []
+    stage = LightOutputStage(
+        [LightEndpoint("unresolvable.invalid"), LightEndpoint("127.0.0.1", receiver.getsockname()[1])],
+        on_error=errors.append,
+    )
+    started = time.perf_counter()
+    stage.start()
+    assert time.perf_counter() - started < 0.05
+    try:
+        stage.publish_rgb(1, 2, 3)
+        _drain_last(receiver, (1, 2, 3))
+        stats = stage.stats()
+    finally:
+        stage.stop()
+
+    assert stats.resolve_errors == 1
+    assert len(errors) == 1 and "unresolvable.invalid" in errors[0]
+
+
+def test_engine_frames_arrive_as_artdmx_packets(receiver) -> None:
+    port = receiver.getsockname()[1]
+    stage = LightOutputStage([LightEndpoint("127.0.0.1", port, universe=0x0102)], fixture_count=2)
+    engine = ColorCycleEngine()
+    stage.attach(engine)
+    stage.start()
+    try:
+        engine.set_brightness(100)
+        color = QColor(engine.current_snapshot()["hex"])
+        packet = _drain_last(receiver, (color.red(), color.green(), color.blue()))
+    finally:
+        stage.stop()
+        stage.detach()
+
+    assert len(packet) == 18 + 512
+    assert packet[:8] == b"Art-Net\x00"
+    assert packet[8:10] == b"\x00\x50"
+    assert packet[14] == 0x02 and packet[15] == 0x01
+    assert packet[16:18] == b"\x02\x00"
+    assert packet[21:24] == packet[18:21]
+    assert packet[24] == 0
+
+
+def test_latest_frame_wins_and_stats(receiver) -> None:
+    port = receiver.getsockname()[1]
+    stage = LightOutputStage([LightEndpoint("127.0.0.1", port)])
+    stage.start()
+    try:
+        for value in range(200):
+            stage.publish_rgb(value, 0, 255 - value)
+        _drain_last(receiver, (199, 0, 56))
+        stats = stage.stats()
+    finally:
+        stage.stop()
+
+    assert stats.frames_published == 200
+    assert stats.frames_sent + stats.frames_superseded == 200
+    assert stats.packets_sent == stats.frames_sent
+    assert stats.packets_per_second > 0
+    assert stats.send_latency_max_ms >= stats.send_latency_avg_ms > 0
+
+
+def test_minimized_window_keeps_dmx_frames_advancing(qtbot, receiver) -> None:
+    from ambicolor.ui_main_window import MainWindow
+
+    window = MainWindow(language="en")
+    qtbot.addWidget(window)
+    window.show()
+    qtbot.waitExposed(window)
+    engine = window.engine
+    engine.set_cycle_duration(5.0)
+    engine.set_brightness(100)
+    engine.start()
+
+    stage = LightOutputStage([LightEndpoint("127.0.0.1", receiver.getsockname()[1])])
+    stage.attach(engine)
+    stage.start()
+    try:
+        window.showMinimized()
+        qtbot.wait(100)
+        assert not engine.render_suspended and engine._timer.isActive()
+
+        colors = set()
+        deadline = time.monotonic() + 1.0
+        while len(colors) < 3 and time.monotonic() < deadline:
+            qtbot.wait(40)
+            receiver.setblocking(False)
+            try:
+                while True:
+                    colors.add(bytes(receiver.recv(1024)[18:21]))
+            except BlockingIOError:
+                pass
+            finally:
+                receiver.setblocking(True)
+        assert len(colors) >= 3
+    finally:
+        stage.stop()
+        stage.detach()
+        engine.stop_standstill()
+
+    # Without the hold the minimized window suspends the engine again.
+    assert not engine.held_awake
+    engine.start()
+    assert engine.render_suspended
+    engine.stop_standstill()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from ambicolor.engine import ColorCycleEngine
+from ambicolor.memory_profile import MemoryMonitor, qt_object_counts, resident_bytes, subsystem_of
+from ambicolor.ui_color_surface import ColorSurface
+
+# Steady-state budgets for the soak test.
+MAX_RETAINED_BYTES_PER_TICK = 8.0
+MAX_RETAINED_BLOCKS_PER_TICK = 0.05
+MAX_MEAN_TRANSIENT_BYTES_PER_TICK = 4096
+MAX_RESIDENT_GROWTH_BYTES = 8 * 1024 * 1024
+
+
+class FakeClock:
+    def __init__(self, start: float = 0.0) -> None:
+        self.value = start
+
+    def now(self) -> float:
+        return self.value
+
+    def advance(self, seconds: float) -> None:
+        self.value += seconds
+
+
+def _run(engine: ColorCycleEngine, clock: FakeClock, ticks: int, step_s: float) -> None:
+    for index in range(ticks):
+        clock.advance(step_s)
+        engine._on_timer_tick()
+        if index % 500 == 0:
+            # Occasional user input, as on an installation with a remote.
+            engine.set_saturation(60 + (index // 500) % 20)
+            engine.set_hue_name(engine.current_snapshot()["hex"], f"Scene {index % 7}")
+
+
+def test_soak_days_of_ticks_stay_within_memory_budget(qtbot) -> None:
+    clock = FakeClock()
+    engine = ColorCycleEngine(clock=clock.now)
+    engine.set_cycle_duration(20.0)
+    surface = ColorSurface()
+    qtbot.addWidget(surface)
+    engine.color_changed.connect(surface.set_color)
+
+    monitor = MemoryMonitor(qt_roots=lambda: [engine, surface])
+    monitor.start()
+    monitor.attach(engine)
+    try:
+        engine.start()
+        # Warm-up fills the color history ring and its per-second index;
+        # the first simulated day lets every container reach its size.
+        _run(engine, clock, 4500, 0.033)
+        steady = None
+        for day in range(3):
+            # Some ticks at the real rate, the rest of the day in coarse steps.
+            _run(engine, clock, 1000, 0.033)
+            _run(engine, clock, 1440, 60.0)
+            if day == 0:
+                monitor.reset_tick_peaks()
+                steady = monitor.sample()
+        end = monitor.sample()
+    finally:
+        engine.stop_standstill()
+        monitor.stop()
+
+    assert end.ticks - steady.ticks == 2 * (1000 + 1440)
+    rates = monitor.growth_per_tick(steady, end)
+    retained = sum(rate.bytes_per_tick for rate in rates)
+    blocks = sum(rate.blocks_per_tick for rate in rates)
+    assert retained <= MAX_RETAINED_BYTES_PER_TICK, monitor.report()
+    assert blocks <= MAX_RETAINED_BLOCKS_PER_TICK, monitor.report()
+    assert monitor.mean_tick_peak_bytes <= MAX_MEAN_TRANSIENT_BYTES_PER_TICK, monitor.report()
+    assert end.qt_objects == steady.qt_objects
+    if steady.resident_bytes is not None:
+        assert end.resident_bytes - steady.resident_bytes <= MAX_RESIDENT_GROWTH_BYTES
+
+
+def test_unchanged_colors_reuse_hex_and_display_name(monkeypatch) -> None:
+    clock = FakeClock()
+    engine = ColorCycleEngine(clock=clock.now)
+    engine.set_cycle_duration(3600.0)
+    built = []
+    original = engine._display_name_for_hex
+    monkeypatch.setattr(engine, "_display_name_for_hex", lambda hex_color: built.append(hex_color) or original(hex_color))
+
+    engine.start()
+    hexes = set()
+    for _ in range(30):
+        clock.advance(0.033)
+        engine._on_timer_tick()
+        hexes.add(engine.current_snapshot()["hex"])
+    engine.stop_standstill()
+    assert len(built) == len(hexes) < 30
+
+    engine.set_hue_name(engine.current_snapshot()["hex"], "Dusk")
+    assert engine.current_display_name.startswith("Dusk (")
+
+
+def test_helpers() -> None:
+    engine = ColorCycleEngine()
+    counts = qt_object_counts([engine, engine])
+    assert counts["ColorCycleEngine"] == 1 and counts["QTimer"] >= 1
+    assert subsystem_of(ColorCycleEngine.__init__.__code__.co_filename) == "engine"
+    assert subsystem_of("/usr/lib/python3/json/decoder.py") == "other"
+    rss = resident_bytes()
+    assert rss is None or rss > 0
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from ambicolor.models import PresetId, preset_by_id, preset_catalog
+from ambicolor.parallel import RenderJob, _split, benchmark, free_threaded, parallel_executor, render_many
+from ambicolor.timeline import render_timeline
+
+
+def _jobs() -> list[RenderJob]:
+    presets = preset_catalog()
+    return [
+        RenderJob(presets[index % len(presets)], fps=30.0, frame_count=40 + 17 * index, seed=index)
+        for index in range(6)
+    ]
+
+
+def _assert_matches_serial(jobs: list[RenderJob], timelines) -> None:
+    assert len(timelines) == len(jobs)
+    for job, timeline in zip(jobs, timelines):
+        expected = render_timeline(job.config, fps=job.fps, frame_count=job.frames, seed=job.seed)
+        assert timeline.fps == job.fps
+        assert timeline.hues == expected.hues
+        assert timeline.rgb == expected.rgb
+
+
+def test_render_many_serial_and_threaded_match_render_timeline() -> None:
+    jobs = _jobs()
+    _assert_matches_serial(jobs, render_many(jobs))
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        _assert_matches_serial(jobs, render_many(jobs, executor=executor))
+
+
+def test_render_many_process_fallback_matches() -> None:
+    jobs = _jobs()[:3]
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        _assert_matches_serial(jobs, render_many(jobs, executor=executor))
+
+
+def test_default_frame_count_and_split() -> None:
+    job = RenderJob(preset_by_id(PresetId.CLASSIC), fps=10.0)
+    assert job.frames == len(render_timeline(job.config, fps=10.0))
+
+    jobs = _jobs()
+    chunks = _split(jobs, 3)
+    assert [index for chunk in chunks for index in chunk] == list(range(len(jobs)))
+    assert 2 <= len(chunks) <= 4
+
+
+def test_executor_matches_interpreter_build() -> None:
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    assert free_threaded() is (not gil)
+    with parallel_executor(2) as executor:
+        expected = ThreadPoolExecutor if free_threaded() else ProcessPoolExecutor
+        assert isinstance(executor, expected)
+
+
+def test_benchmark_reports_each_configuration() -> None:
+    rows = benchmark(_jobs()[:2], worker_counts=[1, 2], kinds=("thread",))
+    assert [(row["executor"], row["workers"]) for row in rows] == [("serial", 1), ("thread", 2)]
+    assert rows[0]["speedup"] == 1.0
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QPixmap
+
+import ambicolor.preset_preview as preset_preview
+from ambicolor.models import preset_catalog
+from ambicolor.preset_preview import PREVIEW_SIZE, PreviewCache, preview_key, render_preview_strip
+from ambicolor.timeline import render_timeline
+from ambicolor.ui_main_window import MainWindow
+
+
+def test_strip_holds_two_cycles_of_the_timeline() -> None:
+    preset = preset_catalog()[0]
+    strip = render_preview_strip(preset, QSize(32, 4), samples=32)
+    assert (strip.width(), strip.height()) == (64, 4)
+
+    timeline = render_timeline(preset, fps=32 / preset.cycle_duration_s, frame_count=32, seed=0)
+    for x in (3, 17, 30):
+        color = strip.pixelColor(x, 2)
+        again = strip.pixelColor(x + 32, 2)
+        # Smooth scaling may round a channel by one.
+        assert all(abs(a - b) <= 1 for a, b in zip((color.red(), color.green(), color.blue()), timeline.rgb_at(x)))
+        assert color == again
+
+
+def test_cache_is_keyed_on_parameters_and_bounded(qapp) -> None:
+    preset = preset_catalog()[0]
+    assert preview_key(preset) == preview_key(replace(preset))
+    assert preview_key(preset) != preview_key(replace(preset, saturation_pct=preset.saturation_pct - 1))
+    assert preview_key(preset) != preview_key(preset, QSize(64, 16))
+
+    cache = PreviewCache(capacity=2)
+    keys = [("a", 1, 1), ("b", 1, 1), ("c", 1, 1)]
+    cache.put(keys[0], QPixmap(1, 1))
+    cache.put(keys[1], QPixmap(1, 1))
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[2], QPixmap(1, 1))
+    assert keys[0] in cache and keys[1] not in cache and len(cache) == 2
+    cache.mark_failed(keys[1])
+    assert keys[1] in cache and cache.get(keys[1]) is None
+
+
+def test_only_selected_and_visible_presets_are_rendered_off_the_gui_thread(qtbot, monkeypatch) -> None:
+    rendered: list[str] = []
+    threads: set[str] = set()
+    real_render = preset_preview.render_preview_strip
+
+    def slow_render(config, size=PREVIEW_SIZE):
+        import threading
+
+        threads.add(threading.current_thread().name)
+        time.sleep(0.05)
+        rendered.append(config.label_key)
+        return real_render(config, size)
+
+    monkeypatch.setattr(preset_preview, "render_preview_strip", slow_render)
+    window = MainWindow(language="en")
+    qtbot.addWidget(window)
+    window.show()
+    previews = window.preset_previews
+    combo = window.controls.preset_combo
+
+    qtbot.waitUntil(lambda: not previews.busy, timeout=2000)
+    assert rendered == [window.preset_registry.presets()[0].label_key]
+    assert all(name.startswith("ambicolor-preview") for name in threads)
+
+    started = time.perf_counter()
+    combo.showPopup()
+    assert time.perf_counter() - started < 0.05
+    qtbot.waitUntil(lambda: len(previews.cache) == combo.count(), timeout=3000)
+    assert len(rendered) == combo.count()
+    assert previews.animating
+
+    combo.hidePopup()
+    window.controls.speed_slider.setFocus()
+    qtbot.waitUntil(lambda: not previews._timer.isActive(), timeout=1000)
+    assert not combo.itemIcon(combo.currentIndex()).isNull()
+    assert combo.itemIcon(combo.count() - 1).isNull() or combo.currentIndex() == combo.count() - 1
+    window.close()
+
+
+def test_plugin_rows_wait_until_the_plugin_was_loaded(qtbot, monkeypatch) -> None:
+    from PySide6.QtWidgets import QComboBox
+
+    loaded: set[str] = set()
+    monkeypatch.setattr(preset_preview, "generator_loaded", loaded.__contains__)
+    rendered: list[str] = []
+    real_render = preset_preview.render_preview_strip
+
+    def record_render(config, size=PREVIEW_SIZE):
+        rendered.append(config.label_key)
+        return real_render(config, size)
+
+    monkeypatch.setattr(preset_preview, "render_preview_strip", record_render)
+    plugin = replace(preset_catalog()[0], preset_id="plugin:ramp", label_key="Ramp", generator="ramp")
+    presets = [preset_catalog()[0], plugin]
+    combo = QComboBox()
+    qtbot.addWidget(combo)
+    combo.addItems([preset.label_key for preset in presets])
+    previews = preset_preview.PresetPreviewer(combo, lambda row: presets[row] if 0 <= row < len(presets) else None)
+
+    qtbot.waitUntil(lambda: not previews.busy, timeout=2000)
+    previews.request(1)
+    assert not previews.busy and len(previews.cache) == 1
+
+    loaded.add("ramp")
+    previews.request(1)
+    qtbot.waitUntil(lambda: not previews.busy, timeout=2000)
+    # No such plugin is installed, so the render fails and is not retried.
+    assert rendered == [presets[0].label_key, "Ramp"]
+    assert preview_key(plugin) in previews.cache
+    previews.close()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from ambicolor.models import PresetId, preset_by_id, preset_catalog
+from ambicolor.preset_registry import PRESET_SCHEMA_VERSION, PresetFileError, PresetRegistry
+
+
+def _write(path, **fields) -> None:
+    data = {
+        "schema_version": PRESET_SCHEMA_VERSION,
+        "preset_id": "sunset",
+        "label": "Sunset Walk",
+        "cycle_duration_s": 90,
+        "saturation_pct": 70,
+        "brightness_pct": 50,
+        "hue_min_deg": 10,
+        "hue_max_deg": 60,
+    }
+    data.update(fields)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_lookup_by_id_and_name() -> None:
+    registry = PresetRegistry(preset_catalog())
+
+    assert registry.get(PresetId.AMBIENT_LAMP).saturation_pct == 35
+    assert registry.get("ambient_lamp") is registry.get(PresetId.AMBIENT_LAMP)
+    assert registry.find_by_name("classic color cycle").preset_id == PresetId.CLASSIC
+    assert registry.find_by_name("preset.spectrum_sweep").preset_id == PresetId.SPECTRUM_SWEEP
+    assert preset_by_id(PresetId.CLASSIC) is preset_by_id("classic")
+    with pytest.raises(ValueError):
+        registry.get("missing")
+
+
+def test_load_directory_validates_and_migrates(tmp_path) -> None:
+    _write(tmp_path / "sunset.json")
+    (tmp_path / "legacy.json").write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "id": "dusk",
+                "name": "Dusk",
+                "duration_s": 200,
+                "saturation": 40,
+                "brightness": 30,
+                "hue_range": [200, 280],
+            }
+        ),
+        encoding="utf-8",
+    )
+    _write(tmp_path / "future.json", schema_version=PRESET_SCHEMA_VERSION + 1)
+    _write(tmp_path / "broken.json", saturation_pct="high")
+    (tmp_path / "garbage.json").write_text("{", encoding="utf-8")
+
+    registry = PresetRegistry(preset_catalog())
+    errors = registry.load_directory(tmp_path)
+
+    assert sorted(error.path.name for error in errors) == ["broken.json", "future.json", "garbage.json"]
+    assert all(isinstance(error, PresetFileError) for error in errors)
+    assert registry.find_by_name("Sunset Walk").cycle_duration_s == 90.0
+    dusk = registry.get("dusk")
+    assert (dusk.hue_min_deg, dusk.hue_max_deg, dusk.saturation_pct) == (200.0, 280.0, 40)
+    assert len(registry) == 6
+
+
+def test_file_preset_shadows_builtin_until_removed(tmp_path) -> None:
+    path = tmp_path / "classic.json"
+    _write(path, preset_id="classic", label="Classic (tuned)", saturation_pct=50)
+    registry = PresetRegistry(preset_catalog())
+
+    registry.load_file(path)
+    assert registry.get(PresetId.CLASSIC).saturation_pct == 50
+    assert [preset.preset_id for preset in registry.presets()][0] == PresetId.CLASSIC
+
+    registry.remove_file(path)
+    assert registry.get(PresetId.CLASSIC).saturation_pct == 80
+    assert registry.find_by_name("Classic (tuned)") is None
+
+
+def test_files_sharing_an_id_fall_back_to_the_surviving_file(tmp_path) -> None:
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+    _write(first, preset_id="classic", label="Classic (first)", saturation_pct=50)
+    _write(second, preset_id="classic", label="Classic (second)", saturation_pct=60)
+    registry = PresetRegistry(preset_catalog())
+    registry.load_file(first)
+    registry.load_file(second)
+
+    registry.remove_file(first)
+    assert registry.get(PresetId.CLASSIC).saturation_pct == 60
+
+    registry.load_file(first)
+    registry.remove_file(second)
+    assert registry.get(PresetId.CLASSIC).saturation_pct == 50
+    registry.remove_file(first)
+    assert registry.get(PresetId.CLASSIC).saturation_pct == 80
+
+
+def test_hundreds_of_preset_files_load_quickly_and_reload_for_free(tmp_path) -> None:
+    for index in range(200):
+        _write(tmp_path / f"p{index:03}.json", preset_id=f"p{index}", label=f"Preset {index}")
+
+    registry = PresetRegistry()
+    start = time.perf_counter()
+    assert registry.load_directory(tmp_path) == []
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert len(registry) == 200
+    assert registry.find_by_name("preset 7").preset_id == "p7"
+    assert elapsed_ms < 500
+
+    # Unchanged files are recognized by their hash and not parsed again.
+    presets = registry.presets()
+    registry.load_directory(tmp_path)
+    assert all(a is b for a, b in zip(registry.presets(), presets))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+
+from ambicolor.models import PlaybackState, preset_catalog
+from ambicolor.preset_registry import PresetRegistry
+from ambicolor.ui_main_window import MainWindow
+
+
+def _write(path, **fields) -> None:
+    data = {
+        "schema_version": 2,
+        "preset_id": "sunset",
+        "label": "Sunset Walk",
+        "cycle_duration_s": 90,
+        "saturation_pct": 70,
+        "brightness_pct": 50,
+        "hue_min_deg": 0,
+        "hue_max_deg": 360,
+    }
+    data.update(fields)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_edit_updates_running_engine_in_place(qtbot, tmp_path) -> None:
+    preset_path = tmp_path / "sunset.json"
+    _write(preset_path)
+    registry = PresetRegistry(preset_catalog())
+    registry.load_directory(tmp_path)
+
+    window = MainWindow(language="en", presets=registry)
+    qtbot.addWidget(window)
+    reloader = window.enable_preset_hot_reload(tmp_path)
+
+    combo = window.controls.preset_combo
+    combo.setCurrentIndex(combo.findData("sunset"))
+    window.engine.start()
+    qtbot.wait(100)
+    window.engine.pause()
+    hue_before = window.engine.current_snapshot()["hue_deg"]
+    assert hue_before > 0.0
+
+    # A burst of saves is handled as a single reload.
+    for saturation in (20, 30, 40):
+        _write(preset_path, saturation_pct=saturation)
+        reloader._on_file_changed(str(preset_path))
+    qtbot.waitUntil(lambda: reloader.reload_count == 1, timeout=3000)
+    qtbot.wait(50)
+    assert reloader.reload_count == 1
+
+    snapshot = window.engine.current_snapshot()
+    assert snapshot["saturation_pct"] == 40
+    assert snapshot["hue_deg"] == hue_before
+    assert window.engine.state == PlaybackState.PAUSED
+    assert window.controls.saturation_slider.value() == 40
+    assert combo.currentData() == "sunset"
+    assert "sunset" in window.controls.status_label.text()
+
+
+def test_new_and_deleted_files_update_preset_list(qtbot, tmp_path) -> None:
+    registry = PresetRegistry(preset_catalog())
+    window = MainWindow(language="en", presets=registry)
+    qtbot.addWidget(window)
+    reloader = window.enable_preset_hot_reload(tmp_path)
+    combo = window.controls.preset_combo
+
+    preset_path = tmp_path / "dusk.json"
+    _write(preset_path, preset_id="dusk", label="Dusk")
+    reloader._on_directory_changed(str(tmp_path))
+    reloader.flush()
+    assert combo.findData("dusk") >= 0
+
+    combo.setCurrentIndex(combo.findData("dusk"))
+    preset_path.unlink()
+    reloader._on_directory_changed(str(tmp_path))
+    reloader.flush()
+    assert combo.findData("dusk") < 0
+    assert combo.currentIndex() == 0
+    assert window.engine.current_snapshot()["saturation_pct"] == 80
+
+
+def test_invalid_edit_keeps_previous_preset(qtbot, tmp_path) -> None:
+    preset_path = tmp_path / "sunset.json"
+    _write(preset_path)
+    registry = PresetRegistry(preset_catalog())
+    registry.load_directory(tmp_path)
+    window = MainWindow(language="en", presets=registry)
+    qtbot.addWidget(window)
+    reloader = window.enable_preset_hot_reload(tmp_path)
+
+    preset_path.write_text("{", encoding="utf-8")
+    with qtbot.waitSignal(reloader.reload_failed, timeout=1000):
+        reloader._on_file_changed(str(preset_path))
+        reloader.flush()
+    assert registry.get("sunset").saturation_pct == 70
+    assert "not loaded" in window.controls.status_label.text()
+
+
+def test_saves_that_change_nothing_are_not_reported(qtbot, tmp_path) -> None:
+    preset_path = tmp_path / "sunset.json"
+    _write(preset_path)
+    registry = PresetRegistry(preset_catalog())
+    registry.load_directory(tmp_path)
+    window = MainWindow(language="en", presets=registry)
+    qtbot.addWidget(window)
+    reloader = window.enable_preset_hot_reload(tmp_path)
+    reloaded = []
+    reloader.presets_reloaded.connect(reloaded.append)
+
+    # Same bytes (a touch), then only whitespace changed.
+    _write(preset_path)
+    reloader._on_file_changed(str(preset_path))
+    reloader.flush()
+    preset_path.write_text(preset_path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    reloader._on_file_changed(str(preset_path))
+    reloader.flush()
+    assert reloader.reload_count == 2
+    assert reloaded == []
+
+    _write(preset_path, saturation_pct=20)
+    reloader._on_file_changed(str(preset_path))
+    reloader.flush()
+    assert reloaded == [["sunset"]]
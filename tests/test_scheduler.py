@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime
+
+import pytest
+
+from ambicolor.engine import ColorCycleEngine
+from ambicolor.models import PlaybackState, PresetId, preset_by_id
+from ambicolor.scheduler import (
+    CROSSFADE_STEP_S,
+    DailySchedule,
+    PresetScheduler,
+    ScheduleEntry,
+    ScheduleError,
+    _covers,
+    load_schedule,
+    parse_time_of_day,
+)
+
+
+class FakeWallClock:
+    def __init__(self, moment: datetime) -> None:
+        self.value = moment
+
+    def now(self) -> datetime:
+        return self.value
+
+
+def _opening_hours() -> DailySchedule:
+    return DailySchedule(
+        [
+            ScheduleEntry(parse_time_of_day("22:00"), parse_time_of_day("07:00"), PresetId.AMBIENT_LAMP, 0.0),
+            ScheduleEntry(parse_time_of_day("09:00"), parse_time_of_day("18:00"), PresetId.SPECTRUM_SWEEP, 2.0),
+        ],
+        preset_by_id,
+        default=PresetId.CLASSIC,
+    )
+
+
+def test_lookup_matches_brute_force_for_random_schedules() -> None:
+    rng = random.Random(11)
+    presets = list(PresetId)
+    for _ in range(40):
+        entries = [
+            ScheduleEntry(rng.uniform(0, 86400), rng.uniform(0, 86400), rng.choice(presets))
+            for _ in range(rng.randint(1, 12))
+        ]
+        schedule = DailySchedule(entries, preset_by_id)
+        for _ in range(300):
+            second = rng.uniform(0, 86400)
+            owner = None
+            for entry in entries:
+                if _covers(entry, second):
+                    owner = entry
+            segment = schedule.segment_at(second)
+            assert segment.config == (None if owner is None else preset_by_id(owner.preset_id))
+            assert (second - segment.start_s) % 86400 < (segment.end_s - segment.start_s) % 86400 or len(schedule) == 1
+
+
+def test_segments_cover_the_day_and_wrap_midnight() -> None:
+    schedule = _opening_hours()
+
+    assert [segment.config.preset_id for segment in schedule.segments] == [
+        PresetId.CLASSIC,
+        PresetId.SPECTRUM_SWEEP,
+        PresetId.CLASSIC,
+        PresetId.AMBIENT_LAMP,
+    ]
+    assert schedule.segment_at(0.0).config.preset_id == PresetId.AMBIENT_LAMP
+    assert schedule.segment_at(parse_time_of_day("06:59:59")).config.preset_id == PresetId.AMBIENT_LAMP
+    assert schedule.segment_at(parse_time_of_day("07:00")).config.preset_id == PresetId.CLASSIC
+    spectrum = schedule.segment_at(parse_time_of_day("12:00"))
+    assert spectrum.fade_s == pytest.approx(2.0)
+    assert spectrum.fade_steps[0].saturation_pct == preset_by_id(PresetId.CLASSIC).saturation_pct
+
+
+def test_seek_applies_active_preset_and_sleeps_until_boundary(qtbot) -> None:
+    clock = FakeWallClock(datetime(2026, 3, 1, 3, 0, 0))
+    engine = ColorCycleEngine()
+    scheduler = PresetScheduler(engine, _opening_hours(), clock=clock.now)
+
+    with qtbot.waitSignal(scheduler.segment_changed) as blocker:
+        scheduler.start()
+
+    ambient = preset_by_id(PresetId.AMBIENT_LAMP)
+    assert blocker.args == [PresetId.AMBIENT_LAMP.value]
+    assert engine.state == PlaybackState.RUNNING
+    assert engine.current_snapshot()["saturation_pct"] == ambient.saturation_pct
+    assert scheduler.next_wake_in_s == pytest.approx(4 * 3600, abs=1.0)
+    scheduler.stop()
+    engine.stop_standstill()
+
+
+def test_seek_keeps_a_paused_or_restored_playback_state(qtbot) -> None:
+    clock = FakeWallClock(datetime(2026, 3, 1, 3, 0, 0))
+    engine = ColorCycleEngine()
+    engine.start()
+    engine.pause()
+    scheduler = PresetScheduler(engine, _opening_hours(), clock=clock.now)
+    scheduler.start()
+    assert engine.state == PlaybackState.PAUSED
+    assert engine.current_snapshot()["saturation_pct"] == preset_by_id(PresetId.AMBIENT_LAMP).saturation_pct
+    scheduler.stop()
+
+    engine.stop_standstill()
+    scheduler = PresetScheduler(engine, _opening_hours(), clock=clock.now, owns_playback=False)
+    scheduler.start()
+    assert engine.state == PlaybackState.STANDSTILL
+    scheduler.stop()
+
+
+def test_crossfade_steps_then_sleeps(qtbot) -> None:
+    clock = FakeWallClock(datetime(2026, 3, 1, 8, 59, 0))
+    engine = ColorCycleEngine()
+    scheduler = PresetScheduler(engine, _opening_hours(), clock=clock.now)
+    scheduler.start()
+    assert engine.current_snapshot()["saturation_pct"] == preset_by_id(PresetId.CLASSIC).saturation_pct
+
+    clock.value = datetime(2026, 3, 1, 9, 0, 1)
+    scheduler._on_wake()
+    classic = preset_by_id(PresetId.CLASSIC).saturation_pct
+    spectrum = preset_by_id(PresetId.SPECTRUM_SWEEP).saturation_pct
+    midway = engine.current_snapshot()["saturation_pct"]
+    assert min(classic, spectrum) < midway < max(classic, spectrum)
+    assert scheduler.next_wake_in_s <= CROSSFADE_STEP_S + 0.01
+
+    clock.value = datetime(2026, 3, 1, 9, 0, 2)
+    scheduler._on_wake()
+    assert engine.current_snapshot()["saturation_pct"] == spectrum
+    assert scheduler.next_wake_in_s == pytest.approx(9 * 3600 - 2, abs=1.0)
+    assert scheduler.wakeups == 2
+    scheduler.stop()
+    engine.stop_standstill()
+
+
+def test_seek_into_crossfade_without_replay(qtbot) -> None:
+    engine = ColorCycleEngine()
+    scheduler = PresetScheduler(engine, _opening_hours())
+
+    scheduler.seek(datetime(2026, 3, 1, 9, 0, 1))
+
+    assert scheduler.active_segment.config.preset_id == PresetId.SPECTRUM_SWEEP
+    assert scheduler.wakeups == 0
+    assert engine.current_snapshot()["saturation_pct"] != preset_by_id(PresetId.SPECTRUM_SWEEP).saturation_pct
+    scheduler.stop()
+    engine.stop_standstill()
+
+
+def test_load_schedule_file(tmp_path) -> None:
+    path = tmp_path / "day.json"
+    path.write_text(
+        json.dumps(
+            {
+                "default": "classic",
+                "entries": [{"start": "22:00", "end": "07:00", "preset": "ambient_lamp", "crossfade_s": 30}],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    schedule = load_schedule(path)
+
+    assert len(schedule) == 2
+    assert schedule.segment_at(parse_time_of_day("23:30")).config.preset_id == PresetId.AMBIENT_LAMP
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"entries": [{"start": "25:00", "end": "07:00", "preset": "classic"}]},
+        {"entries": [{"start": "22:00", "preset": "classic"}]},
+        {"entries": [{"start": "22:00", "end": "07:00", "preset": "missing"}]},
+        {"entries": "nope"},
+    ],
+)
+def test_invalid_schedule_is_rejected(tmp_path, data) -> None:
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    with pytest.raises(ScheduleError):
+        load_schedule(path)
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+
+import pytest
+
+from ambicolor.color_history import HistoryEntry
+from ambicolor.engine import ColorCycleEngine
+from ambicolor.models import PresetId, preset_by_id
+from ambicolor.session_recorder import (
+    RECORD_SIZE,
+    RecordKind,
+    SessionRecorder,
+    iter_records,
+    load_session,
+    replay_session,
+    session_frames,
+)
+
+
+class FakeClock:
+    def __init__(self, start: float = 0.0) -> None:
+        self.value = start
+
+    def now(self) -> float:
+        return self.value
+
+    def advance(self, seconds: float) -> None:
+        self.value += seconds
+
+
+def _record_session(recorder: SessionRecorder, *, minutes: float = 10.0) -> list[tuple[int, int, int]]:
+    """Drive a live engine through a scripted session and return the tick colors."""
+    clock = FakeClock(1000.0)
+    engine = ColorCycleEngine(clock=clock.now)
+    engine.set_render_suspended(True)
+    recorder.attach(engine)
+    seen: list[tuple[int, int, int]] = []
+
+    def tick(seconds: float) -> None:
+        steps = int(seconds * 30)
+        for _ in range(steps):
+            # Real timers jitter; the replay must follow the recorded times.
+            clock.advance(0.033 + (len(seen) % 7) * 0.0005)
+            engine._on_timer_tick()
+            color = engine.current_color
+            seen.append((color.red(), color.green(), color.blue()))
+
+    segment = minutes * 60.0 / 8
+    engine.start()
+    tick(segment)
+    engine.apply_preset(preset_by_id(PresetId.NATURAL_ARTISTIC))
+    tick(segment)
+    for value in range(40, 90, 5):
+        engine.set_saturation(value)
+        tick(0.1)
+    engine.pause()
+    clock.advance(30.0)
+    engine.resume()
+    tick(segment)
+    engine.set_cycle_duration(20.0)
+    engine.set_brightness(30)
+    engine.set_hue_name("#abcdef", "Ein sehr langer Farbname mit Umlauten äöü")
+    engine.set_language("de")
+    tick(segment)
+    engine.stop_standstill()
+    engine.apply_preset(preset_by_id(PresetId.CLASSIC))
+    engine.set_random_start_hue(True)
+    engine.start()
+    tick(segment * 4)
+    recorder.detach()
+    engine.stop_standstill()
+    return seen
+
+
+def test_replay_reproduces_every_frame(tmp_path) -> None:
+    recorder = SessionRecorder()
+    live = _record_session(recorder)
+    path = tmp_path / "field.ambisession"
+    recorder.save(path)
+
+    started = time.perf_counter()
+    frames = list(replay_session(load_session(path)))
+    elapsed = time.perf_counter() - started
+
+    assert recorder.overwritten == 0
+    assert [frame.rgb for frame in frames] == live
+    assert all(frame.rgb == frame.recorded_rgb for frame in frames)
+    virtual_span = frames[-1].timestamp_s - frames[0].timestamp_s
+    assert virtual_span / elapsed >= 1000
+
+
+def test_ring_respects_memory_cap_and_replays_surviving_tail() -> None:
+    recorder = SessionRecorder(capacity_bytes=64 * 1024, keyframe_interval_s=5.0)
+    live = _record_session(recorder, minutes=4.0)
+
+    assert recorder.memory_bytes == (64 * 1024 // RECORD_SIZE) * RECORD_SIZE
+    assert recorder.overwritten > 0
+    frames = list(replay_session(recorder.snapshot()))
+
+    assert 0 < len(frames) < len(live)
+    assert [frame.rgb for frame in frames] == live[-len(frames) :]
+    assert all(frame.rgb == frame.recorded_rgb for frame in frames)
+
+
+def test_records_are_fixed_size_and_typed() -> None:
+    recorder = SessionRecorder(capacity_bytes=1024 * 1024)
+    _record_session(recorder, minutes=0.5)
+    data = recorder.snapshot()
+
+    kinds = [kind for _ts, kind, _payload in iter_records(data)]
+    assert len(data) == len(kinds) * RECORD_SIZE
+    assert kinds[:5] == [
+        RecordKind.KEY_STATE,
+        RecordKind.KEY_HUE,
+        RecordKind.KEY_RANGE,
+        RecordKind.KEY_GENERATOR,
+        RecordKind.GENERATOR,
+    ]
+    assert RecordKind.TEXT_MORE in kinds
+    assert kinds.count(RecordKind.START) == 2
+
+
+def test_session_frames_resample_to_export_rate() -> None:
+    recorder = SessionRecorder()
+    live = _record_session(recorder, minutes=0.5)
+
+    exported = list(session_frames(recorder.snapshot(), fps=10.0))
+
+    assert exported[0] == live[0]
+    assert set(exported) <= set(live)
+    # 10 fps from ~30 fps ticks, plus the 30 s pause held on one color.
+    assert len(live) / 3.5 < len(exported) < len(live) / 3 + 400
+
+
+def test_replay_restores_the_preset_generator(monkeypatch) -> None:
+    class Ramp:
+        def color_at(self, t_s, params):
+            return int(t_s * 10) % 256, params.saturation_pct, params.brightness_pct
+
+    loaded: list[str] = []
+
+    def load_generator(name: str) -> Ramp:
+        loaded.append(name)
+        return Ramp()
+
+    monkeypatch.setattr("ambicolor.engine.load_generator", load_generator)
+    recorder = SessionRecorder()
+    clock = FakeClock(1000.0)
+    engine = ColorCycleEngine(clock=clock.now)
+    engine.set_render_suspended(True)
+    recorder.attach(engine)
+    engine.apply_preset(replace(preset_by_id(PresetId.CLASSIC), preset_id="plugin:ramp", generator="ramp_with_a_long_name"))
+    engine.start()
+    live = []
+    for _ in range(60):
+        clock.advance(0.033)
+        engine._on_timer_tick()
+        color = engine.current_color
+        live.append((color.red(), color.green(), color.blue()))
+    recorder.detach()
+    engine.stop_standstill()
+
+    frames = list(replay_session(recorder.snapshot()))
+
+    assert loaded == ["ramp_with_a_long_name"] * 2
+    assert [frame.rgb for frame in frames] == live
+    assert len(set(live)) > 1
+
+
+def test_keyframes_carry_the_generator_across_overwrite_and_history_jumps(monkeypatch) -> None:
+    class Ramp:
+        def color_at(self, t_s, params):
+            return int(t_s * 10) % 256, params.saturation_pct, params.brightness_pct
+
+    monkeypatch.setattr("ambicolor.engine.load_generator", lambda name: Ramp())
+    recorder = SessionRecorder(capacity_bytes=256 * RECORD_SIZE, keyframe_interval_s=1.0)
+    clock = FakeClock(1000.0)
+    engine = ColorCycleEngine(clock=clock.now)
+    engine.set_render_suspended(True)
+    recorder.attach(engine)
+    engine.apply_preset(replace(preset_by_id(PresetId.CLASSIC), preset_id="plugin:ramp", generator="ramp"))
+    engine.start()
+    live = []
+
+    def tick(count: int) -> None:
+        for _ in range(count):
+            clock.advance(0.033)
+            engine._on_timer_tick()
+            color = engine.current_color
+            live.append((color.red(), color.green(), color.blue()))
+
+    tick(300)
+    engine.jump_to_history(HistoryEntry(0, clock.now(), 200.0, 80, 90, "#000000"))
+    engine.start()
+    tick(30)
+    recorder.detach()
+    engine.stop_standstill()
+
+    data = recorder.snapshot()
+    frames = list(replay_session(data))
+
+    # The preset record that loaded the plugin has been overwritten.
+    assert RecordKind.PRESET not in [kind for _ts, kind, _payload in iter_records(data)]
+    assert len(frames) > 60
+    assert [frame.rgb for frame in frames] == live[-len(frames) :]
+
+
+def test_load_rejects_other_files(tmp_path) -> None:
+    path = tmp_path / "bogus.ambisession"
+    path.write_bytes(b"not a session at all, just bytes")
+
+    with pytest.raises(ValueError):
+        load_session(path)
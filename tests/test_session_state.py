@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from ambicolor.engine import ColorCycleEngine
+from ambicolor.models import PlaybackState, PresetId, preset_by_id, preset_catalog
+from ambicolor.preset_registry import PresetRegistry, default_registry
+from ambicolor.session_state import (
+    SessionStateFile,
+    SessionStatePersister,
+    capture_session,
+    restore_session,
+)
+from ambicolor.ui_main_window import MainWindow
+
+
+class FakeClock:
+    def __init__(self, start: float = 0.0) -> None:
+        self.value = start
+
+    def now(self) -> float:
+        return self.value
+
+    def advance(self, seconds: float) -> None:
+        self.value += seconds
+
+
+def _running_engine(clock: FakeClock) -> ColorCycleEngine:
+    engine = ColorCycleEngine(clock=clock.now)
+    engine.apply_preset(preset_by_id(PresetId.AMBIENT_LAMP))
+    engine.set_saturation(55)
+    engine.start()
+    clock.advance(4.0)
+    engine._on_timer_tick()
+    return engine
+
+
+def test_running_session_continues_after_downtime(tmp_path) -> None:
+    clock = FakeClock(100.0)
+    wall = FakeClock(1_700_000_000.0)
+    original = _running_engine(clock)
+    # Saved a little after the last tick.
+    clock.advance(0.01)
+    wall.advance(0.01)
+    state_file = SessionStateFile(tmp_path / "session.json")
+    state_file.write(capture_session(original, fullscreen=True, wall_clock=wall.now))
+
+    # Down for 45 s; the original keeps running as reference.
+    clock.advance(44.99)
+    wall.advance(44.99)
+    original._on_timer_tick()
+
+    restored = ColorCycleEngine(clock=FakeClock(7.0).now)
+    saved = state_file.load()
+    assert saved["fullscreen"] is True
+    elapsed = restore_session(restored, default_registry(), saved, wall_clock=wall.now)
+
+    assert elapsed == pytest.approx(45.0)
+    assert restored.state == PlaybackState.RUNNING
+    assert restored.active_preset.preset_id == PresetId.AMBIENT_LAMP
+    assert restored.current_snapshot()["saturation_pct"] == 55
+    assert restored.current_snapshot()["hue_deg"] == pytest.approx(original.current_snapshot()["hue_deg"])
+    assert restored.current_snapshot()["hex"] == original.current_snapshot()["hex"]
+
+
+def test_paused_session_keeps_its_hue_and_bad_files_are_ignored(tmp_path) -> None:
+    clock = FakeClock()
+    engine = _running_engine(clock)
+    engine.pause()
+    path = tmp_path / "state" / "session.json"
+    SessionStateFile(path).write(capture_session(engine, wall_clock=lambda: 1000.0))
+    assert [item.name for item in path.parent.iterdir()] == ["session.json"]
+
+    restored = ColorCycleEngine()
+    assert restore_session(restored, default_registry(), SessionStateFile(path).load(), wall_clock=lambda: 9000.0) == 0.0
+    assert restored.state == PlaybackState.PAUSED
+    assert restored.current_snapshot()["hex"] == engine.current_snapshot()["hex"]
+
+    path.write_text('{"version": 1, "engine": ', encoding="utf-8")
+    assert SessionStateFile(path).load() is None
+    assert SessionStateFile(tmp_path / "missing.json").load() is None
+
+
+def test_plugin_preset_restores_its_saved_parameters(monkeypatch) -> None:
+    class Levels:
+        def color_at(self, t_s, params):
+            return 0, params.saturation_pct, params.brightness_pct
+
+    monkeypatch.setattr("ambicolor.engine.load_generator", lambda name: Levels())
+    preset = replace(
+        preset_by_id(PresetId.CLASSIC), preset_id="plugin:levels", generator="levels", saturation_pct=80, brightness_pct=60
+    )
+    registry = PresetRegistry(preset_catalog())
+    registry.register(preset)
+    engine = ColorCycleEngine()
+    engine.apply_preset(preset)
+    engine.set_brightness(10)
+    assert engine.current_snapshot()["hex"] == "#00500A"
+
+    restored = ColorCycleEngine()
+    restore_session(restored, registry, capture_session(engine, wall_clock=lambda: 0.0), wall_clock=lambda: 0.0)
+
+    assert restored.generator_name == "levels"
+    assert restored.current_snapshot()["hex"] == "#00500A"
+
+
+def test_slider_drag_is_written_once(qtbot, tmp_path) -> None:
+    engine = ColorCycleEngine()
+    state_file = SessionStateFile(tmp_path / "session.json")
+    persister = SessionStatePersister(engine, state_file, debounce_ms=50)
+    for value in range(40, 80):
+        engine.set_brightness(value)
+    assert persister.save_pending
+    qtbot.waitUntil(lambda: persister.writes == 1, timeout=2000)
+    qtbot.wait(100)
+    assert persister.writes == 1
+    assert state_file.load()["engine"]["brightness_pct"] == 79
+
+    engine.set_brightness(20)
+    persister.close()
+    assert persister.writes == 2
+    assert state_file.load()["engine"]["brightness_pct"] == 20
+
+
+def test_window_shows_the_restored_preset(qtbot, tmp_path) -> None:
+    source = ColorCycleEngine()
+    source.apply_preset(preset_by_id(PresetId.SPECTRUM_SWEEP))
+    saved = capture_session(source, wall_clock=lambda: 0.0)
+
+    window = MainWindow(language="en", defer_controls=True)
+    qtbot.addWidget(window)
+    restore_session(window.engine, window.preset_registry, saved, wall_clock=lambda: 0.0)
+    assert window.controls.preset_combo.currentData() == "spectrum_sweep"
+    assert window.engine.current_snapshot()["hex"] == source.current_snapshot()["hex"]
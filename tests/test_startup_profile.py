@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import sys
+
+from ambicolor.startup_profile import StartupProfile
+
+
+class FakeClock:
+    def __init__(self, start: float = 0.0) -> None:
+        self.value = start
+
+    def now(self) -> float:
+        return self.value
+
+    def advance(self, seconds: float) -> None:
+        self.value += seconds
+
+
+def test_phases_marks_and_report() -> None:
+    clock = FakeClock(10.0)
+    profile = StartupProfile(origin_s=9.5, clock=clock.now)
+
+    with profile.phase("create window"):
+        clock.advance(0.25)
+    clock.advance(0.05)
+    profile.mark("first frame painted")
+    clock.advance(0.1)
+    profile.add("build control panel", 0.08)
+
+    phases = profile.phases
+    assert [phase.name for phase in phases] == ["create window", "first frame painted", "build control panel"]
+    assert phases[0].start_s == 0.5 and phases[0].duration_s == 0.25
+    assert phases[1].duration_s == 0.0
+    assert abs(phases[2].start_s - 0.82) < 1e-9
+
+    report = profile.report().splitlines()
+    assert report[0].startswith("Startup profile")
+    assert report[2].split() == ["500.0", "250.0", "create", "window"]
+    assert report[3].split()[1] == "-"
+
+
+def test_import_module_counts_new_modules() -> None:
+    sys.modules.pop("colorsys", None)
+    profile = StartupProfile()
+    module = profile.import_module("colorsys")
+    assert module is sys.modules["colorsys"]
+    (phase,) = profile.phases
+    assert phase.name == "import colorsys"
+    assert phase.modules_loaded >= 1
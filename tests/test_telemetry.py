@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import gzip
+import json
+
+from ambicolor.engine import ColorCycleEngine
+from ambicolor.models import PresetId, preset_by_id
+from ambicolor.telemetry import TelemetryLog, log_files, main, parse_time, read_events
+
+
+class FakeClock:
+    def __init__(self, start: float = 0.0) -> None:
+        self.value = start
+
+    def now(self) -> float:
+        return self.value
+
+    def advance(self, seconds: float) -> None:
+        self.value += seconds
+
+
+def test_engine_events_are_logged(tmp_path) -> None:
+    wall = FakeClock(1_700_000_000.0)
+    engine_clock = FakeClock()
+    engine = ColorCycleEngine(clock=engine_clock.now)
+    log = TelemetryLog(tmp_path, clock=wall.now)
+    log.attach(engine)
+
+    engine.start()
+    for gap in (0.033, 0.033, 0.120, 0.033):
+        engine_clock.advance(gap)
+        engine._on_timer_tick()
+    engine.set_render_suspended(True)
+    engine_clock.advance(10.0)
+    engine.set_render_suspended(False)
+    engine.apply_preset(preset_by_id(PresetId.AMBIENT_LAMP))
+    engine.set_hue_name("#112233", "Night")
+    engine.set_saturation(40)
+    engine.pause()
+    log.detach()
+    assert log.flush() == 7
+
+    events = list(read_events(tmp_path))
+    assert [event["kind"] for event in events] == [
+        "state", "tick_overrun", "render", "render", "preset", "name", "state",
+    ]
+    assert events[0] == {"t": 1_700_000_000.0, "kind": "state", "action": "start", "state": "running"}
+    assert events[1]["interval_ms"] == 120.0
+    assert events[4]["preset"] == "ambient_lamp"
+    assert events[5]["name"] == "Night"
+    assert events[6]["state"] == "paused"
+
+
+def test_overruns_follow_the_tick_interval(tmp_path) -> None:
+    engine_clock = FakeClock()
+    engine = ColorCycleEngine(clock=engine_clock.now)
+    log = TelemetryLog(tmp_path, clock=FakeClock().now)
+    log.attach(engine)
+    # Frame pacing moves the engine to the display refresh after attach.
+    engine.set_tick_interval_s(1.0 / 144.0)
+
+    engine.start()
+    for gap in (0.007, 0.007, 0.033):
+        engine_clock.advance(gap)
+        engine._on_timer_tick()
+    engine.stop_standstill()
+    log.detach()
+    log.flush()
+
+    overruns = [event for event in read_events(tmp_path) if event["kind"] == "tick_overrun"]
+    assert [event["interval_ms"] for event in overruns] == [33.0]
+
+
+def test_full_queue_drops_without_blocking(tmp_path) -> None:
+    log = TelemetryLog(tmp_path, capacity=4)
+    assert all(log.log("probe", index=index) for index in range(4))
+    assert not log.log("probe", index=4)
+    assert log.dropped == 1
+    log.flush()
+
+    kinds = [event["kind"] for event in read_events(tmp_path)]
+    assert kinds == ["probe"] * 4 + ["dropped"]
+    assert log.log("probe", index=5)
+    assert log.stats().queued == 1
+
+
+def test_background_writer_rotates_and_prunes(tmp_path) -> None:
+    clock = FakeClock(1_700_000_000.0)
+    log = TelemetryLog(tmp_path, capacity=64, flush_interval_s=0.01, max_file_bytes=1, max_files=3, clock=clock.now)
+    log.start()
+    try:
+        for batch in range(5):
+            log.log("batch", index=batch)
+            clock.advance(1.0)
+            log.flush()
+    finally:
+        log.stop()
+
+    files = log_files(tmp_path)
+    assert len(files) == 3
+    assert [event["index"] for event in read_events(tmp_path)] == [2, 3, 4]
+    with gzip.open(files[0], "rt", encoding="utf-8") as handle:
+        assert json.loads(handle.readline())["kind"] == "batch"
+
+
+def test_query_by_time_range_and_cli(tmp_path, capsys) -> None:
+    clock = FakeClock(1_700_000_000.0)
+    log = TelemetryLog(tmp_path, max_file_bytes=1, clock=clock.now)
+    for index in range(6):
+        log.log("preset" if index % 2 else "state", index=index)
+        clock.advance(60.0)
+        log.flush()
+    # A batch cut short by a crash is ignored, not fatal.
+    with log_files(tmp_path)[-1].open("ab") as handle:
+        handle.write(gzip.compress(b'{"t": 1, "kind": "x"}\n')[:12])
+
+    start = 1_700_000_000.0
+    found = read_events(tmp_path, since=start + 60.0, until=start + 240.0)
+    assert [event["index"] for event in found] == [1, 2, 3]
+    assert [event["index"] for event in read_events(tmp_path, kinds=["preset"])] == [1, 3, 5]
+
+    assert main([str(tmp_path), "--since", "2023-11-14T22:15:00+00:00", "--kind", "state", "--json"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["index"] for line in lines] == [2, 4]
+    assert parse_time("2h", now=10_000.0) == 2_800.0
+
+    # The wall clock stepped back within one file: events after the one
+    # past the range still count.
+    for index, step in ((6, -160.0), (7, 100.0), (8, -200.0)):
+        clock.advance(step)
+        log.log("state", index=index)
+    log.flush()
+    found = read_events(tmp_path, since=start + 60.0, until=start + 240.0)
+    assert [event["index"] for event in found] == [1, 2, 3, 6, 8]
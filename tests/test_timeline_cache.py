@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+
+from ambicolor.engine import ColorCycleEngine
+from ambicolor.models import PlaybackState, PresetId, preset_by_id
+from ambicolor.timeline import render_timeline, with_overrides
+from ambicolor.timeline_cache import INDEX_FILE, INDEX_SAVE_INTERVAL_S, TimelineCache, timeline_key
+
+
+class FakeClock:
+    def __init__(self, start: float = 0.0) -> None:
+        self.value = start
+
+    def now(self) -> float:
+        return self.value
+
+    def advance(self, seconds: float) -> None:
+        self.value += seconds
+
+
+def test_cached_timeline_round_trips_through_mapping(tmp_path) -> None:
+    config = preset_by_id(PresetId.AMBIENT_LAMP)
+    cache = TimelineCache(tmp_path)
+
+    mapped = cache.get_or_render(config, fps=20.0, frame_count=400, seed=3)
+    rendered = render_timeline(config, fps=20.0, frame_count=400, seed=3)
+
+    assert len(mapped) == 400
+    assert mapped.fps == 20.0
+    assert [mapped.hue_at(i) for i in range(400)] == list(rendered.hues)
+    assert all(mapped.rgb_at(i) == rendered.rgb_at(i) for i in range(400))
+    cache.close()
+
+
+def test_index_survives_reopen_and_hits_without_rendering(tmp_path, monkeypatch) -> None:
+    config = preset_by_id(PresetId.CLASSIC)
+    first = TimelineCache(tmp_path)
+    first.get_or_render(config, frame_count=50)
+    first.close()
+
+    monkeypatch.setattr("ambicolor.timeline_cache.render_timeline", None)
+    second = TimelineCache(tmp_path)
+
+    assert timeline_key(config, fps=30.0, frame_count=50, seed=0) in second
+    assert len(second.get_or_render(config, frame_count=50)) == 50
+    second.close()
+
+
+def test_lru_eviction_by_disk_size(tmp_path) -> None:
+    clock = FakeClock(100.0)
+    base = preset_by_id(PresetId.CLASSIC)
+    configs = [with_overrides(base, saturation_pct=value) for value in (30, 50, 70)]
+    # Each 100-frame file is 64 + 1100 bytes; room for two.
+    cache = TimelineCache(tmp_path, max_bytes=2 * 1164, clock=clock.now)
+    keys = []
+    for config in configs[:2]:
+        cached = cache.get_or_render(config, frame_count=100)
+        keys.append(cached.key)
+        cache.release(cached.key)
+        clock.advance(1.0)
+
+    # Touch the older entry so the second one becomes least recently used.
+    cache.get(keys[0])
+    cache.release(keys[0])
+    clock.advance(1.0)
+    third = cache.get_or_render(configs[2], frame_count=100)
+
+    assert keys[0] in cache
+    assert keys[1] not in cache
+    assert third.key in cache
+    assert cache.total_bytes <= 2 * 1164
+    assert not (tmp_path / f"{keys[1]}.tlc").exists()
+    cache.close()
+
+
+def test_last_use_is_saved_in_batches_without_close(tmp_path) -> None:
+    clock = FakeClock(100.0)
+    cache = TimelineCache(tmp_path, clock=clock.now)
+    key = cache.get_or_render(preset_by_id(PresetId.CLASSIC), frame_count=10).key
+
+    def saved_last_use() -> float:
+        return json.loads((tmp_path / INDEX_FILE).read_text(encoding="utf-8"))["entries"][key]["last_used"]
+
+    clock.advance(1.0)
+    cache.get(key)
+    assert saved_last_use() == 100.0
+
+    clock.advance(INDEX_SAVE_INTERVAL_S)
+    cache.get(key)
+    # Written while the cache is still open, e.g. before a crash.
+    assert saved_last_use() == 100.0 + 1.0 + INDEX_SAVE_INTERVAL_S
+    cache.close()
+
+
+def test_corrupt_file_is_dropped(tmp_path) -> None:
+    config = preset_by_id(PresetId.CLASSIC)
+    cache = TimelineCache(tmp_path)
+    key = cache.get_or_render(config, frame_count=10).key
+    cache.close()
+    (tmp_path / f"{key}.tlc").write_bytes(b"garbage")
+
+    reopened = TimelineCache(tmp_path)
+
+    assert reopened.get(key) is None
+    assert key not in reopened
+    assert (tmp_path / INDEX_FILE).exists()
+
+
+def test_engine_plays_cached_frames_then_continues_live(tmp_path) -> None:
+    config = with_overrides(preset_by_id(PresetId.NATURAL_ARTISTIC), cycle_duration_s=10.0)
+    cache = TimelineCache(tmp_path)
+    mapped = cache.get_or_render(config, fps=10.0, frame_count=50, seed=5)
+    reference = render_timeline(config, fps=10.0, frame_count=80, seed=5)
+
+    clock = FakeClock()
+    engine = ColorCycleEngine(clock=clock.now)
+    engine.apply_preset(config)
+    engine.play_timeline(mapped)
+    assert engine.state == PlaybackState.RUNNING
+    assert engine.current_color.getRgb()[:3] == reference.rgb_at(0)
+
+    for frame in range(1, 80):
+        clock.advance(0.1)
+        engine._on_timer_tick()
+        red, green, blue = engine.current_color.getRgb()[:3]
+        expected = reference.rgb_at(frame)
+        assert max(abs(red - expected[0]), abs(green - expected[1]), abs(blue - expected[2])) <= 1, frame
+    assert engine.timeline is None
+
+    engine.stop_standstill()
+    cache.close()
+
+
+def test_parameter_change_leaves_timeline(tmp_path) -> None:
+    config = preset_by_id(PresetId.CLASSIC)
+    cache = TimelineCache(tmp_path)
+    clock = FakeClock()
+    engine = ColorCycleEngine(clock=clock.now)
+    engine.apply_preset(config)
+    engine.play_timeline(cache.get_or_render(config, frame_count=100))
+
+    engine.set_saturation(20)
+
+    assert engine.timeline is None
+    clock.advance(1.0)
+    engine._on_timer_tick()
+    assert engine.current_snapshot()["saturation_pct"] == 20
+    engine.stop_standstill()
+    cache.close()
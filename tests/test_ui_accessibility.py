@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QGuiApplication
 from PySide6.QtTest import QTest
 
 from ambicolor.ui_main_window import MainWindow
@@ -24,6 +25,20 @@ def test_initial_focus_and_default_preset(qtbot) -> None:
     assert "Baseline lamp behavior" in window.controls.preset_description_edit.toPlainText()
 
 
+def test_deferred_controls_are_built_after_first_paint(qtbot) -> None:
+    window = MainWindow(language="en", defer_controls=True)
+    qtbot.addWidget(window)
+    assert not window.controls_ready
+
+    with qtbot.waitSignals([window.first_frame_painted, window.controls_built], timeout=2000, order="strict"):
+        window.show()
+    qtbot.wait(120)
+
+    assert window.controls.preset_combo.hasFocus()
+    assert "Classic" in window.controls.preset_combo.currentText()
+    assert window.controls.current_color_label.text() == window.engine.current_display_name
+
+
 def test_all_controls_have_accessible_names(qtbot) -> None:
     window = MainWindow(language="en")
     qtbot.addWidget(window)
@@ -162,3 +177,38 @@ def test_random_start_toggle_keeps_focus(qtbot) -> None:
     qtbot.keyClick(window.controls.random_start_checkbox, Qt.Key.Key_Space)
     qtbot.wait(80)
     assert window.controls.random_start_checkbox.hasFocus()
+
+
+def test_minimized_window_suspends_engine_timer(qtbot) -> None:
+    window = MainWindow(language="en")
+    qtbot.addWidget(window)
+    window.show()
+    qtbot.wait(120)
+
+    window.controls.playback_button.click()
+    assert not window._engine.render_suspended
+
+    window.showMinimized()
+    qtbot.waitUntil(lambda: window._engine.render_suspended, timeout=1000)
+    assert not window._engine._timer.isActive()
+
+    window.showNormal()
+    qtbot.waitUntil(lambda: not window._engine.render_suspended, timeout=1000)
+    assert window._engine._timer.isActive()
+
+
+def test_f10_opens_one_surface_per_screen(qtbot) -> None:
+    window = MainWindow(language="en")
+    qtbot.addWidget(window)
+    window.show()
+    qtbot.wait(120)
+
+    qtbot.keyClick(window, Qt.Key.Key_F10)
+    surfaces = window._screen_surfaces.surfaces
+    assert len(surfaces) == len(QGuiApplication.screens())
+    assert all(surface.isVisible() for surface in surfaces)
+    assert "screen" in window.controls.status_label.text().lower()
+
+    qtbot.keyClick(window, Qt.Key.Key_F10)
+    assert not window._screen_surfaces.is_open
+    assert window._engine.screen_hue_offsets == []